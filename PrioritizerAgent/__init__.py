@@ -1 +1,8 @@
-from . import agent
+import importlib
+
+def __getattr__(name):
+    # ADK discovers the agent as `PrioritizerAgent.agent`; import it on first
+    # access so the classifier modules load without google-adk
+    if name == "agent":
+        return importlib.import_module(".agent", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,92 @@
+"""
+Bounded LRU/TTL cache for priority classification results.
+During an incident the same requests ("Need water", copy-pasted shelter
+requests) arrive over and over, so results are memoized on normalized text.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize ticket text for cache keys: case and surrounding whitespace only.
+    Whitespace inside the text is kept, because keyword matching sees it
+    ("not\nbreathing" is not "not breathing").
+    """
+    return (text or "").lower().strip()
+
+class ClassificationCache:
+    """Thread-safe LRU cache with per-entry time-to-live and hit/miss counters."""
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 900.0):
+        """
+        Args:
+            maxsize: Maximum number of entries kept (least recently used are evicted)
+            ttl: Seconds an entry stays valid (0 or None disables expiry)
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key=None) -> None:
+        """Drop one key, or everything when the rule tables or model change."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        """Return size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
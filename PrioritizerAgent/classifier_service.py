@@ -0,0 +1,62 @@
+"""
+Preloaded classifier service for long-running apps.
+The Streamlit app creates one PrioritizerService per server process and
+routes every classification through it, so the prioritizer modules are
+imported and warmed once instead of on each ticket.
+"""
+import time
+
+class PrioritizerService:
+    """Loaded-once facade over prioritizer_integration with startup metrics."""
+
+    def __init__(self, module, startup_seconds: float):
+        """
+        Args:
+            module: The imported prioritizer_integration module
+            startup_seconds: Time spent importing and warming it
+        """
+        self._module = module
+        self.startup_seconds = startup_seconds
+        self.loaded_at = time.time()
+        self.cache = module.classification_cache
+        self.sessions = module.conversation_store
+
+    @classmethod
+    def load(cls) -> "PrioritizerService":
+        """Import the prioritizer, warm its rule tables and time the whole startup."""
+        started = time.perf_counter()
+        try:
+            from . import prioritizer_integration as module
+        except ImportError:  # Loaded as a top-level module via sys.path
+            import prioritizer_integration as module
+
+        # First calls pay for lazily built state such as the question-type memo
+        module.enhanced_priority_classification("warm up: person trapped, needs water")
+        module.QA_RULES.evaluate([("Is anyone in immediate danger?", "yes")])
+        return cls(module, time.perf_counter() - started)
+
+    def classify(self, text: str) -> dict:
+        """Classify a ticket (memoized on normalized text)."""
+        return self._module.classify_ticket_priority(text)
+
+    def classify_with_conversation(self, text: str) -> dict:
+        """Classify a ticket, starting a conversation if clarification is needed."""
+        return self._module.classify_with_conversation(text)
+
+    def answer_questions(self, original_description: str, qa_pairs: list,
+                         conversation_id: str = None) -> dict:
+        """Reclassify with answers, reusing the stored conversation when possible."""
+        return self._module.answer_questions_and_reclassify(original_description, qa_pairs, conversation_id)
+
+    def end_conversation(self, conversation_id: str) -> None:
+        """Release a stored conversation."""
+        self._module.end_conversation(conversation_id)
+
+    def stats(self) -> dict:
+        """Startup time plus cache and session metrics."""
+        return {
+            'startup_ms': round(self.startup_seconds * 1000, 1),
+            'loaded_at': self.loaded_at,
+            'cache': self.cache.stats(),
+            'sessions': self.sessions.stats(),
+        }
@@ -0,0 +1,261 @@
+"""
+Latency-bounded LLM prioritization for UnityAid.
+The ticket is sent to the ADK PrioritizerAgent with a hard deadline while the
+heuristic classifier runs alongside it. Whichever answer fits the latency
+budget is returned; a late LLM answer is still delivered so callers can
+upgrade the stored priority.
+"""
+import asyncio
+import concurrent.futures
+import inspect
+import json
+import re
+import threading
+import time
+import uuid
+
+try:
+    from .prioritizer_integration import classify_ticket_priority
+    from .prioritizer_integration import end_conversation as _end_conversation
+except ImportError:  # Loaded as a top-level module via sys.path
+    from prioritizer_integration import classify_ticket_priority
+    from prioritizer_integration import end_conversation as _end_conversation
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+def parse_priority_response(text: str) -> dict:
+    """
+    Parse the agent's JSON response format into a classification result.
+
+    Accepts bare JSON, JSON wrapped in a ```json fence or surrounding prose,
+    and falls back to the first digit 1-5 if the model ignored the format.
+    """
+    content = (text or "").strip()
+    data = None
+    match = _JSON_OBJECT.search(content)
+    if match:
+        try:
+            data = json.loads(match.group())
+        except ValueError:
+            data = None
+
+    if not isinstance(data, dict):
+        digit = re.search(r"[1-5]", content)
+        if not digit:
+            raise ValueError(f"No priority in LLM response: {content[:80]!r}")
+        data = {'priority': int(digit.group())}
+
+    priority = max(1, min(5, int(data.get('priority', 3))))
+    return {
+        'priority': priority,
+        'confidence': float(data.get('confidence', 0.75)),
+        'reasoning': data.get('reasoning', ''),
+        'key_indicators': list(data.get('key_indicators', []))[:5],
+        'recommendations': data.get('recommendations', ''),
+    }
+
+class AdkAgentModel:
+    """Sends tickets to the ADK root_agent defined in agent.py."""
+
+    def __init__(self, agent=None, app_name: str = "unityaid", user_id: str = "triage"):
+        # Imported lazily so the heuristic path works without google-adk installed
+        from google.adk.runners import Runner
+        from google.adk.sessions import InMemorySessionService
+        from google.genai import types
+
+        if agent is None:
+            try:
+                from .agent import root_agent
+            except ImportError:
+                from agent import root_agent
+            agent = root_agent
+
+        self.name = f"adk:{agent.name}"
+        self.app_name = app_name
+        self.user_id = user_id
+        self._types = types
+        self._sessions = InMemorySessionService()
+        self._runner = Runner(agent=agent, app_name=app_name, session_service=self._sessions)
+
+    async def complete(self, prompt: str) -> str:
+        """Run the agent on one ticket and return its final text response."""
+        session_id = uuid.uuid4().hex
+        # Session APIs are sync in older ADK releases and async in newer ones
+        await _maybe_await(self._sessions.create_session(
+            app_name=self.app_name, user_id=self.user_id, session_id=session_id
+        ))
+        try:
+            message = self._types.Content(role="user", parts=[self._types.Part(text=prompt)])
+            response = ""
+            async for event in self._runner.run_async(
+                user_id=self.user_id, session_id=session_id, new_message=message
+            ):
+                if event.is_final_response() and event.content and event.content.parts:
+                    response = "".join(part.text or "" for part in event.content.parts)
+            return response
+        finally:
+            await _maybe_await(self._sessions.delete_session(
+                app_name=self.app_name, user_id=self.user_id, session_id=session_id
+            ))
+
+class StubModel:
+    """
+    Offline stand-in for the LLM with configurable latency.
+
+    Answers in the agent's JSON format using the heuristic classification,
+    optionally overriding the priority, so deadlines and upgrades can be
+    exercised without network access.
+    """
+
+    def __init__(self, latency: float = 0.0, priority: int = None, fail: bool = False):
+        self.name = "stub"
+        self.latency = latency
+        self.priority = priority
+        self.fail = fail
+
+    async def complete(self, prompt: str) -> str:
+        await asyncio.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError("stub model failure")
+        result = classify_ticket_priority(prompt)
+        if self.priority is not None:
+            result['priority'] = self.priority
+        return json.dumps({
+            'priority': result['priority'],
+            'confidence': 0.85,
+            'reasoning': result['reasoning'],
+            'key_indicators': result['key_indicators'],
+            'recommendations': result['recommendations'],
+        })
+
+async def _maybe_await(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+class HedgedPrioritizer:
+    """
+    Races an LLM model against the heuristic classifier under a latency budget.
+
+    If the model answers within `deadline` seconds its result is returned.
+    Otherwise the heuristic result is returned immediately with 'llm_pending',
+    a future that resolves to the model's result (or None on failure) once it
+    arrives, bounded by `llm_timeout`. When the model wins, a conversation the
+    heuristic started for follow-up questions is ended, since nobody will
+    answer it.
+    """
+
+    def __init__(self, model, heuristic=None, deadline: float = 1.5, llm_timeout: float = 30.0,
+                 end_conversation=None):
+        """
+        Args:
+            model: Object with a `name` and an async `complete(prompt) -> str`
+            heuristic: Callable(text) -> classification dict (default: classify_ticket_priority)
+            deadline: Seconds to wait for the model before answering with the heuristic
+            llm_timeout: Hard limit for a late model answer before it is abandoned
+            end_conversation: Callable(conversation_id) that releases a heuristic
+                              conversation (default: prioritizer_integration.end_conversation)
+        """
+        self.model = model
+        self.heuristic = heuristic or classify_ticket_priority
+        self.end_conversation = end_conversation or _end_conversation
+        self.deadline = deadline
+        self.llm_timeout = llm_timeout
+        self.stats = {'llm_wins': 0, 'heuristic_wins': 0, 'late_answers': 0, 'llm_errors': 0}
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+    async def _ask_model(self, text: str):
+        """Return the parsed model result, or None if it failed or timed out."""
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(self.model.complete(text), self.llm_timeout)
+            result = parse_priority_response(response)
+        except Exception as e:
+            self.stats['llm_errors'] += 1
+            print(f"LLM prioritization failed ({self.model.name}): {e!r}")
+            return None
+        result['source'] = self.model.name
+        result['latency'] = time.perf_counter() - started
+        return result
+
+    async def prioritize(self, text: str, heuristic=None) -> dict:
+        """
+        Classify text within the latency budget (async API).
+
+        Args:
+            text: Ticket description
+            heuristic: Optional override for the heuristic classifier
+
+        Returns:
+            dict: The model's result if it beat the deadline, else the heuristic
+                  result with 'llm_pending' (an asyncio task) for the late answer
+        """
+        started = time.perf_counter()
+        llm_task = asyncio.ensure_future(self._ask_model(text))
+        await asyncio.sleep(0)  # let the model request go out first
+
+        # The heuristic runs while the model request is in flight
+        heuristic_result = (heuristic or self.heuristic)(text)
+
+        remaining = self.deadline - (time.perf_counter() - started)
+        try:
+            llm_result = await asyncio.wait_for(asyncio.shield(llm_task), max(0.0, remaining))
+        except asyncio.TimeoutError:
+            llm_result = None
+
+        if llm_result is not None:
+            self.stats['llm_wins'] += 1
+            if heuristic_result.get('conversation_id'):
+                self.end_conversation(heuristic_result['conversation_id'])
+            return llm_result
+
+        self.stats['heuristic_wins'] += 1
+        heuristic_result['latency'] = time.perf_counter() - started
+        if not llm_task.done():
+            llm_task.add_done_callback(self._count_late_answer)
+            heuristic_result['llm_pending'] = llm_task
+        return heuristic_result
+
+    def _count_late_answer(self, task) -> None:
+        if not task.cancelled() and task.result() is not None:
+            self.stats['late_answers'] += 1
+
+    def prioritize_sync(self, text: str, heuristic=None) -> dict:
+        """
+        Blocking wrapper for scripts such as Streamlit.
+
+        Runs on a background event loop so a late model answer can still arrive
+        after this call returns; 'llm_pending' is then a concurrent.futures.Future.
+        """
+        loop = self._ensure_loop()
+        result = asyncio.run_coroutine_threadsafe(self.prioritize(text, heuristic), loop).result()
+        pending = result.get('llm_pending')
+        if pending is not None:
+            future = concurrent.futures.Future()
+
+            def relay(task):
+                if task.cancelled():
+                    future.set_result(None)
+                else:
+                    future.set_result(task.result())
+
+            loop.call_soon_threadsafe(pending.add_done_callback, relay)
+            result['llm_pending'] = future
+        return result
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="llm-prioritizer", daemon=True
+                ).start()
+            return self._loop
+
+    def close(self) -> None:
+        """Stop the background event loop used by prioritize_sync."""
+        with self._loop_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
@@ -4,9 +4,455 @@ This version includes conversational follow-up questions when confidence is low.
 """
 import json
 import os
+import re
 import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 
+try:
+    from .classification_cache import ClassificationCache, normalize_text
+    from .session_store import ConversationStore
+except ImportError:  # Loaded as a top-level module via sys.path
+    from classification_cache import ClassificationCache, normalize_text
+    from session_store import ConversationStore
+
+# Critical priority indicators (Priority 5)
+CRITICAL_INDICATORS = {
+    "life_threatening": ["unconscious", "not breathing", "cardiac arrest", "heart attack", 
+                       "severe bleeding", "hemorrhaging", "choking", "overdose"],
+    "missing_persons": ["child missing", "person missing", "lost child", "abducted"],
+    "structural": ["building collapse", "trapped", "buried", "structure unstable"],
+    "hazmat": ["chemical spill", "gas leak", "toxic", "radiation", "hazardous material"],
+    "fire_explosion": ["fire", "explosion", "burning building", "smoke inhalation"]
+}
+
+# High priority indicators (Priority 4)  
+HIGH_INDICATORS = {
+    "medical_urgent": ["injury", "broken bone", "diabetic emergency", "insulin", "asthma attack",
+                      "seizure", "chest pain", "difficulty breathing", "allergic reaction"],
+    "vulnerable": ["pregnant", "baby", "infant", "elderly", "disabled", "wheelchair"],
+    "essential_needs": ["no water", "dehydration", "no food", "starving", "hypothermia"],
+    "immediate_danger": ["flood rising", "evacuate now", "shelter collapsing", "unsafe"]
+}
+
+# Medium priority indicators (Priority 3)
+MEDIUM_INDICATORS = {
+    "medical_stable": ["cut", "bruise", "sprain", "minor injury", "headache"],
+    "basic_needs": ["food needed", "water needed", "shelter needed", "clothing"],
+    "utilities": ["power out", "no electricity", "no phone", "communication down"]
+}
+
+# Low priority indicators (Priority 2)
+LOW_INDICATORS = {
+    "property": ["property damage", "roof damage", "window broken", "fence down"],
+    "non_urgent": ["when possible", "not urgent", "later", "minor"]
+}
+
+# Urgency language (boosts medium tickets)
+URGENCY_WORDS = ["urgent", "immediately", "asap", "emergency", "help now", "critical"]
+
+class KeywordMatcher:
+    """
+    Finds every occurrence of a set of keyword tables in a single regex pass.
+    
+    Matching keeps plain substring semantics (the same answer as running
+    `keyword in text` for each keyword) and reports hits in table order.
+    """
+    
+    def __init__(self, tables: dict):
+        """
+        Args:
+            tables: Mapping of table name to either a {category: [keywords]} dict
+                    or a flat list of keywords (category is then None)
+        """
+        self.tables = {}
+        self._positions = {}
+        for name, table in tables.items():
+            if isinstance(table, dict):
+                entries = [(category, kw) for category, kws in table.items() for kw in kws]
+            else:
+                entries = [(None, kw) for kw in table]
+            self.tables[name] = entries
+            for index, (_, kw) in enumerate(entries):
+                self._positions.setdefault(kw, []).append((name, index))
+        
+        keywords = list(self._positions)
+        self.max_length = max((len(kw) for kw in keywords), default=0)
+        
+        # A hit on a keyword also means every keyword contained in it is present
+        self._implied = {kw: tuple(other for other in keywords if other in kw) for kw in keywords}
+        
+        # Keywords that can start inside a match and run past its end; the regex
+        # consumes each match, so these are confirmed with a direct lookup instead
+        self._overlaps = {
+            kw: frozenset(
+                other
+                for offset in range(1, len(kw))
+                for other in keywords
+                if len(other) > len(kw) - offset and other.startswith(kw[offset:])
+            )
+            for kw in keywords
+        }
+        
+        self._pattern = re.compile(self._trie_pattern(keywords)) if keywords else None
+    
+    @staticmethod
+    def _trie_pattern(keywords: list) -> str:
+        """Build a prefix-trie regex so the engine never backtracks across alternatives."""
+        trie = {}
+        for kw in keywords:
+            node = trie
+            for ch in kw:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        
+        def build(node):
+            terminal = "" in node
+            branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            # Greedy optional tail prefers the longest keyword at each position
+            if terminal:
+                return "(?:" + body + ")?"
+            return body
+        
+        return build(trie)
+    
+    def find(self, text: str) -> set:
+        """Return the set of keywords that occur in text."""
+        found = set()
+        if self._pattern is not None:
+            matched = set(self._pattern.findall(text))
+            candidates = set()
+            for keyword in matched:
+                found.update(self._implied[keyword])
+                candidates.update(self._overlaps[keyword])
+            for other in candidates - found:
+                if other in text:
+                    found.update(self._implied[other])
+        return found
+    
+    def group(self, found: set) -> dict:
+        """Arrange found keywords as {table: [(category, keyword), ...]} in table order."""
+        hits = {name: [] for name in self.tables}
+        if not found:
+            return hits
+        
+        indices = {}
+        for keyword in found:
+            for name, index in self._positions[keyword]:
+                indices.setdefault(name, []).append(index)
+        
+        for name, idx in indices.items():
+            entries = self.tables[name]
+            hits[name] = [entries[i] for i in sorted(idx)]
+        return hits
+    
+    def scan(self, text: str) -> dict:
+        """Return {table: [(category, keyword), ...]} for all keywords found in text."""
+        return self.group(self.find(text))
+
+class IndicatorScanState:
+    """
+    Accumulated keyword hits for text that is only ever appended to.
+    
+    Each feed() scans just the new text plus a short tail of the previous text
+    (enough for a keyword spanning the boundary), so hits always equal a scan
+    of the whole concatenation.
+    """
+    
+    def __init__(self, matcher: KeywordMatcher):
+        self.matcher = matcher
+        self.found = set()
+        self.exclaimed = False  # "!!!" seen anywhere
+        self._keep = max(matcher.max_length - 1, 0)
+        self._tail = ""
+        self._raw_tail = ""
+    
+    def feed(self, text: str) -> None:
+        window = self._tail + text.lower()
+        self.found |= self.matcher.find(window)
+        self._tail = window[-self._keep:] if self._keep else ""
+        
+        raw = self._raw_tail + text
+        if "!!!" in raw:
+            self.exclaimed = True
+        self._raw_tail = raw[-2:]
+    
+    def hits(self) -> dict:
+        return self.matcher.group(self.found)
+
+def _build_indicator_matcher() -> KeywordMatcher:
+    return KeywordMatcher({
+        "critical": CRITICAL_INDICATORS,
+        "high": HIGH_INDICATORS,
+        "medium": MEDIUM_INDICATORS,
+        "low": LOW_INDICATORS,
+        "urgency": URGENCY_WORDS,
+    })
+
+# Compiled once at import; call reload_indicator_tables() after editing the tables
+INDICATOR_MATCHER = _build_indicator_matcher()
+
+# Memoized classify_ticket_priority results keyed on normalized text
+classification_cache = ClassificationCache(
+    maxsize=int(os.getenv("PRIORITY_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("PRIORITY_CACHE_TTL", "900")),
+)
+
+# Conversations awaiting answers to clarifying questions, shared by all sessions
+conversation_store = ConversationStore(
+    max_sessions=int(os.getenv("PRIORITIZER_SESSION_LIMIT", "1000")),
+    ttl=float(os.getenv("PRIORITIZER_SESSION_TTL", "1800")),
+)
+
+def reload_indicator_tables() -> None:
+    """Recompile the indicator matcher from the tables above and drop cached results."""
+    global INDICATOR_MATCHER
+    INDICATOR_MATCHER = _build_indicator_matcher()
+    classification_cache.invalidate()
+
+# Q&A escalation patterns, matched against all answers joined by spaces.
+# Plain patterns are substrings; "a.*b" means "a" followed later by "b" on
+# the same line. Critical groups add +2, high groups add +1.
+QA_CRITICAL_PATTERNS = {
+    "life_threatening": ["unconscious", "not breathing", "no pulse", "cardiac", "heart attack"],
+    "entrapment": ["trapped", "buried", "stuck under", "collapsed on", "pinned down"],
+    "severe_bleeding": ["severe bleeding", "lots of blood", "hemorrhaging", "bleeding heavily"],
+    "vulnerable_in_danger": ["child", "baby", "infant", "pregnant", "danger", "immediate", "critical"],
+    "multiple_victims": ["multiple people", "many people", "several people", "group of"],
+    "deteriorating": ["getting worse", "deteriorating", "spreading", "unstable", "collapsing"]
+}
+
+QA_HIGH_PATTERNS = {
+    "medical_emergency": ["difficulty breathing", "can't breathe", "chest pain", "diabetic", "insulin"],
+    "injury": ["injury", "hurt", "pain", "broken", "fractured"],
+    "safety": ["immediate danger", "unsafe", "hazardous", "dangerous"],
+    "vulnerable": ["elderly", "disabled", "wheelchair", "vulnerable"],
+    "urgency": ["urgent", "immediately", "asap", "help now", "emergency"],
+    "affirmed_danger": ["yes.*danger", "yes.*immediate", "yes.*critical"]
+}
+
+# Question-type rules, checked in order (first matching question type wins).
+# A question matches when it contains all of "question_all" or any of
+# "question_any"; an answer containing any "answer_any" phrase adds +1.
+QA_QUESTION_RULES = [
+    {"name": "immediate_danger", "question_all": ["immediate", "danger"],
+     "answer_any": ["yes", "trapped", "stuck", "buried", "critical"]},
+    {"name": "people_count", "question_any": ["how many", "people affected"],
+     "answer_any": ["multiple", "several", "many", "group", "family",
+                    "two", "three", "four", "five", "2", "3", "4", "5",
+                    "child", "baby", "elderly", "pregnant"]},
+    {"name": "deteriorating", "question_any": ["getting worse", "deteriorating"],
+     "answer_any": ["yes", "worse", "unstable", "collapsing", "spreading"]},
+    {"name": "medical_condition", "question_any": ["conscious", "breathing", "medical", "condition"],
+     "answer_any": ["no", "unconscious", "difficulty", "struggling", "critical"]},
+]
+
+def _compile_alternation(patterns: list) -> re.Pattern:
+    """Compile literal patterns into one regex with a capture group per pattern."""
+    return re.compile("|".join("(" + re.escape(p) + ")" for p in patterns))
+
+class QAEscalationRules:
+    """
+    Precompiled rule engine for Q&A priority escalation.
+    
+    All literal patterns of a level share one regex, so a single search answers
+    "did any group fire" and the capture group tells which pattern it was.
+    Gapped "a.*b" patterns are tracked per line by QAEscalationState.
+    """
+    
+    LEVELS = (("critical", 2), ("high", 1))
+    
+    def __init__(self, critical_patterns: dict, high_patterns: dict, question_rules: list):
+        self.levels = {
+            "critical": self._compile_groups(critical_patterns),
+            "high": self._compile_groups(high_patterns),
+        }
+        self.question_rules = [
+            (rule["name"], tuple(rule.get("question_all", ())), tuple(rule.get("question_any", ())),
+             list(rule["answer_any"]), _compile_alternation(rule["answer_any"]))
+            for rule in question_rules
+        ]
+        self._question_types = {}
+        
+        # Longest literal, so a state can keep enough text to match across answers
+        literals = [
+            part
+            for _, labels, gapped in self.levels.values()
+            for part in [pattern for _, pattern in labels] + [a for _, _, a, _ in gapped] + [b for _, _, _, b in gapped]
+        ]
+        self.max_length = max((len(part) for part in literals), default=0)
+    
+    @staticmethod
+    def _compile_groups(groups: dict) -> tuple:
+        """Return (literal regex, literal labels, gapped patterns) for one level."""
+        labels = []
+        gapped = []
+        for name, patterns in groups.items():
+            for pattern in patterns:
+                if ".*" in pattern:
+                    parts = pattern.split(".*")
+                    if len(parts) != 2 or any(re.escape(part) != part or not part for part in parts):
+                        raise ValueError(f"Unsupported Q&A pattern: {pattern!r}")
+                    gapped.append((name, pattern, parts[0], parts[1]))
+                else:
+                    labels.append((name, pattern))
+        regex = _compile_alternation([pattern for _, pattern in labels]) if labels else None
+        return regex, labels, gapped
+    
+    def question_type(self, question: str):
+        """Return the index of the first question rule matching question, or None."""
+        rule_index = self._question_types.get(question, -1)
+        if rule_index != -1:
+            return rule_index
+        
+        q_lower = question.lower()
+        rule_index = None
+        for i, (_, question_all, question_any, _, _) in enumerate(self.question_rules):
+            if question_all and all(word in q_lower for word in question_all):
+                rule_index = i
+                break
+            if question_any and any(word in q_lower for word in question_any):
+                rule_index = i
+                break
+        
+        # Questions come from a small set of templates, but keep the memo bounded
+        if len(self._question_types) >= 1024:
+            self._question_types.clear()
+        self._question_types[question] = rule_index
+        return rule_index
+    
+    def evaluate_answer(self, question: str, a_lower: str):
+        """Return (rule name, pattern) if the lowercased answer triggers its question rule."""
+        rule_index = self.question_type(question)
+        if rule_index is None:
+            return None
+        name, _, _, answer_patterns, regex = self.question_rules[rule_index]
+        match = regex.search(a_lower)
+        if match is None:
+            return None
+        return name, answer_patterns[match.lastindex - 1]
+    
+    def evaluate(self, qa_pairs: list) -> dict:
+        """
+        Evaluate every Q&A pair in one pass.
+        
+        Returns:
+            dict: 'boost' (0-2) and 'triggers', a list of
+                  (level, rule, pattern) tuples describing what fired
+        """
+        state = QAEscalationState(self)
+        for question, answer in qa_pairs:
+            state.add(question, answer)
+        return state.result()
+
+class QAEscalationState:
+    """
+    Incremental Q&A escalation for a growing conversation.
+    
+    Each add() scans only the new answer (plus a short tail of the previous
+    ones), and fired rules are sticky, so feeding answers one round at a time
+    gives the same result as evaluating the whole transcript at once.
+    """
+    
+    def __init__(self, rules: QAEscalationRules):
+        self.rules = rules
+        self.level_triggers = {}      # level -> (group, pattern) of the first rule to fire
+        self.question_trigger = None  # (rule name, pattern) of the first question rule to fire
+        self._answers = 0
+        self._length = 0              # length of the joined answers so far
+        self._tail = ""
+        self._keep = max(rules.max_length - 1, 0)
+        self._prefix_ends = {}        # (level, index) -> end of earliest "a" on the current line
+    
+    def add(self, question: str, answer: str) -> None:
+        a_lower = answer.lower()
+        if self.question_trigger is None:
+            self.question_trigger = self.rules.evaluate_answer(question, a_lower)
+        
+        new = (" " + a_lower) if self._answers else a_lower
+        self._answers += 1
+        window = self._tail + new
+        window_start = self._length - len(self._tail)
+        
+        # Critical dominates, so nothing else needs tracking once it has fired
+        if "critical" not in self.level_triggers:
+            for level, _ in QAEscalationRules.LEVELS:
+                if level not in self.level_triggers:
+                    fired = self._scan_level(level, window, window_start)
+                    if fired:
+                        self.level_triggers[level] = fired
+        
+        self._length += len(new)
+        self._tail = window[-self._keep:] if self._keep else ""
+    
+    def _scan_level(self, level: str, window: str, window_start: int):
+        regex, labels, gapped = self.rules.levels[level]
+        fired = None
+        if regex is not None:
+            match = regex.search(window)
+            if match:
+                fired = labels[match.lastindex - 1]
+        
+        # Gapped patterns: remember where "a" first ended on the current line and
+        # look for "b" after it; only text ending past the old end is new
+        old_end = self._length
+        for index, (name, pattern, prefix, suffix) in enumerate(gapped):
+            key = (level, index)
+            prefix_end = self._prefix_ends.get(key)
+            line_start = 0
+            for line in window.split("\n"):
+                line_abs = window_start + line_start
+                if prefix_end is None:
+                    # Only prefixes ending in the new text; older ones were seen before
+                    search_from = max(0, old_end - len(prefix) + 1 - line_abs)
+                    found = line.find(prefix, search_from)
+                    if found != -1:
+                        prefix_end = line_abs + found + len(prefix)
+                if prefix_end is not None and fired is None:
+                    if line.find(suffix, max(0, prefix_end - line_abs)) != -1:
+                        fired = (name, pattern)
+                line_start += len(line) + 1
+                if line_start <= len(window):
+                    # A newline follows this line: only reset if it is new text
+                    if window_start + line_start > old_end:
+                        prefix_end = None
+            self._prefix_ends[key] = prefix_end
+        return fired
+    
+    @property
+    def boost(self) -> int:
+        boost = 0
+        for level, level_boost in QAEscalationRules.LEVELS:
+            if level in self.level_triggers:
+                boost = level_boost
+                break
+        # Question-specific analysis adds at most +1, total boost capped at 2
+        if self.question_trigger:
+            boost += 1
+        return min(2, boost)
+    
+    @property
+    def triggers(self) -> list:
+        triggers = []
+        for level, _ in QAEscalationRules.LEVELS:
+            if level in self.level_triggers:
+                triggers.append((level, *self.level_triggers[level]))
+                break
+        if self.question_trigger:
+            triggers.append(("question", *self.question_trigger))
+        return triggers
+    
+    def result(self) -> dict:
+        return {'boost': self.boost, 'triggers': self.triggers}
+
+QA_RULES = QAEscalationRules(QA_CRITICAL_PATTERNS, QA_HIGH_PATTERNS, QA_QUESTION_RULES)
+
 class PrioritizerConversation:
     """Manages conversational priority classification with follow-up questions."""
     
@@ -14,6 +460,11 @@ class PrioritizerConversation:
         self.conversation_history = []
         self.confidence_threshold = 0.7
         
+        # Incremental reclassification state (see reclassify_with_answers)
+        self.original_description = None
+        self._indicator_state = None
+        self._qa_state = None
+        
     def get_clarifying_questions(self, initial_classification: dict, description: str) -> list:
         """Generate clarifying questions based on initial classification."""
         priority = initial_classification['priority']
@@ -82,19 +533,58 @@ class PrioritizerConversation:
             return priority_questions[:2]
     
     def reclassify_with_answers(self, original_description: str, qa_pairs: list) -> dict:
-        """Reclassify priority with additional context from Q&A."""
+        """
+        Reclassify priority with additional context from Q&A.
+        
+        The conversation keeps its indicator hits and escalation state, so when
+        qa_pairs extends the pairs already seen only the new answers are scanned.
+        The result is the same as classifying the full transcript from scratch.
+        """
+        seen = len(self.conversation_history)
+        if (self.original_description != original_description
+                or len(qa_pairs) < seen
+                or any(tuple(pair) != old for pair, old in zip(qa_pairs, self.conversation_history))):
+            self.start(original_description)
+            seen = 0
         
-        # Build enhanced context
-        enhanced_context = original_description + "\n\nAdditional Information:\n"
-        for q, a in qa_pairs:
-            enhanced_context += f"Q: {q}\nA: {a}\n"
+        for question, answer in qa_pairs[seen:]:
+            self._add_answer(question, answer)
         
+        result = self._current_result()
+        result['qa_pairs'] = qa_pairs
+        return result
+    
+    def start(self, original_description: str) -> None:
+        """Reset the conversation state for a new ticket description."""
+        self.original_description = original_description
+        self.conversation_history = []
+        self._indicator_state = IndicatorScanState(INDICATOR_MATCHER)
+        self._indicator_state.feed(original_description + "\n\nAdditional Information:\n")
+        self._qa_state = QAEscalationState(QA_RULES)
+    
+    def add_answers(self, qa_pairs: list) -> dict:
+        """Add a new round of (question, answer) pairs and return the updated classification."""
+        if self._indicator_state is None:
+            raise RuntimeError("Call start() before adding answers")
+        for question, answer in qa_pairs:
+            self._add_answer(question, answer)
+        result = self._current_result()
+        result['qa_pairs'] = list(self.conversation_history)
+        return result
+    
+    def _add_answer(self, question: str, answer: str) -> None:
+        # Same text the full recompute would append to the enhanced context
+        self._indicator_state.feed(f"Q: {question}\nA: {answer}\n")
+        self._qa_state.add(question, answer)
+        self.conversation_history.append((question, answer))
+    
+    def _current_result(self) -> dict:
         # Start with enhanced heuristic classification
-        result = enhanced_priority_classification(enhanced_context)
+        result = _classify_from_hits(self._indicator_state.hits(), self._indicator_state.exclaimed)
         base_priority = result['priority']
         
         # Smart Q&A analysis for priority escalation
-        priority_boost = self._analyze_qa_responses(qa_pairs, base_priority)
+        priority_boost = self._qa_state.boost
         
         # Apply boost but cap at 5
         final_priority = min(5, base_priority + priority_boost)
@@ -103,11 +593,11 @@ class PrioritizerConversation:
         result['priority'] = final_priority
         result['base_priority'] = base_priority
         result['qa_boost'] = priority_boost
+        result['qa_triggers'] = self._qa_state.triggers
         
         # Boost confidence since we have more information
         result['confidence'] = min(0.95, result['confidence'] + 0.2)
         result['source'] = 'enhanced_with_qa'
-        result['qa_pairs'] = qa_pairs
         
         # Update reasoning to reflect Q&A impact
         if priority_boost > 0:
@@ -117,107 +607,15 @@ class PrioritizerConversation:
     
     def _analyze_qa_responses(self, qa_pairs: list, base_priority: int) -> int:
         """Analyze Q&A responses for priority escalation indicators."""
-        boost = 0
-        
-        # Convert all answers to lowercase for analysis
-        all_answers = " ".join([a.lower() for q, a in qa_pairs])
-        
-        # Critical escalation indicators (+2 priority)
-        critical_patterns = [
-            # Life-threatening situations
-            ["unconscious", "not breathing", "no pulse", "cardiac", "heart attack"],
-            ["trapped", "buried", "stuck under", "collapsed on", "pinned down"],
-            ["severe bleeding", "lots of blood", "hemorrhaging", "bleeding heavily"],
-            ["child", "baby", "infant", "pregnant"] + ["danger", "immediate", "critical"],
-            ["multiple people", "many people", "several people", "group of"],
-            ["getting worse", "deteriorating", "spreading", "unstable", "collapsing"]
-        ]
-        
-        # High priority escalation indicators (+1 priority)
-        high_patterns = [
-            # Medical emergencies
-            ["difficulty breathing", "can't breathe", "chest pain", "diabetic", "insulin"],
-            ["injury", "hurt", "pain", "broken", "fractured"],
-            # Safety concerns
-            ["immediate danger", "unsafe", "hazardous", "dangerous"],
-            ["elderly", "disabled", "wheelchair", "vulnerable"],
-            # Urgency indicators
-            ["urgent", "immediately", "asap", "help now", "emergency"],
-            ["yes.*danger", "yes.*immediate", "yes.*critical"],  # Regex patterns
-        ]
-        
-        # Check for critical patterns
-        for pattern_group in critical_patterns:
-            if self._check_pattern_group(all_answers, pattern_group):
-                boost = max(boost, 2)  # Maximum boost of 2 for critical
-                break
-        
-        # Check for high priority patterns if no critical found
-        if boost < 2:
-            for pattern_group in high_patterns:
-                if self._check_pattern_group(all_answers, pattern_group):
-                    boost = max(boost, 1)  # Boost of 1 for high priority
-        
-        # Special analysis for specific question types
-        boost += self._analyze_specific_questions(qa_pairs)
-        
-        # Cap the total boost at 2
-        return min(2, boost)
-    
-    def _check_pattern_group(self, text: str, patterns: list) -> bool:
-        """Check if any patterns in the group match the text."""
-        for pattern in patterns:
-            if ".*" in pattern:
-                # Regex pattern
-                import re
-                if re.search(pattern, text):
-                    return True
-            else:
-                # Simple substring match
-                if pattern in text:
-                    return True
-        return False
-    
-    def _analyze_specific_questions(self, qa_pairs: list) -> int:
-        """Analyze answers to specific question types for additional context."""
-        boost = 0
-        
-        for question, answer in qa_pairs:
-            q_lower = question.lower()
-            a_lower = answer.lower()
-            
-            # Immediate danger questions
-            if "immediate" in q_lower and "danger" in q_lower:
-                if any(word in a_lower for word in ["yes", "trapped", "stuck", "buried", "critical"]):
-                    boost += 1
-            
-            # People count questions
-            elif "how many" in q_lower or "people affected" in q_lower:
-                # Look for multiple people indicators
-                if any(word in a_lower for word in ["multiple", "several", "many", "group", "family"]):
-                    boost += 1
-                # Look for specific numbers > 1
-                elif any(word in a_lower for word in ["two", "three", "four", "five", "2", "3", "4", "5"]):
-                    boost += 1
-                elif any(word in a_lower for word in ["child", "baby", "elderly", "pregnant"]):
-                    boost += 1
-            
-            # Getting worse questions
-            elif "getting worse" in q_lower or "deteriorating" in q_lower:
-                if any(word in a_lower for word in ["yes", "worse", "unstable", "collapsing", "spreading"]):
-                    boost += 1
-            
-            # Medical condition questions
-            elif any(med_word in q_lower for med_word in ["conscious", "breathing", "medical", "condition"]):
-                if any(word in a_lower for word in ["no", "unconscious", "difficulty", "struggling", "critical"]):
-                    boost += 1
-        
-        return min(1, boost)  # Cap at 1 for specific question analysis
+        return QA_RULES.evaluate(qa_pairs)['boost']
 
 def classify_ticket_priority(ticket_description: str, additional_context: str = "") -> dict:
     """
     Classify a ticket's priority using enhanced heuristics.
     
+    Results are memoized in `classification_cache`, keyed on the text with case
+    and surrounding whitespace normalized.
+    
     Args:
         ticket_description: The main description of the ticket
         additional_context: Any additional context (location, time, etc.)
@@ -229,12 +627,23 @@ def classify_ticket_priority(ticket_description: str, additional_context: str =
     if additional_context:
         full_text += f" {additional_context}"
     
-    return enhanced_priority_classification(full_text)
+    # Identical text (ignoring case and surrounding spaces) reuses the cached result
+    key = normalize_text(full_text)
+    result = classification_cache.get(key)
+    if result is None:
+        result = enhanced_priority_classification(full_text)
+        classification_cache.set(key, result)
+    
+    # Callers add fields to the result, so never hand out the cached dict itself
+    return dict(result, key_indicators=list(result['key_indicators']))
 
 def classify_with_conversation(ticket_description: str, additional_context: str = "") -> dict:
     """
     Enhanced classification that includes follow-up questions when confidence is low.
     
+    When questions are asked, the conversation is kept in `conversation_store`
+    and its ID is returned as 'conversation_id' for answer_questions_and_reclassify.
+    
     Args:
         ticket_description: The main description of the ticket
         additional_context: Any additional context (location, time, etc.)
@@ -254,92 +663,144 @@ def classify_with_conversation(ticket_description: str, additional_context: str
     # Generate clarifying questions
     questions = conversation.get_clarifying_questions(initial_result, ticket_description)
     
+    # Scan the description now so the follow-up round only scans the answers
+    conversation.start(ticket_description)
+    session = conversation_store.create(ticket_description, dict(initial_result), questions, conversation)
+    
     # Add questions to the result
     initial_result['needs_clarification'] = True
     initial_result['clarifying_questions'] = questions
-    initial_result['conversation_id'] = id(conversation)  # Simple ID for tracking
+    initial_result['conversation_id'] = session.conversation_id
     
     return initial_result
 
 def answer_questions_and_reclassify(original_description: str, qa_pairs: list, 
-                                  conversation_id: int = None) -> dict:
+                                  conversation_id: str = None) -> dict:
     """
     Reclassify after receiving answers to clarifying questions.
     
     Args:
         original_description: The original ticket description
         qa_pairs: List of (question, answer) tuples
-        conversation_id: ID to track conversation (optional)
+        conversation_id: ID returned by classify_with_conversation (optional);
+                         an unknown or expired ID falls back to a fresh conversation
     
     Returns:
         dict: Updated priority classification
     """
-    conversation = PrioritizerConversation()
-    return conversation.reclassify_with_answers(original_description, qa_pairs)
+    session = conversation_store.get(conversation_id) if conversation_id else None
+    if session is None or session.description != original_description:
+        conversation = PrioritizerConversation()
+        return conversation.reclassify_with_answers(original_description, qa_pairs)
+    
+    with session.lock:
+        result = session.conversation.reclassify_with_answers(original_description, qa_pairs)
+        result['conversation_id'] = session.conversation_id
+        result['initial_priority'] = session.initial_result['priority']
+        session.last_result = result
+    return dict(result)
+
+def end_conversation(conversation_id: str) -> None:
+    """Release a conversation once its ticket has been created or cancelled."""
+    if conversation_id:
+        conversation_store.discard(conversation_id)
+
+def _classify_chunk(chunk: list) -> tuple:
+    """Worker entry point: classify one chunk and time it."""
+    start = time.perf_counter()
+    results = [classify_ticket_priority(description) for description in chunk]
+    return results, time.perf_counter() - start
+
+def classify_tickets_batch(descriptions, workers: int = None, chunk_size: int = 256,
+                           on_chunk=None):
+    """
+    Classify many tickets, fanning chunks out across a process pool.
+    
+    Results are streamed back in input order as each chunk completes, so large
+    backlogs (or generators) never have to be held in memory all at once.
+    
+    Args:
+        descriptions: Iterable of ticket description strings
+        workers: Number of worker processes (None = CPU count, 0 or 1 = in-process)
+        chunk_size: Number of tickets sent to a worker at a time
+        on_chunk: Optional callback receiving per-chunk throughput stats
+                  (chunk index, size, seconds, tickets_per_sec)
+    
+    Yields:
+        dict: Priority classification result for each description, in order
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    
+    iterator = iter(descriptions)
+    chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+    
+    def report(index, size, seconds):
+        if on_chunk:
+            on_chunk({
+                'chunk': index,
+                'size': size,
+                'seconds': seconds,
+                'tickets_per_sec': size / seconds if seconds > 0 else float('inf'),
+            })
+    
+    if workers is not None and workers <= 1:
+        for index, chunk in enumerate(chunks):
+            results, seconds = _classify_chunk(chunk)
+            report(index, len(chunk), seconds)
+            yield from results
+        return
+    
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Keep a bounded number of chunks in flight so the input is consumed lazily
+        max_pending = workers * 2
+        pending = deque()
+        index = 0
+        for chunk in chunks:
+            pending.append((index, len(chunk), pool.submit(_classify_chunk, chunk)))
+            index += 1
+            if len(pending) >= max_pending:
+                done_index, size, future = pending.popleft()
+                results, seconds = future.result()
+                report(done_index, size, seconds)
+                yield from results
+        
+        while pending:
+            done_index, size, future = pending.popleft()
+            results, seconds = future.result()
+            report(done_index, size, seconds)
+            yield from results
 
 def enhanced_priority_classification(text: str) -> dict:
     """
     Enhanced heuristic classification with detailed analysis.
     """
     t = (text or "").lower()
+    
+    # Single pass over the text for every indicator table
+    hits = INDICATOR_MATCHER.scan(t)
+    return _classify_from_hits(hits, "!!!" in text)
+
+def _classify_from_hits(hits: dict, exclaimed: bool) -> dict:
+    """Score a ticket from its indicator hits (see enhanced_priority_classification)."""
     score = 3
     key_indicators = []
     reasoning = ""
     
-    # Critical priority indicators (Priority 5)
-    critical_indicators = {
-        "life_threatening": ["unconscious", "not breathing", "cardiac arrest", "heart attack", 
-                           "severe bleeding", "hemorrhaging", "choking", "overdose"],
-        "missing_persons": ["child missing", "person missing", "lost child", "abducted"],
-        "structural": ["building collapse", "trapped", "buried", "structure unstable"],
-        "hazmat": ["chemical spill", "gas leak", "toxic", "radiation", "hazardous material"],
-        "fire_explosion": ["fire", "explosion", "burning building", "smoke inhalation"]
-    }
-    
-    # High priority indicators (Priority 4)  
-    high_indicators = {
-        "medical_urgent": ["injury", "broken bone", "diabetic emergency", "insulin", "asthma attack",
-                          "seizure", "chest pain", "difficulty breathing", "allergic reaction"],
-        "vulnerable": ["pregnant", "baby", "infant", "elderly", "disabled", "wheelchair"],
-        "essential_needs": ["no water", "dehydration", "no food", "starving", "hypothermia"],
-        "immediate_danger": ["flood rising", "evacuate now", "shelter collapsing", "unsafe"]
-    }
-    
-    # Medium priority indicators (Priority 3)
-    medium_indicators = {
-        "medical_stable": ["cut", "bruise", "sprain", "minor injury", "headache"],
-        "basic_needs": ["food needed", "water needed", "shelter needed", "clothing"],
-        "utilities": ["power out", "no electricity", "no phone", "communication down"]
-    }
-    
-    # Low priority indicators (Priority 2)
-    low_indicators = {
-        "property": ["property damage", "roof damage", "window broken", "fence down"],
-        "non_urgent": ["when possible", "not urgent", "later", "minor"]
-    }
-    
-    # Analyze for critical indicators
-    critical_score = 0
-    for category, keywords in critical_indicators.items():
-        for keyword in keywords:
-            if keyword in t:
-                critical_score += 2
-                key_indicators.append(keyword)
-                if critical_score >= 2:
-                    score = 5
-                    reasoning = f"CRITICAL: Life-threatening situation detected ({category})"
-                    break
-        if score == 5:
-            break
+    # Analyze for critical indicators (first hit in table order wins)
+    if hits["critical"]:
+        category, keyword = hits["critical"][0]
+        key_indicators.append(keyword)
+        score = 5
+        reasoning = f"CRITICAL: Life-threatening situation detected ({category})"
     
     # Analyze for high priority if not critical
     if score != 5:
         high_score = 0
-        for category, keywords in high_indicators.items():
-            for keyword in keywords:
-                if keyword in t:
-                    high_score += 1
-                    key_indicators.append(keyword)
+        for category, keyword in hits["high"]:
+            high_score += 1
+            key_indicators.append(keyword)
         
         if high_score >= 2:
             score = 4
@@ -350,14 +811,12 @@ def enhanced_priority_classification(text: str) -> dict:
     
     # Analyze urgency language
     urgency_boost = 0
-    urgency_words = ["urgent", "immediately", "asap", "emergency", "help now", "critical"]
-    for word in urgency_words:
-        if word in t:
-            urgency_boost += 1
-            key_indicators.append(word)
+    for _, word in hits["urgency"]:
+        urgency_boost += 1
+        key_indicators.append(word)
     
     # Punctuation intensity
-    if "!!!" in text:
+    if exclaimed:
         urgency_boost += 1
         key_indicators.append("multiple exclamation marks")
     
@@ -368,11 +827,7 @@ def enhanced_priority_classification(text: str) -> dict:
     
     # Check for low priority indicators
     if score == 3:  # Only downgrade if currently medium
-        low_count = 0
-        for category, keywords in low_indicators.items():
-            for keyword in keywords:
-                if keyword in t:
-                    low_count += 1
+        low_count = len(hits["low"])
         
         if low_count >= 2:
             score = 2
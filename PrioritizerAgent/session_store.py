@@ -0,0 +1,129 @@
+"""
+Bounded, TTL-evicting store for in-progress prioritizer conversations.
+A ticket that needs clarification keeps its initial classification, the
+questions asked and the partial reclassification state here, so follow-up
+answers reuse that work instead of starting over.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+@dataclass
+class ConversationSession:
+    """State kept for one conversation between its question and answer rounds."""
+    conversation_id: str
+    description: str
+    initial_result: dict
+    questions: list
+    conversation: object  # PrioritizerConversation holding the incremental state
+    created_at: float = field(default_factory=time.time)
+    last_result: Optional[dict] = None
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+class ConversationStore:
+    """
+    Thread-safe conversation store with LRU eviction and a sliding TTL.
+
+    One store is shared by every Streamlit session and thread in the process;
+    sessions are looked up by an opaque conversation ID.
+    """
+
+    def __init__(self, max_sessions: int = 1000, ttl: float = 1800.0):
+        """
+        Args:
+            max_sessions: Maximum live conversations (least recently used are evicted)
+            ttl: Seconds of inactivity before a conversation expires
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions = OrderedDict()  # conversation_id -> (session, expires_at)
+        self._lock = threading.Lock()
+        self.created = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.expired = 0
+
+    def create(self, description: str, initial_result: dict, questions: list,
+               conversation) -> ConversationSession:
+        """Register a new conversation and return its session."""
+        session = ConversationSession(
+            conversation_id=uuid.uuid4().hex,
+            description=description,
+            initial_result=initial_result,
+            questions=list(questions),
+            conversation=conversation,
+        )
+        with self._lock:
+            self._purge_expired()
+            self._sessions[session.conversation_id] = (session, self._expiry())
+            self.created += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+        return session
+
+    def get(self, conversation_id: str) -> Optional[ConversationSession]:
+        """Return the live session for conversation_id (refreshing its TTL), or None."""
+        with self._lock:
+            entry = self._sessions.get(conversation_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            session, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._sessions[conversation_id]
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            self._sessions[conversation_id] = (session, self._expiry())
+            self._sessions.move_to_end(conversation_id)
+            self.hits += 1
+            return session
+
+    def discard(self, conversation_id: str) -> None:
+        """Forget a conversation once its ticket is created or cancelled."""
+        with self._lock:
+            self._sessions.pop(conversation_id, None)
+
+    def stats(self) -> dict:
+        """Return size and eviction metrics."""
+        with self._lock:
+            self._purge_expired()
+            return {
+                'size': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'ttl': self.ttl,
+                'created': self.created,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evicted': self.evicted,
+                'expired': self.expired,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def _expiry(self) -> Optional[float]:
+        return time.monotonic() + self.ttl if self.ttl else None
+
+    def _purge_expired(self) -> None:
+        """Drop expired sessions from the LRU end (caller holds the lock)."""
+        if not self.ttl:
+            return
+        now = time.monotonic()
+        # Entries are ordered by last use, so the oldest expire first
+        while self._sessions:
+            conversation_id, (_, expires_at) = next(iter(self._sessions.items()))
+            if expires_at > now:
+                break
+            del self._sessions[conversation_id]
+            self.expired += 1
@@ -0,0 +1,186 @@
+"""
+Micro-batching for LLM triage requests in UnityAid.
+Tickets arriving within a few milliseconds of each other are collected and
+sent to the model as one structured prompt asking for a priority and a title
+per ticket. Under surge load this turns one request per ticket (or two, with
+the title) into one request per batch. Model answers are kept for a short
+while, so asking again about the same ticket (its title, then its urgency)
+does not cost a second request.
+"""
+import concurrent.futures
+import json
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+
+BATCH_PROMPT = (
+    "You are a disaster response triage assistant. For each ticket below, classify "
+    "its urgency from 1 (lowest) to 5 (critical) and write a concise, action-oriented "
+    "title (max 6 words) focused on the most critical aspect.\n"
+    "Return only a JSON array with one object per ticket, in any order:\n"
+    '[{"id": <ticket id>, "priority": <1-5>, "title": "<title>"}]\n\n'
+    "Tickets:\n"
+)
+
+_JSON_ARRAY = re.compile(r"\[.*\]", re.DOTALL)
+
+def build_batch_prompt(texts: list) -> str:
+    """Build one prompt covering every ticket, identified by its position."""
+    tickets = [{'id': i, 'text': text} for i, text in enumerate(texts)]
+    return BATCH_PROMPT + json.dumps(tickets, ensure_ascii=False, indent=1)
+
+def parse_batch_response(content: str, count: int) -> list:
+    """
+    Parse the model's JSON array into per-ticket results.
+
+    Args:
+        content: Raw model response (bare JSON or wrapped in a ```json fence)
+        count: Number of tickets in the batch
+
+    Returns:
+        list: One dict {'priority', 'title'} per ticket, or None where the
+              model's entry was missing or malformed
+    """
+    results = [None] * count
+    match = _JSON_ARRAY.search(content or "")
+    if not match:
+        return results
+    try:
+        items = json.loads(match.group())
+    except ValueError:
+        return results
+
+    for item in items if isinstance(items, list) else []:
+        try:
+            index = int(item['id'])
+            priority = int(item['priority'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 0 <= index < count and 1 <= priority <= 5:
+            title = str(item.get('title') or "").strip().split('\n')[0][:80]
+            results[index] = {'priority': priority, 'title': title or None}
+    return results
+
+class TriageBatcher:
+    """
+    Collects triage requests and sends them to the model in micro-batches.
+
+    A batch is sent when `max_batch` tickets are waiting or `max_wait` seconds
+    after its first ticket arrived, whichever comes first. Identical texts in
+    flight share one entry, and a text the model answered within the last
+    `reuse_seconds` gets that answer again. Tickets the model failed to answer,
+    individually or because the whole request failed, get `fallback(text)`
+    instead.
+    """
+
+    def __init__(self, send, fallback, max_batch: int = 16, max_wait: float = 0.02,
+                 source: str = "llm", reuse_seconds: float = 30.0):
+        """
+        Args:
+            send: Callable(prompt) -> str that performs one model request
+            fallback: Callable(text) -> dict with 'priority' and 'title' (the heuristic)
+            max_batch: Maximum tickets per model request
+            max_wait: Seconds to wait for more tickets before sending a batch
+            source: Label stored in each model result's 'source'
+            reuse_seconds: How long a model answer is reused for the same text
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.send = send
+        self.fallback = fallback
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.source = source
+        self.reuse_seconds = reuse_seconds
+        self.stats = {'requests': 0, 'tickets': 0, 'coalesced': 0, 'reused': 0,
+                      'item_fallbacks': 0, 'batch_failures': 0}
+        self._queue = queue.Queue()
+        self._pending = {}  # text -> future, for texts waiting or in flight
+        self._recent = OrderedDict()  # text -> (expires_at, model result), oldest first
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def submit(self, text: str) -> concurrent.futures.Future:
+        """
+        Queue a ticket for triage.
+
+        Returns:
+            Future: Resolves to {'priority', 'title', 'source'}; never raises,
+                    failures resolve to the fallback result
+        """
+        with self._lock:
+            recent = self._recent.get(text)
+            if recent is not None and recent[0] > time.monotonic():
+                self.stats['reused'] += 1
+                future = concurrent.futures.Future()
+                future.set_result(dict(recent[1]))
+                return future
+            future = self._pending.get(text)
+            if future is not None:
+                self.stats['coalesced'] += 1
+                return future
+            future = concurrent.futures.Future()
+            self._pending[text] = future
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="triage-batcher", daemon=True)
+                self._worker.start()
+        self._queue.put(text)
+        return future
+
+    def triage(self, text: str, timeout: float = None) -> dict:
+        """Blocking submit; returns the fallback result if the batch takes too long."""
+        try:
+            return self.submit(text).result(timeout)
+        except concurrent.futures.TimeoutError:
+            return self._fallback(text)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._send_batch(batch)
+
+    def _send_batch(self, texts: list) -> None:
+        self.stats['requests'] += 1
+        self.stats['tickets'] += len(texts)
+        try:
+            results = parse_batch_response(self.send(build_batch_prompt(texts)), len(texts))
+        except Exception as e:
+            print(f"Batched triage request failed for {len(texts)} tickets: {e!r}")
+            self.stats['batch_failures'] += 1
+            results = [None] * len(texts)
+
+        for text, result in zip(texts, results):
+            if result is None:
+                self.stats['item_fallbacks'] += 1
+                result = self._fallback(text)
+            else:
+                result['source'] = self.source
+            with self._lock:
+                future = self._pending.pop(text)
+                if result['source'] == self.source and self.reuse_seconds > 0:
+                    self._remember(text, result)
+            future.set_result(result)
+
+    def _remember(self, text: str, result: dict) -> None:
+        """Keep a model answer for reuse; caller holds the lock."""
+        now = time.monotonic()
+        while self._recent and next(iter(self._recent.values()))[0] <= now:
+            self._recent.popitem(last=False)
+        self._recent.pop(text, None)
+        self._recent[text] = (now + self.reuse_seconds, dict(result))
+
+    def _fallback(self, text: str) -> dict:
+        result = dict(self.fallback(text))
+        result.setdefault('source', "heuristic")
+        return result
@@ -6,8 +6,14 @@ import json
 import os
 import time
 from typing import Optional, Literal, Dict, List
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime
+from PrioritizerAgent.classification_cache import ClassificationCache, normalize_text
+from resource_index import ResourceIndex
+from assignment_optimizer import AssignmentOptimizer
+from capacity_ledger import CapacityLedger, Reservation
+from shared_store import SharedStore
+import geo_distance
 
 def get_api_key(key_name: str, default: str = None) -> str:
     """Get API key from environment variables or Streamlit secrets."""
@@ -53,8 +59,9 @@ class Resource:
     type: Category
     lat: float
     lon: float
-    capacity: int
+    capacity: int               # units free to match (from the capacity ledger)
     notes: Optional[str] = None
+    held: int = 0               # units reserved but not yet committed
 
 @dataclass
 class Ticket:
@@ -69,6 +76,7 @@ class Ticket:
     lat: Optional[float] = None
     lon: Optional[float] = None
     report_id: Optional[str] = None
+    address: Optional[str] = None
 
 def seed_resources():
     resources_data = [
@@ -78,17 +86,87 @@ def seed_resources():
         Resource(id="rc4", name="Pop-up Clinic", type="medical", lat=25.770, lon=-80.18, capacity=40, notes="Basic meds"),
     ]
     for r in resources_data:
-        st.session_state.resources[r.id] = r
+        add_resource(r)
+
+def get_resource_index() -> ResourceIndex:
+    """Spatial index of the shared resources, rebuilt when another session has changed them."""
+    version = get_shared_store().version_of("resources")
+    if st.session_state.get('resource_index_version') != version:
+        st.session_state.resource_index = ResourceIndex.from_resources(st.session_state.resources.values())
+        st.session_state.resource_index_version = version
+    return st.session_state.resource_index
+
+def store_resource(resource: Resource) -> None:
+    """Save a resource to the shared store, updating this session's index in place."""
+    index = get_resource_index()
+    seen = st.session_state.resource_index_version
+    version = get_shared_store().put("resources", resource.id, resource)
+    index.update(resource)
+    if version == seen + 1:  # no other session wrote in between
+        st.session_state.resource_index_version = version
+
+def update_resource(resource_id: str, change) -> Optional[Resource]:
+    """
+    Apply change(current resource) -> new resource (None = leave it) atomically
+    in the shared store, updating this session's index in place.
+    """
+    index = get_resource_index()
+    seen = st.session_state.resource_index_version
+    store = get_shared_store()
+    resource = store.update("resources", resource_id, change)
+    if resource is not None:
+        index.update(resource)
+        if store.version_of("resources") == seen + 1:  # no other session wrote in between
+            st.session_state.resource_index_version = seen + 1
+    return resource
+
+def add_resource(resource: Resource) -> None:
+    """Add or replace a resource, keeping the spatial index current."""
+    # Another session may have registered it already and used some of it
+    ledger = get_capacity_ledger()
+    ledger.register(resource.id, resource.capacity)
+    account = ledger.snapshot([resource.id])[resource.id]
+    resource.capacity, resource.held = account['available'], account['held']
+    store_resource(resource)
+
+def set_resource_capacity(resource_id: str, capacity: int) -> None:
+    """Change a resource's capacity; at zero it stops being matched."""
+    get_capacity_ledger().set_capacity(resource_id, capacity)
+    sync_resource_capacity(resource_id)
+
+def sync_resource_capacity(resource_id: str) -> None:
+    """Copy a resource's available and held units from the ledger into the shared store."""
+    ledger = get_capacity_ledger()
+    
+    def copy_capacity(resource):
+        # Read under the store's write lock, so a slower sync cannot write back an older count
+        account = ledger.snapshot([resource_id]).get(resource_id)
+        if account is None or (resource.capacity, resource.held) == (account['available'], account['held']):
+            return None
+        # A new record rather than an in-place change, which other sessions may be reading
+        return replace(resource, capacity=account['available'], held=account['held'])
+    
+    update_resource(resource_id, copy_capacity)
+
+def expire_holds() -> None:
+    """Expire overdue holds and sync every resource whose ledger counts moved, before matching."""
+    snapshot = get_capacity_ledger().snapshot()
+    for resource in st.session_state.resources.values():
+        account = snapshot.get(resource.id)
+        if account and (resource.capacity, resource.held) != (account['available'], account['held']):
+            sync_resource_capacity(resource.id)
 
 # Initialize session state
 def init_session_state():
+    store = get_shared_store()
     if 'resources' not in st.session_state:
-        st.session_state.resources = {}
+        st.session_state.resources = store.collection("resources")
     if 'tickets' not in st.session_state:
-        st.session_state.tickets = {}
-    if 'initialized' not in st.session_state:
+        st.session_state.tickets = store.collection("tickets")
+    if not st.session_state.resources:  # first session on this server seeds them
         seed_resources()
-        st.session_state.initialized = True
+    # The data this run draws; watch_shared_store reruns the session once it moves on
+    st.session_state.store_version = store.version
 
 # Keywords for categorization
 KEYWORDS = {
@@ -114,13 +192,113 @@ def haversine(lat1, lon1, lat2, lon2):
     return 2*R*math.asin(math.sqrt(h))
 
 def match_resource(rep: Report) -> Optional[Resource]:
-    resources = st.session_state.resources
-    cand = [r for r in resources.values() if r.capacity > 0 and (r.type == rep.category or rep.category == "other")]
-    if not cand:
-        cand = [r for r in resources.values() if r.capacity > 0]
-    if not cand:
-        return None
-    return min(cand, key=lambda r: haversine(rep.lat, rep.lon, r.lat, r.lon))
+    """Nearest open resource of the report's category, else nearest open resource of any kind."""
+    expire_holds()
+    return get_resource_index().nearest(rep.lat, rep.lon, rep.category)
+
+def reserve_resource(rep: Report) -> Optional[Reservation]:
+    """
+    Match a report and hold one unit of the resource for it. If another
+    session or agent took the last unit first, the next nearest resource is
+    tried. Commit the reservation once help is dispatched, or release it.
+    """
+    while True:
+        resource = match_resource(rep)
+        if resource is None:
+            return None
+        reservation = get_capacity_ledger().reserve(resource.id, holder=rep.id)
+        sync_resource_capacity(resource.id)
+        if reservation is not None:
+            return reservation
+
+def match_resources_bulk(reports: List[Report]) -> List[Optional[Resource]]:
+    """match_resource for a whole batch in one vectorized pass, e.g. re-matching after a resource opens."""
+    expire_holds()
+    return geo_distance.match_resources_bulk(reports, list(st.session_state.resources.values()))
+
+def get_assignment_plan() -> dict:
+    """This session's optimizer, kept between calls, and the ledger holds behind its assignments."""
+    if 'assignment_plan' not in st.session_state:
+        st.session_state.assignment_plan = {
+            'optimizer': AssignmentOptimizer([]),
+            'holds': {},        # report id -> Reservation for its planned resource
+            'capacity': {},     # resource id -> capacity last given to the optimizer
+            'version': None,    # resources version that capacity was read at
+        }
+    return st.session_state.assignment_plan
+
+def _plan_capacity(plan: dict) -> None:
+    """Give the optimizer each resource's free units plus those this plan already holds."""
+    version = get_shared_store().version_of("resources")
+    if plan['version'] == version:
+        return
+    ledger = get_capacity_ledger()
+    held = {}
+    for reservation in plan['holds'].values():
+        if reservation.state == "held":
+            held[reservation.resource_id] = held.get(reservation.resource_id, 0) + reservation.units
+    for resource in st.session_state.resources.values():
+        capacity = ledger.available(resource.id) + held.get(resource.id, 0)
+        if plan['capacity'].get(resource.id) != capacity:
+            plan['optimizer'].add_resource(replace(resource, capacity=capacity))
+            plan['capacity'][resource.id] = capacity
+    plan['version'] = version
+
+def _reserve_plan(plan: dict) -> bool:
+    """
+    Move the plan's ledger holds to match the optimizer's assignments.
+    Returns False if another session took units the plan counted on.
+    """
+    ledger = get_capacity_ledger()
+    holds = plan['holds']
+    assignments = plan['optimizer'].assignments
+    changed = set()
+    # Release every hold that no longer matches first, so a chain of reroutes
+    # (a -> b, b -> c) never needs room it is itself about to free
+    for report_id, resource_id in assignments.items():
+        reservation = holds.get(report_id)
+        if reservation is not None and (reservation.state != "held" or reservation.resource_id != resource_id):
+            ledger.release(reservation.reservation_id)
+            changed.add(reservation.resource_id)
+            del holds[report_id]
+    complete = True
+    for report_id, resource_id in assignments.items():
+        if resource_id is None or report_id in holds:
+            continue
+        reservation = ledger.reserve(resource_id, holder=report_id)
+        changed.add(resource_id)
+        if reservation is None:
+            complete = False
+        else:
+            holds[report_id] = reservation
+    for resource_id in changed:
+        sync_resource_capacity(resource_id)
+    return complete
+
+def assign_resources(reports: List[Report], budget: float = 2.0) -> Dict[str, Optional[Resource]]:
+    """
+    Assign a batch of reports within each resource's remaining capacity, at
+    the least urgency-weighted travel distance overall. Unlike calling
+    match_resource per report, early reports cannot use up the nearby
+    resources that later, more urgent ones need.
+    
+    The optimizer is kept in the session, so each call only adds the new
+    reports (and may reroute earlier ones), and every planned assignment
+    holds a unit in the capacity ledger until it is committed or released.
+    """
+    plan = get_assignment_plan()
+    expire_holds()
+    _plan_capacity(plan)
+    plan['optimizer'].assign(reports, budget=budget)
+    for _ in range(3):
+        if _reserve_plan(plan):
+            break
+        # Another session took capacity meanwhile: re-plan with what is left
+        _plan_capacity(plan)
+        plan['optimizer'].assign([], budget=budget)
+    holds = plan['holds']
+    return {report.id: st.session_state.resources[holds[report.id].resource_id] if report.id in holds else None
+            for report in reports}
 
 def create_interactive_map(center_lat=25.77, center_lon=-80.19, zoom=10, key="map"):
     """Create an interactive folium map with click-to-pin functionality."""
@@ -139,6 +317,7 @@ def create_interactive_map(center_lat=25.77, center_lon=-80.19, zoom=10, key="ma
             Title: {ticket.title}<br>
             Priority: {ticket.priority}/5<br>
             Status: {ticket.status}<br>
+            Address: {ticket.address or 'unknown'}<br>
             Description: {ticket.description[:50]}...
             """
             folium.Marker(
@@ -193,41 +372,120 @@ def create_interactive_map(center_lat=25.77, center_lon=-80.19, zoom=10, key="ma
     for r in resources_data:
         st.session_state.resources[r.id] = r
 
-def ai_qualify_urgency(text: str, use_conversation: bool = True) -> dict:
-    """Return priority classification result with potential follow-up questions."""
-    
-    # Try to use the PrioritizerAgent first with conversation support
+@st.cache_resource
+def get_prioritizer_service():
+    """PrioritizerAgent loaded once per server process, or None if it failed to load."""
     try:
-        import sys
-        from pathlib import Path
-        prioritizer_path = Path(__file__).parent / "PrioritizerAgent"
-        sys.path.append(str(prioritizer_path))
-        
-        if use_conversation:
-            from prioritizer_integration import classify_with_conversation
-            result = classify_with_conversation(text)
-        else:
-            from prioritizer_integration import classify_ticket_priority
-            result = classify_ticket_priority(text)
-            
-        return {
-            'priority': result['priority'],
-            'source': f"PrioritizerAgent ({result['confidence']:.2f})",
-            'confidence': result['confidence'],
-            'needs_clarification': result.get('needs_clarification', False),
-            'clarifying_questions': result.get('clarifying_questions', []),
-            'conversation_id': result.get('conversation_id')
-        }
-        
+        from PrioritizerAgent.classifier_service import PrioritizerService
+        service = PrioritizerService.load()
     except Exception as e:
-        # Fallback to original heuristic if PrioritizerAgent fails
-        print(f"PrioritizerAgent not available, using fallback: {e}")
-        pass
+        print(f"PrioritizerAgent could not be loaded, using fallback heuristics: {e!r}")
+        return None
+    print(f"PrioritizerAgent loaded in {service.startup_seconds * 1000:.0f} ms")
+    return service
+
+@st.cache_resource
+def get_location_extractor():
+    """Shared location extractor; its spaCy model warms up on a background thread."""
+    from location_extractor import location_extractor
+    location_extractor.warm_up()
+    return location_extractor
+
+@st.cache_resource
+def get_reverse_geocoder():
+    """Shared map-click reverse geocoder, using the extractor's geocoding service and gazetteer."""
+    from geocoding_service import GeocodingService
+    from reverse_geocoder import ReverseGeocoder
+    extractor = get_location_extractor()
+    service = extractor.geocoding_service or GeocodingService(cache=extractor.geocode_cache)
+    return ReverseGeocoder(
+        service=service,
+        gazetteer=extractor.gazetteer,
+        precision=int(get_api_key("REVERSE_GEOCODE_PRECISION", "7"))
+    )
+
+def describe_location(lat: Optional[float], lon: Optional[float]) -> Optional[str]:
+    """Readable address for a point, without waiting on the network (None if unknown)."""
+    if lat is None or lon is None:
+        return None
+    place = get_reverse_geocoder().lookup(lat, lon)
+    return place.address if place else None
+
+def attach_address_upgrade(ticket: Ticket) -> None:
+    """Replace a stored ticket's gazetteer address with the geocoder's once it arrives."""
+    if ticket.lat is None or ticket.lon is None:
+        return
+    store = get_shared_store()
     
-    # Original heuristic fallback
-    t = (text or "").lower()
-    score = 3
+    def write_back(place):
+        # Runs on the geocoder's worker thread; sessions watching the store rerun to show it
+        store.update("tickets", ticket.id, lambda current: (
+            replace(current, address=place.address) if current.address != place.address else None))
+    
+    place = get_reverse_geocoder().lookup(ticket.lat, ticket.lon, on_resolved=write_back)
+    if place is not None and place.source == 'geocoder':  # answered since the ticket was described
+        write_back(place)
+
+@st.cache_resource
+def get_shared_store():
+    """Tickets and resources shared by every session, persisted to SQLite if configured."""
+    return SharedStore(
+        path=os.environ.get("SHARED_STORE_PATH", "") or None,
+        codecs={'tickets': Ticket, 'resources': Resource}
+    )
+
+@st.cache_resource
+def get_capacity_ledger():
+    """Resource capacity shared by every session, with reservations and an audit trail."""
+    ledger = CapacityLedger(
+        hold_seconds=float(get_api_key("CAPACITY_HOLD_SECONDS", "300")),
+        audit_path=os.environ.get("CAPACITY_AUDIT_PATH", "logs/capacity_audit.jsonl") or None
+    )
+    # Resources persisted by an earlier run start from their stored capacity. Holds
+    # still open at shutdown belonged to sessions that are gone, so they are free again
+    for resource in get_shared_store().items("resources").values():
+        ledger.register(resource.id, resource.capacity + resource.held)
+    return ledger
+
+@st.cache_resource
+def get_urgency_cache():
+    """Shared LRU/TTL cache of ai_qualify_urgency results, including LLM answers."""
+    return ClassificationCache(
+        maxsize=int(get_api_key("PRIORITY_CACHE_SIZE", "4096")),
+        ttl=float(get_api_key("PRIORITY_CACHE_TTL", "900"))
+    )
+
+def ai_qualify_urgency(text: str, use_conversation: bool = True) -> dict:
+    """Return priority classification result with potential follow-up questions."""
+    cache = get_urgency_cache()
+    # The model name is part of the key so switching models never serves stale answers
+    key = (normalize_text(text), use_conversation, get_api_key("GOOGLE_MODEL", "gemini-1.5-flash"))
+    result = cache.get(key)
+    if result is None:
+        result = _qualify_urgency_uncached(text, use_conversation)
+        llm_pending = result.get('llm_pending')
+        if llm_pending is not None:
+            # Cache the LLM's answer once it arrives instead of the heuristic stand-in
+            def cache_llm_answer(future):
+                llm_result = future.result()
+                if llm_result:
+                    cache.set(key, {
+                        'priority': llm_result['priority'],
+                        'source': f"{llm_result['source']} ({llm_result['confidence']:.2f})",
+                        'confidence': llm_result['confidence'],
+                        'needs_clarification': False,
+                        'clarifying_questions': []
+                    })
+            llm_pending.add_done_callback(cache_llm_answer)
+        # Clarification results start a conversation, so they are not shared
+        elif not result.get('needs_clarification'):
+            cache.set(key, result)
     
+    return dict(result, clarifying_questions=list(result.get('clarifying_questions', [])))
+
+def heuristic_priority(text: str) -> int:
+    """Keyword-count urgency score used when no model is available."""
+    t = (text or "").lower()
     # Heuristic keywords
     critical_kw = ["life-threatening", "unconscious", "not breathing", "cardiac", "hemorrhage", 
                    "severe bleeding", "child missing", "trapped", "collapsed", "hurricane", "wildfire"]
@@ -249,40 +507,150 @@ def ai_qualify_urgency(text: str, use_conversation: bool = True) -> dict:
     
     # Map hits to priority
     if hits >= 4:
-        score = 5
+        return 5
     elif hits >= 2:
-        score = 4
+        return 4
     elif hits <= -1:
-        score = 2
+        return 2
+    return 3
+
+@st.cache_resource
+def get_triage_batcher():
+    """Shared Gemini micro-batcher for priority and title requests, or None without an API key."""
+    api_key = get_api_key("GOOGLE_API_KEY")
+    if not api_key:
+        return None
+    try:
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        model_name = get_api_key("GOOGLE_MODEL", "gemini-1.5-flash")
+        model = genai.GenerativeModel(model_name)
+    except Exception as e:
+        print(f"Gemini not available, using heuristics: {e}")
+        return None
+    
+    from PrioritizerAgent.triage_batcher import TriageBatcher
+    
+    def send(prompt: str) -> str:
+        resp = model.generate_content(prompt)
+        return resp.text if hasattr(resp, 'text') else str(resp)
+    
+    def fallback(text: str) -> dict:
+        return {'priority': heuristic_priority(text), 'title': heuristic_title(text)}
+    
+    return TriageBatcher(
+        send, fallback,
+        max_batch=int(get_api_key("TRIAGE_BATCH_SIZE", "16")),
+        max_wait=float(get_api_key("TRIAGE_BATCH_WAIT_MS", "20")) / 1000,
+        source=f"google:{model_name}",
+        reuse_seconds=float(get_api_key("TRIAGE_REUSE_SECONDS", "30"))
+    )
+
+@st.cache_resource
+def get_hedged_prioritizer():
+    """ADK agent raced against the heuristic under a latency budget, or None when disabled."""
+    mode = get_api_key("PRIORITIZER_LLM_MODE", "off").lower()
+    if mode not in ("adk", "stub"):
+        return None
+    
+    from PrioritizerAgent.llm_prioritizer import AdkAgentModel, HedgedPrioritizer, StubModel
+    
+    if mode == "stub":
+        # Offline stand-in for testing deadlines without network access
+        model = StubModel(latency=float(get_api_key("PRIORITIZER_STUB_LATENCY", "0.5")))
     else:
-        score = 3
+        model = AdkAgentModel()
+    return HedgedPrioritizer(
+        model,
+        deadline=float(get_api_key("PRIORITIZER_LLM_DEADLINE", "1.5")),
+        llm_timeout=float(get_api_key("PRIORITIZER_LLM_TIMEOUT", "30")),
+        end_conversation=release_conversation
+    )
+
+def attach_llm_upgrade(ticket: Ticket, llm_pending) -> None:
+    """Raise a ticket's priority if the slower LLM answer arrives with a higher one."""
+    if llm_pending is None:
+        return
+    store = get_shared_store()
     
-    # Try Google Generative AI if available
-    try:
-        api_key = get_api_key("GOOGLE_API_KEY")
-        if api_key:
-            import google.generativeai as genai
-            genai.configure(api_key=api_key)
-            model_name = get_api_key("GOOGLE_MODEL", "gemini-1.5-flash")
-            model = genai.GenerativeModel(model_name)
-            prompt = (
-                "You are a disaster response triage assistant. "
-                "Classify the urgency of the following ticket from 1 (lowest) to 5 (critical). "
-                "Return only a single integer 1-5.\n\nText: " + (text or "")
+    def upgrade(future):
+        llm_result = future.result()
+        if not llm_result:
+            return
+        
+        def raise_priority(current):
+            if llm_result['priority'] <= (current.qualified_priority or 0):
+                return None
+            print(f"LLM upgraded ticket {ticket.id[:8]}: {current.qualified_priority} -> {llm_result['priority']}")
+            return replace(
+                current,
+                priority=max(current.priority, llm_result['priority']),
+                qualified_priority=llm_result['priority'],
+                qualified_by=f"{llm_result['source']} (late)"
             )
-            resp = model.generate_content(prompt)
-            content = resp.text.strip() if hasattr(resp, 'text') else str(resp).strip()
-            parsed = int(''.join(ch for ch in content if ch.isdigit())[:1] or '3')
-            parsed = max(1, min(5, parsed))
+        
+        # Runs on the prioritizer thread; atomic, so a status change made meanwhile is kept.
+        # Sessions watching the store rerun to show it
+        store.update("tickets", ticket.id, raise_priority)
+    
+    llm_pending.add_done_callback(upgrade)
+
+def _qualify_urgency_uncached(text: str, use_conversation: bool = True) -> dict:
+    """Classify urgency via the PrioritizerAgent, falling back to heuristics and Gemini."""
+    
+    # Try to use the PrioritizerAgent first with conversation support
+    service = get_prioritizer_service()
+    if service is not None:
+        try:
+            hedged = get_hedged_prioritizer()
+            if hedged is not None:
+                # LLM and heuristic race; the heuristic answers if the deadline passes
+                result = hedged.prioritize_sync(
+                    text, heuristic=service.classify_with_conversation if use_conversation else service.classify
+                )
+                source = result['source'] if result['source'] != 'enhanced_heuristic' else "PrioritizerAgent"
+                return {
+                    'priority': result['priority'],
+                    'source': f"{source} ({result['confidence']:.2f})",
+                    'confidence': result['confidence'],
+                    'needs_clarification': result.get('needs_clarification', False),
+                    'clarifying_questions': result.get('clarifying_questions', []),
+                    'conversation_id': result.get('conversation_id'),
+                    'llm_pending': result.get('llm_pending')
+                }
+            
+            if use_conversation:
+                result = service.classify_with_conversation(text)
+            else:
+                result = service.classify(text)
+            
+            return {
+                'priority': result['priority'],
+                'source': f"PrioritizerAgent ({result['confidence']:.2f})",
+                'confidence': result['confidence'],
+                'needs_clarification': result.get('needs_clarification', False),
+                'clarifying_questions': result.get('clarifying_questions', []),
+                'conversation_id': result.get('conversation_id')
+            }
+        except Exception as e:
+            # Fallback to original heuristic if PrioritizerAgent fails
+            print(f"PrioritizerAgent failed, using fallback: {e!r}")
+    
+    # Original heuristic fallback
+    score = heuristic_priority(text)
+    
+    # Try Google Generative AI if available (batched with other tickets)
+    batcher = get_triage_batcher()
+    if batcher is not None:
+        triaged = batcher.triage(text or "", timeout=float(get_api_key("TRIAGE_BATCH_TIMEOUT", "10")))
+        if triaged['source'] != "heuristic":
             return {
-                'priority': parsed, 
-                'source': f"google:{model_name}",
+                'priority': triaged['priority'], 
+                'source': triaged['source'],
                 'confidence': 0.75,
                 'needs_clarification': False,
                 'clarifying_questions': []
             }
-    except Exception:
-        pass
     
     return {
         'priority': score, 
@@ -292,6 +660,56 @@ def ai_qualify_urgency(text: str, use_conversation: bool = True) -> dict:
         'clarifying_questions': []
     }
 
+def release_conversation(conversation_id: Optional[str]) -> None:
+    """Free the prioritizer's stored conversation for a pending ticket."""
+    service = get_prioritizer_service()
+    if not conversation_id or service is None:
+        return
+    try:
+        service.end_conversation(conversation_id)
+    except Exception as e:
+        print(f"Could not release conversation {conversation_id}: {e}")
+
+def heuristic_title(text: str) -> str:
+    """Rule-based ticket title used when no model is available."""
+    lower = (text or "").lower()
+    
+    # Priority-based title generation using enhanced context
+    if any(w in lower for w in ["unconscious", "not breathing", "cardiac", "heart attack", "severe bleeding"]):
+        return "CRITICAL: Life-threatening emergency"
+    elif any(w in lower for w in ["trapped", "buried", "collapsed", "building collapse"]):
+        return "URGENT: Rescue operation needed"
+    elif any(w in lower for w in ["child missing", "person missing", "abducted", "lost child"]):
+        return "CRITICAL: Missing person"
+    elif any(w in lower for w in ["fire", "explosion", "gas leak", "chemical spill"]):
+        return "CRITICAL: Hazmat emergency"
+    elif any(w in lower for w in ["multiple people", "several people", "many people", "group"]):
+        return "HIGH: Multiple victims"
+    elif any(w in lower for w in ["child", "baby", "pregnant", "elderly"]) and any(w in lower for w in ["danger", "help", "emergency"]):
+        return "HIGH: Vulnerable person in danger"
+    elif any(w in lower for w in ["injury", "broken", "diabetic", "insulin", "asthma", "chest pain"]):
+        return "URGENT: Medical emergency"
+    elif any(w in lower for w in ["water", "dehydration", "thirst", "no water"]):
+        return "Water assistance needed"
+    elif any(w in lower for w in ["food", "hunger", "meals", "supplies", "starving"]):
+        return "Food assistance needed"
+    elif any(w in lower for w in ["shelter", "housing", "evacuate", "evacuation", "homeless"]):
+        return "Shelter assistance needed"
+    elif any(w in lower for w in ["power", "electricity", "communication", "phone"]):
+        return "Utilities assistance needed"
+    elif any(w in lower for w in ["getting worse", "deteriorating", "unstable"]):
+        return "URGENT: Deteriorating situation"
+    else:
+        # Fallback to generic but try to be more specific
+        if "medical" in lower or "health" in lower:
+            return "Medical assistance needed"
+        elif "help" in lower and "immediate" in lower:
+            return "URGENT: Immediate help needed"
+        elif "emergency" in lower:
+            return "Emergency assistance needed"
+        else:
+            return "Assistance needed"
+
 def ai_compose_ticket(raw_input: str, report: Optional[Report] = None, enhanced_context: str = None, 
                      include_location: bool = False, clicked_lat: Optional[float] = None, 
                      clicked_lon: Optional[float] = None, enable_enhanced_context: bool = False, 
@@ -301,69 +719,19 @@ def ai_compose_ticket(raw_input: str, report: Optional[Report] = None, enhanced_
     
     # Use enhanced context for title generation if available (from Q&A)
     title_context = enhanced_context if enhanced_context else text
-    lower = title_context.lower()
     
-    title = "Assistance needed"
+    title = None
     
-    # Try Google Generative AI for title
-    try:
-        api_key = get_api_key("GOOGLE_API_KEY")
-        if api_key:
-            import google.generativeai as genai
-            genai.configure(api_key=api_key)
-            model_name = get_api_key("GOOGLE_MODEL", "gemini-1.5-flash")
-            model = genai.GenerativeModel(model_name)
-            prompt = (
-                "Create a concise, action-oriented title (max 6 words) for a disaster response ticket.\n"
-                "Focus on the most critical aspect. Only return the title, no punctuation beyond what's necessary.\n\nText: " + title_context
-            )
-            resp = model.generate_content(prompt)
-            gen_title = resp.text.strip() if hasattr(resp, 'text') else None
-            if gen_title:
-                title = gen_title.split('\n')[0][:80]
-            source = f"google:{model_name}"
-        else:
-            source = "heuristic"
-    except Exception:
-        source = "heuristic"
+    # Try Google Generative AI for title (batched with other tickets); the
+    # urgency check below gets the same answer back without a second request
+    batcher = get_triage_batcher()
+    if batcher is not None:
+        triaged = batcher.triage(title_context, timeout=float(get_api_key("TRIAGE_BATCH_TIMEOUT", "10")))
+        title = triaged.get('title')
     
     # Enhanced heuristic title generation
-    if source == "heuristic":
-        # Priority-based title generation using enhanced context
-        if any(w in lower for w in ["unconscious", "not breathing", "cardiac", "heart attack", "severe bleeding"]):
-            title = "CRITICAL: Life-threatening emergency"
-        elif any(w in lower for w in ["trapped", "buried", "collapsed", "building collapse"]):
-            title = "URGENT: Rescue operation needed"
-        elif any(w in lower for w in ["child missing", "person missing", "abducted", "lost child"]):
-            title = "CRITICAL: Missing person"
-        elif any(w in lower for w in ["fire", "explosion", "gas leak", "chemical spill"]):
-            title = "CRITICAL: Hazmat emergency"
-        elif any(w in lower for w in ["multiple people", "several people", "many people", "group"]):
-            title = "HIGH: Multiple victims"
-        elif any(w in lower for w in ["child", "baby", "pregnant", "elderly"]) and any(w in lower for w in ["danger", "help", "emergency"]):
-            title = "HIGH: Vulnerable person in danger"
-        elif any(w in lower for w in ["injury", "broken", "diabetic", "insulin", "asthma", "chest pain"]):
-            title = "URGENT: Medical emergency"
-        elif any(w in lower for w in ["water", "dehydration", "thirst", "no water"]):
-            title = "Water assistance needed"
-        elif any(w in lower for w in ["food", "hunger", "meals", "supplies", "starving"]):
-            title = "Food assistance needed"
-        elif any(w in lower for w in ["shelter", "housing", "evacuate", "evacuation", "homeless"]):
-            title = "Shelter assistance needed"
-        elif any(w in lower for w in ["power", "electricity", "communication", "phone"]):
-            title = "Utilities assistance needed"
-        elif any(w in lower for w in ["getting worse", "deteriorating", "unstable"]):
-            title = "URGENT: Deteriorating situation"
-        else:
-            # Fallback to generic but try to be more specific
-            if "medical" in lower or "health" in lower:
-                title = "Medical assistance needed"
-            elif "help" in lower and "immediate" in lower:
-                title = "URGENT: Immediate help needed"
-            elif "emergency" in lower:
-                title = "Emergency assistance needed"
-            else:
-                title = "Assistance needed"
+    if not title:
+        title = heuristic_title(title_context)
     
     urgency_result = ai_qualify_urgency(text)
     desc = text
@@ -379,12 +747,16 @@ def ai_compose_ticket(raw_input: str, report: Optional[Report] = None, enhanced_
         "confidence": urgency_result['confidence'],
         "needs_clarification": urgency_result['needs_clarification'],
         "clarifying_questions": urgency_result['clarifying_questions'],
-        "conversation_id": urgency_result.get('conversation_id')
+        "conversation_id": urgency_result.get('conversation_id'),
+        "llm_pending": urgency_result.get('llm_pending')
     }
 
 # Initialize session state
 init_session_state()
 
+# Start loading the NLP model now so it is ready by the first ticket, without blocking this run
+get_location_extractor()
+
 # Sidebar navigation
 st.sidebar.title("🆘 UnityAid")
 page = st.sidebar.selectbox("Navigate", [
@@ -416,6 +788,8 @@ if page == "Dashboard":
                 st.write(f"**Status:** {ticket.status}")
                 if ticket.lat and ticket.lon:
                     st.write(f"**Location:** ({ticket.lat:.6f}, {ticket.lon:.6f})")
+                if ticket.address:
+                    st.write(f"**Address:** {ticket.address}")
     else:
         st.info("No tickets yet")
 
@@ -469,6 +843,9 @@ elif page == "Submit a Ticket":
             agent_clicked_lat, agent_clicked_lon, agent_map_data = create_interactive_map(key="agent_map")
             if agent_clicked_lat and agent_clicked_lon:
                 st.success(f"📍 Map location: ({agent_clicked_lat:.6f}, {agent_clicked_lon:.6f})")
+                clicked_address = describe_location(agent_clicked_lat, agent_clicked_lon)
+                if clicked_address:
+                    st.info(f"**Address:** {clicked_address}")
                 final_lat, final_lon = agent_clicked_lat, agent_clicked_lon
                 location_source = "map_click"
             else:
@@ -590,10 +967,13 @@ elif page == "Submit a Ticket":
                         qualified_by=composed_data["qualified_by"],
                         lat=ticket_lat,
                         lon=ticket_lon,
-                        report_id=None  # No report linking
+                        report_id=None,  # No report linking
+                        address=describe_location(ticket_lat, ticket_lon)
                     )
                     
                     st.session_state.tickets[tid] = ticket
+                    attach_llm_upgrade(ticket, composed_data.get('llm_pending'))
+                    attach_address_upgrade(ticket)
                     
                     st.success(f"🤖 AI-composed ticket created: {tid}")
                     st.info(f"**Generated Title:** {composed_data['title']}")
@@ -657,18 +1037,17 @@ elif page == "Submit a Ticket":
                         with st.spinner('🔄 Processing enhanced context with AI...'):
                             # Reclassify with the Q&A
                             try:
-                                import sys
-                                from pathlib import Path
-                                prioritizer_path = Path(__file__).parent / "PrioritizerAgent"
-                                sys.path.append(str(prioritizer_path))
-                                
-                                from prioritizer_integration import answer_questions_and_reclassify
+                                service = get_prioritizer_service()
+                                if service is None:
+                                    raise RuntimeError("PrioritizerAgent not loaded")
                                 
-                                updated_result = answer_questions_and_reclassify(
-                                    pending['raw_input'], 
+                                # Same text the conversation was started with, so its state is reused
+                                updated_result = service.answer_questions(
+                                    pending['raw_input'].strip(), 
                                     qa_pairs, 
                                     composed_data.get('conversation_id')
                                 )
+                                release_conversation(composed_data.get('conversation_id'))
                                 
                                 # Update composed data with new priority
                                 composed_data.update({
@@ -716,10 +1095,13 @@ elif page == "Submit a Ticket":
                             qualified_by=composed_data["qualified_by"],
                             lat=final_lat,
                             lon=final_lon,
-                            report_id=pending['linked_report'] if pending['linked_report'] != "None" else None
+                            report_id=pending['linked_report'] if pending['linked_report'] != "None" else None,
+                            address=describe_location(final_lat, final_lon)
                         )
                         
                         st.session_state.tickets[tid] = ticket
+                        attach_llm_upgrade(ticket, composed_data.get('llm_pending'))
+                        attach_address_upgrade(ticket)
                         del st.session_state['pending_ticket']  # Clear pending state
                         
                         st.success(f"🤖 AI-composed ticket created: {tid}")
@@ -766,11 +1148,15 @@ elif page == "Submit a Ticket":
                         qualified_by=composed_data["qualified_by"],
                         lat=final_lat,
                         lon=final_lon,
-                        report_id=pending['linked_report'] if pending['linked_report'] != "None" else None
+                        report_id=pending['linked_report'] if pending['linked_report'] != "None" else None,
+                        address=describe_location(final_lat, final_lon)
                     )
                     
                     st.session_state.tickets[tid] = ticket
+                    attach_llm_upgrade(ticket, composed_data.get('llm_pending'))
+                    attach_address_upgrade(ticket)
                     del st.session_state['pending_ticket']
+                    release_conversation(composed_data.get('conversation_id'))
                     
                     st.success(f"🤖 AI-composed ticket created: {tid}")
                     st.warning(f"⚠️ Used original priority {composed_data['priority']} with {composed_data.get('confidence', 0):.1%} confidence")
@@ -779,6 +1165,7 @@ elif page == "Submit a Ticket":
             with col3:
                 if st.button("❌ Cancel"):
                     del st.session_state['pending_ticket']
+                    release_conversation(composed_data.get('conversation_id'))
                     st.rerun()
     
     with tab2:
@@ -801,6 +1188,9 @@ elif page == "Submit a Ticket":
             manual_clicked_lat, manual_clicked_lon, manual_map_data = create_interactive_map(key="manual_map")
             if manual_clicked_lat and manual_clicked_lon:
                 st.success(f"📍 Map location: ({manual_clicked_lat:.6f}, {manual_clicked_lon:.6f})")
+                clicked_address = describe_location(manual_clicked_lat, manual_clicked_lon)
+                if clicked_address:
+                    st.info(f"**Address:** {clicked_address}")
                 manual_final_lat, manual_final_lon = manual_clicked_lat, manual_clicked_lon
                 manual_location_source = "map_click"
             else:
@@ -894,10 +1284,12 @@ elif page == "Submit a Ticket":
                     qualified_by=source,
                     lat=manual_final_lat,
                     lon=manual_final_lon,
-                    report_id=None  # No report linking
+                    report_id=None,  # No report linking
+                    address=describe_location(manual_final_lat, manual_final_lon)
                 )
                 
                 st.session_state.tickets[tid] = ticket
+                attach_address_upgrade(ticket)
                 
                 # Enhanced success message with location info
                 st.success(f"✅ Ticket {tid[:8]} created!")
@@ -936,6 +1328,8 @@ elif page == "Submit a Ticket":
                         st.write(f"**Description:** {ticket.description}")
                         if ticket.lat and ticket.lon:
                             st.write(f"**Location:** ({ticket.lat:.6f}, {ticket.lon:.6f})")
+                        if ticket.address:
+                            st.write(f"**Address:** {ticket.address}")
                         if ticket.report_id:
                             st.write(f"**Linked Report:** {ticket.report_id}")
                     
@@ -948,8 +1342,9 @@ elif page == "Submit a Ticket":
                     )
                     if new_status != ticket.status:
                         if st.button(f"Update {ticket.id}", key=f"update_{ticket.id}"):
-                            ticket.status = new_status
-                            st.session_state.tickets[ticket.id] = ticket
+                            # Applied to the stored ticket, which a late LLM answer may have changed
+                            get_shared_store().update("tickets", ticket.id,
+                                                      lambda current: replace(current, status=new_status))
                             st.success(f"Status updated to {new_status}")
                             st.rerun()
         else:
@@ -990,4 +1385,34 @@ st.sidebar.markdown("Streamlit Version")
 
 # Auto-refresh option
 if st.sidebar.button("🔄 Refresh Data"):
+    st.rerun()
+
+if hasattr(st, "fragment"):  # Streamlit 1.37+
+    @st.fragment(run_every=float(get_api_key("SHARED_STORE_POLL_SECONDS", "2")))
+    def watch_shared_store():
+        """Rerun the page only when another session or process has changed tickets or resources."""
+        store = get_shared_store()
+        store.refresh()
+        if store.version != st.session_state.store_version:
+            st.rerun()
+
+    watch_shared_store()
+
+# Classification cache (clear after changing rules or models)
+cache_stats = get_urgency_cache().stats()
+st.sidebar.caption(f"AI cache: {cache_stats['size']} entries, {cache_stats['hit_rate']:.0%} hit rate")
+prioritizer_service = get_prioritizer_service()
+if prioritizer_service is not None:
+    st.sidebar.caption(f"PrioritizerAgent loaded in {prioritizer_service.startup_seconds * 1000:.0f} ms")
+else:
+    st.sidebar.caption("PrioritizerAgent unavailable, using heuristics")
+nlp_info = get_location_extractor().model_info()
+if nlp_info['status'] == "ready":
+    st.sidebar.caption(f"Location NLP loaded in {nlp_info['load_seconds']:.1f}s")
+elif nlp_info['status'] == "loading":
+    st.sidebar.caption("Location NLP loading, using pattern matching")
+else:
+    st.sidebar.caption("Location NLP unavailable, using pattern matching")
+if st.sidebar.button("🧹 Clear AI Cache"):
+    get_urgency_cache().invalidate()
     st.rerun()
\ No newline at end of file
@@ -0,0 +1,319 @@
+"""
+Capacity-Aware Assignment for UnityAid
+Assigns reports to resources as a min-cost flow instead of one nearest
+match at a time. Every report is one unit of demand, every resource supplies
+`capacity` units, and a report costs its priority times the haversine
+distance to the resource it is sent to. Reports of a category the resource
+does not serve may only go there when nothing compatible has room, through
+a penalty larger than any real trip.
+
+The solver is successive shortest paths: reports are inserted one at a time,
+highest priority first, along the cheapest augmenting path. A path may
+reroute reports already assigned (a shelter near the new report is full, so
+one of its reports moves to the next shelter over), and after every insertion
+the assignment is the cheapest possible for the reports placed so far.
+Resources are the graph nodes and an edge j -> k is the cheapest move of one
+report from j to k. Optimality leaves no negative cycles, so paths are found
+by Bellman-Ford relaxation, one vectorized pass over the resource matrix per
+hop; augmenting paths are rarely more than a few hops long.
+
+State is kept between calls, so new reports, closed tickets and capacity
+changes are applied incrementally. When a call runs out of its time budget,
+the remaining reports are placed greedily and re-optimized on the next call.
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from geo_distance import haversine_matrix
+
+# Extra km charged for sending a report to a resource of another category
+INCOMPATIBLE_PENALTY_KM = 20_000.0
+
+def priority_weight(report, get: Callable = getattr) -> float:
+    """Cost multiplier for a report: its ticket priority (or urgency), 1-5."""
+    priority = get(report, "priority", None) or get(report, "urgency", None) or 1
+    return float(max(priority, 1))
+
+class AssignmentOptimizer:
+    """
+    Incremental min-cost assignment of reports to resources with capacity.
+
+    Reports need id, lat, lon, category and priority (or urgency); resources
+    need id, type, lat, lon and capacity. Pass get=dict.get for API dicts.
+    Assignments of reports that are still pending may be rerouted by later
+    calls; `pin` a report once help is dispatched to keep it where it is.
+    """
+
+    def __init__(self, resources: Iterable, get: Callable = getattr,
+                 weight: Callable = priority_weight):
+        self.get = get
+        self.weight = weight
+        self._resources: List[object] = []
+        self._columns: Dict[str, int] = {}
+        self._capacity = np.zeros(0, dtype=np.int64)
+        self._used = np.zeros(0, dtype=np.int64)
+        self._edges = np.zeros((0, 0))  # cheapest cost of moving one report from resource j to k
+        self._members: List[set] = []   # movable rows per resource
+
+        self._cost = np.zeros((0, 0))   # row per report, column per resource
+        self._rows: Dict[str, int] = {}
+        self._reports: List[object] = []
+        self._weights: List[float] = []
+        self._where: List[int] = []     # column per row, -1 if unassigned
+        self._pinned: set = set()
+        self._provisional: set = set()  # placed greedily when time ran out
+        self._pending: List[int] = []   # waiting for capacity
+        self.stats = {'inserted': 0, 'rerouted': 0, 'greedy': 0, 'provisional': 0, 'solve_ms': 0.0}
+        for resource in resources:
+            self.add_resource(resource)
+
+    # ---- results -----------------------------------------------------------
+
+    @property
+    def assignments(self) -> Dict[str, Optional[str]]:
+        """Report id -> resource id (None while waiting for capacity)."""
+        return {report_id: self._resource_id(self._where[row]) for report_id, row in self._rows.items()}
+
+    def resource_for(self, report_id: str) -> Optional[str]:
+        row = self._rows.get(report_id)
+        return self._resource_id(self._where[row]) if row is not None else None
+
+    def total_cost(self) -> float:
+        """Sum of priority-weighted km (with penalties) over assigned reports."""
+        return float(sum(self._cost[row, column] for row, column in enumerate(self._where) if column >= 0))
+
+    def remaining(self) -> Dict[str, int]:
+        """Resource id -> capacity not yet assigned."""
+        return {self.get(r, "id"): max(int(c - u), 0)
+                for r, c, u in zip(self._resources, self._capacity, self._used)}
+
+    # ---- changes -----------------------------------------------------------
+
+    def assign(self, reports: Sequence, budget: Optional[float] = None) -> Dict[str, Optional[str]]:
+        """
+        Add reports and re-optimize.
+
+        Args:
+            reports: New reports (already known ids are ignored)
+            budget: Seconds to spend on optimal insertion before placing the
+                    rest greedily; None for no limit
+
+        Returns:
+            Resource id (or None) for each of the given reports, as of now
+        """
+        started = time.monotonic()
+        deadline = started + budget if budget is not None else None
+        new_rows = self._add_rows([r for r in reports if self.get(r, "id") not in self._rows])
+
+        # Greedy placements from an earlier call get another chance
+        queue = sorted(self._provisional)
+        for row in queue:
+            self._unplace(row)
+        self._provisional.clear()
+        if queue:
+            self._rebalance()
+
+        queue += self._pending + new_rows
+        self._pending = []
+        queue.sort(key=lambda row: -self._weights[row])  # stable: arrival order within a priority
+        for row in queue:
+            if not self._has_room():
+                self._pending.append(row)
+            elif deadline is not None and time.monotonic() >= deadline:
+                self._place_greedy(row)
+            else:
+                self._insert(row)
+
+        self.stats['provisional'] = len(self._provisional)
+        self.stats['solve_ms'] = round((time.monotonic() - started) * 1000, 2)
+        return {self.get(r, "id"): self.resource_for(self.get(r, "id")) for r in reports}
+
+    def release(self, report_id: str) -> None:
+        """Forget a report (ticket closed or cancelled) and give its place to others."""
+        row = self._rows.pop(report_id, None)
+        if row is None:
+            return
+        column = self._where[row]
+        self._unplace(row)
+        self._pinned.discard(row)
+        self._provisional.discard(row)
+        if row in self._pending:
+            self._pending.remove(row)
+        self._cost[row, :] = np.inf
+        if column >= 0:
+            self._rebalance()
+            self._fill_from_pending()
+
+    def pin(self, report_id: str) -> None:
+        """Keep a report where it is: help has been dispatched."""
+        row = self._rows[report_id]
+        if self._where[row] >= 0 and row not in self._pinned:
+            self._pinned.add(row)
+            self._provisional.discard(row)
+            self._members[self._where[row]].discard(row)
+            self._refresh_edges(self._where[row])
+
+    def set_capacity(self, resource_id: str, capacity: int) -> None:
+        """
+        Change a resource's capacity. Growth is filled by rerouting and by
+        waiting reports; on shrinking, the lowest-priority movable reports
+        over the new capacity go back to waiting.
+        """
+        column = self._columns[resource_id]
+        self._capacity[column] = capacity
+        while self._used[column] > capacity and self._members[column]:
+            row = min(self._members[column], key=lambda r: (self._weights[r], -r))
+            self._unplace(row)
+            self._pending.append(row)
+        self._rebalance()
+        self._fill_from_pending()
+
+    def add_resource(self, resource) -> None:
+        """Add a resource (or update one's capacity)."""
+        resource_id = self.get(resource, "id")
+        if resource_id in self._columns:
+            self._resources[self._columns[resource_id]] = resource
+            self.set_capacity(resource_id, self.get(resource, "capacity") or 0)
+            return
+        column = len(self._resources)
+        self._columns[resource_id] = column
+        self._resources.append(resource)
+        self._members.append(set())
+        self._capacity = np.append(self._capacity, max(self.get(resource, "capacity") or 0, 0))
+        self._used = np.append(self._used, 0)
+        costs = self._costs(self._reports, [resource]) if self._reports else np.zeros((0, 1))
+        self._cost = np.hstack([self._cost, costs])
+
+        edges = np.full((column + 1, column + 1), np.inf)
+        edges[:column, :column] = self._edges
+        self._edges = edges
+        for j in range(column):
+            self._refresh_edges(j)
+        if self._capacity[column] > 0:
+            self.set_capacity(resource_id, int(self._capacity[column]))
+
+    # ---- internals ---------------------------------------------------------
+
+    def _resource_id(self, column: int) -> Optional[str]:
+        return self.get(self._resources[column], "id") if column >= 0 else None
+
+    def _costs(self, reports: Sequence, resources: Sequence) -> np.ndarray:
+        get = self.get
+        distances = haversine_matrix([get(r, "lat") for r in reports], [get(r, "lon") for r in reports],
+                                     [get(r, "lat") for r in resources], [get(r, "lon") for r in resources])
+        categories = np.array([get(r, "category", None) or "other" for r in reports], dtype=object)
+        types = np.array([get(r, "type") for r in resources], dtype=object)
+        compatible = (categories[:, None] == types[None, :]) | (categories == "other")[:, None]
+        weights = np.array([self.weight(r, get) for r in reports])[:, None]
+        return weights * (distances + np.where(compatible, 0.0, INCOMPATIBLE_PENALTY_KM))
+
+    def _add_rows(self, reports: Sequence) -> List[int]:
+        if not reports:
+            return []
+        first = len(self._reports)
+        self._cost = np.vstack([self._cost, self._costs(reports, self._resources)])
+        for offset, report in enumerate(reports):
+            self._rows[self.get(report, "id")] = first + offset
+            self._reports.append(report)
+            self._weights.append(self.weight(report, self.get))
+            self._where.append(-1)
+        return list(range(first, len(self._reports)))
+
+    def _refresh_edges(self, column: int) -> None:
+        rows = list(self._members[column])
+        if rows:
+            block = self._cost[rows]
+            self._edges[column] = (block - block[:, column][:, None]).min(axis=0)
+        else:
+            self._edges[column] = np.inf
+        self._edges[column, column] = np.inf
+
+    def _shortest_paths(self, distance: np.ndarray):
+        """Distances from the given start costs, and each node's predecessor (-1 for a start)."""
+        distance = distance.copy()
+        previous = np.full(len(distance), -1)
+        for _ in range(len(distance)):
+            through = distance[:, None] + self._edges
+            best = through.min(axis=0)
+            better = best < distance - 1e-9
+            if not better.any():
+                break
+            distance[better] = best[better]
+            previous[better] = through.argmin(axis=0)[better]
+        return distance, previous
+
+    def _path(self, previous: np.ndarray, end: int) -> List[int]:
+        path = [end]
+        while previous[path[-1]] >= 0:
+            path.append(int(previous[path[-1]]))
+        return path[::-1]
+
+    def _move_along(self, path: List[int]) -> None:
+        """Shift one report across each edge of the path, last edge first."""
+        for u, v in reversed(list(zip(path, path[1:]))):
+            rows = list(self._members[u])
+            row = rows[int(np.argmin(self._cost[rows, v] - self._cost[rows, u]))]
+            self._members[u].discard(row)
+            self._members[v].add(row)
+            self._where[row] = v
+            self.stats['rerouted'] += 1
+        for column in set(path):
+            self._refresh_edges(column)
+
+    def _insert(self, row: int) -> None:
+        """Place a report along the cheapest augmenting path."""
+        distance, previous = self._shortest_paths(self._cost[row])
+        distance[self._used >= self._capacity] = np.inf
+        end = int(np.argmin(distance))
+        path = self._path(previous, end)
+        self._move_along(path)
+        self._where[row] = path[0]
+        self._members[path[0]].add(row)
+        self._used[end] += 1
+        self._refresh_edges(path[0])
+        self.stats['inserted'] += 1
+
+    def _rebalance(self) -> None:
+        """Reroute reports into free room for as long as that lowers the total cost."""
+        while True:
+            # Any resource may give up one of its reports, so every node starts at 0
+            distance, previous = self._shortest_paths(np.zeros(len(self._resources)))
+            distance[self._used >= self._capacity] = np.inf
+            end = int(np.argmin(distance))
+            if distance[end] >= -1e-9 or previous[end] < 0:
+                return
+            path = self._path(previous, end)
+            self._move_along(path)
+            self._used[path[0]] -= 1
+            self._used[end] += 1
+
+    def _place_greedy(self, row: int) -> None:
+        open_columns = self._used < self._capacity
+        column = int(np.argmin(np.where(open_columns, self._cost[row], np.inf)))
+        self._where[row] = column
+        self._used[column] += 1
+        self._provisional.add(row)
+        self.stats['greedy'] += 1
+
+    def _unplace(self, row: int) -> None:
+        column = self._where[row]
+        if column < 0:
+            return
+        self._where[row] = -1
+        self._used[column] -= 1
+        if row in self._members[column]:
+            self._members[column].discard(row)
+            self._refresh_edges(column)
+
+    def _has_room(self) -> bool:
+        # Per resource: pinned reports can keep one over a lowered capacity,
+        # and that overflow is no room anywhere else
+        return bool(np.maximum(self._capacity - self._used, 0).sum() > 0)
+
+    def _fill_from_pending(self) -> None:
+        self._pending.sort(key=lambda row: -self._weights[row])
+        while self._pending and self._has_room():
+            self._insert(self._pending.pop(0))
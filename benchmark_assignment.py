@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Benchmark for UnityAid report-to-resource assignment.
+Generates a seeded surge of reports and a set of resources across
+Miami-Dade, then assigns them with the greedy matcher the app uses
+(each report takes the nearest resource with capacity left, in arrival
+order) and with the capacity-aware optimizer, solved in one batch and in
+arriving batches under a time budget. Each strategy is scored on travel
+distance, how well high-priority reports are served, and solve time. Each
+run is written as JSON so runs can be compared and regressions caught.
+
+Usage:
+    python benchmark_assignment.py --output baseline.json
+    python benchmark_assignment.py --reports 2000 --supply 0.8 --compare baseline.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+from assignment_optimizer import AssignmentOptimizer, priority_weight
+from benchmark_location import km_between, percentile
+from resource_index import ResourceIndex
+
+CATEGORIES = ["food", "water", "medical", "shelter"]
+# Share of reports per category ("other" may go anywhere)
+CATEGORY_WEIGHTS = [25, 20, 20, 25, 10]
+PRIORITY_WEIGHTS = [10, 20, 35, 20, 15]  # surge mix, priority 1-5
+
+# Neighborhoods that reports cluster around, so nearby resources run out first
+HOTSPOTS = [(25.7617, -80.1918), (25.8576, -80.2781), (25.4687, -80.4776), (25.6866, -80.4128),
+            (25.9420, -80.2456), (25.7959, -80.2870), (25.8100, -80.1300)]
+
+@dataclass
+class Report:
+    id: str
+    lat: float
+    lon: float
+    category: str
+    urgency: int
+
+@dataclass
+class Resource:
+    id: str
+    type: str
+    lat: float
+    lon: float
+    capacity: int
+
+def generate_scenario(reports: int = 1000, resources: int = 60, supply: float = 1.2, seed: int = 42):
+    """
+    Seeded reports and resources. Total capacity is `supply` times the number
+    of reports, spread unevenly over the resources.
+
+    Returns:
+        (reports, resources)
+    """
+    rng = random.Random(seed)
+    generated = []
+    for i in range(reports):
+        lat, lon = rng.choice(HOTSPOTS)
+        generated.append(Report(f"t{i}", lat + rng.gauss(0, 0.04), lon + rng.gauss(0, 0.04),
+                                rng.choices(CATEGORIES + ["other"], CATEGORY_WEIGHTS)[0],
+                                rng.choices(range(1, 6), PRIORITY_WEIGHTS)[0]))
+    shares = [rng.expovariate(1.0) for _ in range(resources)]
+    total = int(reports * supply)
+    sites = [Resource(f"r{i}", CATEGORIES[i % len(CATEGORIES)], rng.uniform(25.25, 25.98),
+                      rng.uniform(-80.60, -80.12), max(1, round(total * share / sum(shares))))
+             for i, share in enumerate(shares)]
+    return generated, sites
+
+def greedy_assign(reports, resources) -> dict:
+    """The app's matcher: match_resource per report in arrival order, using up capacity."""
+    resources = {r.id: replace(r) for r in resources}
+    index = ResourceIndex.from_resources(resources.values())
+    assignment = {}
+    for report in reports:
+        resource = index.nearest(report.lat, report.lon, report.category)
+        assignment[report.id] = resource.id if resource else None
+        if resource:
+            resource.capacity -= 1
+            index.update(resource)
+    return assignment
+
+def score(assignment: dict, reports, resources) -> dict:
+    """Travel distance and service levels of an assignment."""
+    sites = {r.id: r for r in resources}
+    distances, urgent, cross = [], [], 0
+    weighted = 0.0
+    for report in reports:
+        site = sites.get(assignment.get(report.id))
+        if site is None:
+            continue
+        km = km_between(report.lat, report.lon, site.lat, site.lon)
+        distances.append(km)
+        weighted += priority_weight(report) * km
+        if report.urgency >= 4:
+            urgent.append(km)
+        if report.category not in ("other", site.type):
+            cross += 1
+    urgent_total = sum(1 for r in reports if r.urgency >= 4) or 1
+    distances.sort()
+    urgent.sort()
+    return {
+        'matched': len(distances),
+        'total_km': round(sum(distances), 2),
+        'weighted_km': round(weighted, 2),
+        'mean_km': round(sum(distances) / len(distances), 3) if distances else 0.0,
+        'p90_km': round(percentile(distances, 90), 3),
+        'urgent_served': round(len(urgent) / urgent_total, 4),
+        'urgent_mean_km': round(sum(urgent) / len(urgent), 3) if urgent else 0.0,
+        'cross_category': cross,
+    }
+
+def run_strategy(name: str, reports, resources, batch: int = 100, budget: float = 0.05) -> dict:
+    started = time.perf_counter()
+    batch_ms = []
+    if name == 'greedy':
+        assignment = greedy_assign(reports, resources)
+    else:
+        optimizer = AssignmentOptimizer(resources)
+        size = len(reports) if name == 'optimized' else batch
+        for start in range(0, len(reports), size):
+            optimizer.assign(reports[start:start + size], budget=None if name == 'optimized' else budget)
+            batch_ms.append(optimizer.stats['solve_ms'])
+        assignment = optimizer.assignments
+    result = score(assignment, reports, resources)
+    result['solve_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    if batch_ms:
+        result['batch_ms'] = {'p50': percentile(sorted(batch_ms), 50), 'max': max(batch_ms)}
+        result['greedy_fallbacks'] = optimizer.stats['provisional']
+    return result
+
+STRATEGIES = ['greedy', 'optimized', 'optimized_batches']
+
+def run_benchmark(reports: int = 1000, resources: int = 60, supply: float = 1.2, seed: int = 42,
+                  batch: int = 100, budget: float = 0.05, strategies: list = None) -> dict:
+    """Assign one generated scenario with each strategy."""
+    generated, sites = generate_scenario(reports, resources, supply, seed)
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'reports': reports,
+            'resources': resources,
+            'supply': supply,
+            'seed': seed,
+            'batch': batch,
+            'budget_s': budget,
+        },
+        'results': {},
+    }
+    for name in strategies or STRATEGIES:
+        report['results'][name] = run_strategy(name, generated, sites, batch, budget)
+    return report
+
+def compare_reports(baseline: dict, current: dict, tolerance: float = 0.10) -> list:
+    """
+    Compare two runs strategy by strategy.
+
+    Returns:
+        list: Regression messages where weighted travel distance or solve
+              time grew by more than `tolerance`, or fewer urgent reports
+              were served
+    """
+    regressions = []
+    for name, now in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before:
+            continue
+        if now['weighted_km'] > before['weighted_km'] * (1 + tolerance):
+            regressions.append(f"{name}: weighted km {before['weighted_km']} -> {now['weighted_km']}")
+        if now['urgent_served'] < before['urgent_served']:
+            regressions.append(f"{name}: urgent served {before['urgent_served']:.1%} -> "
+                               f"{now['urgent_served']:.1%}")
+        if now['solve_ms'] > before['solve_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: solve {before['solve_ms']} -> {now['solve_ms']} ms")
+    return regressions
+
+def print_report(report: dict) -> None:
+    meta = report['meta']
+    print(f"{meta['reports']} reports, {meta['resources']} resources, supply {meta['supply']:.0%} "
+          f"of demand, seed {meta['seed']}")
+    print("=" * 100)
+    print(f"{'strategy':<20}{'matched':>8}{'total km':>11}{'weighted km':>13}{'mean km':>9}"
+          f"{'p90 km':>8}{'urgent':>8}{'urg km':>8}{'cross':>6}{'solve ms':>10}")
+    for name, r in report['results'].items():
+        print(f"{name:<20}{r['matched']:>8}{r['total_km']:>11.1f}{r['weighted_km']:>13.1f}{r['mean_km']:>9.2f}"
+              f"{r['p90_km']:>8.2f}{r['urgent_served']:>8.0%}{r['urgent_mean_km']:>8.2f}"
+              f"{r['cross_category']:>6}{r['solve_ms']:>10.1f}")
+    for name, r in report['results'].items():
+        if 'batch_ms' in r:
+            print(f"\n{name}: batch p50 {r['batch_ms']['p50']} ms, max {r['batch_ms']['max']} ms, "
+                  f"{r['greedy_fallbacks']} greedy fallbacks")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare greedy and optimized resource assignment")
+    parser.add_argument("--reports", type=int, default=1000)
+    parser.add_argument("--resources", type=int, default=60)
+    parser.add_argument("--supply", type=float, default=1.2,
+                        help="total capacity as a multiple of the number of reports")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch", type=int, default=100, help="reports per incremental batch")
+    parser.add_argument("--budget", type=float, default=0.05, help="seconds per incremental batch")
+    parser.add_argument("--strategy", action="append", choices=STRATEGIES,
+                        help="run only this strategy (repeatable)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed distance or solve time growth before flagging (default 0.10)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.reports, args.resources, args.supply, args.seed, args.batch,
+                           args.budget, args.strategy)
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare_reports(baseline, report, args.tolerance)
+        print(f"\nCompared with {args.compare}:")
+        for message in regressions:
+            print(f"   ✗ {message}")
+        if not regressions:
+            print("   ✓ No regressions")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Accuracy and latency harness for UnityAid location extraction.
+Runs a labeled corpus of location phrases through LocationExtractor under
+several strategies (geocoder only, with a warm cache, with the gazetteer and
+grid resolvers, fully offline) against a local Nominatim stand-in with
+configurable latency and error rate. Each stage of the pipeline is timed and
+answers are scored by distance from the labeled coordinates. Each run is
+written as JSON so runs can be compared and regressions caught.
+
+Usage:
+    python benchmark_location.py --output baseline.json
+    python benchmark_location.py --latency 0.3 --error-rate 0.1 --compare baseline.json
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fake_nominatim import FakeNominatim
+from gazetteer import Gazetteer
+from geocode_cache import GeocodeCache, normalize_address
+from geocoding_service import GeocodingService, NominatimBackend
+from location_extractor import LocationExtractor
+
+# (text, (latitude, longitude)), or None where the text names no place and
+# nothing should be returned. Labels are the real-world position of each place
+# (OpenStreetMap / Wikipedia coordinates for landmarks, the building or
+# intersection for addresses), taken independently of the gazetteer so its own
+# approximations count against it. The last named places are not in the
+# gazetteer at all.
+CORPUS = [
+    ("Someone stopped breathing at Doral CVS at 107th Street", (25.8119, -80.3553)),
+    ("Car accident at the intersection of Biscayne Blvd and 125th Street", (25.8906, -80.1616)),
+    ("Fire at Miami International Airport Terminal 3", (25.7953, -80.2901)),
+    ("Medical emergency at Jackson Memorial Hospital emergency room", (25.7900, -80.2106)),
+    ("Flooding at 1234 SW 8th Street Miami FL", (25.7651, -80.2140)),
+    ("Person trapped at Aventura Mall near Nordstrom", (25.9573, -80.1431)),
+    ("Gas leak reported at University of Miami campus", (25.7217, -80.2789)),
+    ("Building collapse at downtown Miami near Bayside", (25.7786, -80.1858)),
+    ("Power lines down at NW 36th Street and NW 27th Avenue", (25.8098, -80.2386)),
+    ("Water rising fast at 2000 W Flagler St", (25.7731, -80.2272)),
+    ("Elderly man needs insulin at 1500 NW 7th Ave", (25.7874, -80.2055)),
+    ("Roof collapsed near SW 8th St & 27th Ave", (25.7655, -80.2385)),
+    ("Tree fell on a car at 9700 SW 87th Ave", (25.6785, -80.3372)),
+    ("Gas smell at 500 NE 2nd Ave", (25.7793, -80.1903)),
+    ("Trapped near Avenura Mall", (25.9573, -80.1431)),
+    ("Family stranded at Dolphin Mall parking lot", (25.7881, -80.3811)),
+    ("Student injured near FIU", (25.7561, -80.3739)),
+    ("People sheltering at Bayfront Park", (25.7753, -80.1858)),
+    ("Need water at Marlins Park", (25.7781, -80.2200)),
+    ("Flooding on the streets of Little Havana", (25.7656, -80.2194)),
+    ("Power is out across Hialeah", (25.8600, -80.2781)),
+    ("Child with asthma attack at Kendall Regional Hospital", (25.7337, -80.3834)),
+    ("Boat capsized near the Miami Seaquarium", (25.7342, -80.1647)),
+    ("Evacuation needed in Key Biscayne", (25.6920, -80.1644)),
+    ("Shelter at Tropical Park is full", (25.7320, -80.3240)),
+    ("Downed tree blocking Coral Way", (25.7502, -80.2385)),
+    ("Visitors stranded at Fairchild Tropical Botanic Garden", (25.6769, -80.2731)),
+    ("Swimmer missing off Crandon Park", (25.7136, -80.1564)),
+    ("Boats sinking at Haulover Park marina", (25.9028, -80.1214)),
+    ("Flooded trail at Matheson Hammock Park", (25.6800, -80.2670)),
+    ("Water coming into the Perez Art Museum", (25.7858, -80.1864)),
+    ("Crash in the stands at Homestead-Miami Speedway", (25.4517, -80.4086)),
+    ("Roof torn off at the Deering Estate", (25.6153, -80.3064)),
+    ("Elderly couple stuck at Jungle Island", (25.7850, -80.1744)),
+    ("Need help", None),
+    ("Please send food and water, we are hungry", None),
+    ("My grandmother fell and can't get up", None),
+    ("The storm knocked out our power since last night", None),
+]
+
+# What the stand-in Nominatim answers for queries mentioning each name. Like
+# the real service it knows landmarks (at their OpenStreetMap position) and
+# streets, but not house numbers: addresses on a street resolve to one point on it.
+STANDIN_PLACES = {
+    "Jackson Memorial Hospital": (25.7900, -80.2106),
+    "Miami International Airport": (25.7953, -80.2901),
+    "Aventura Mall": (25.9573, -80.1431),
+    "University of Miami": (25.7217, -80.2789),
+    "Bayside": (25.7786, -80.1858),
+    "Dolphin Mall": (25.7881, -80.3811),
+    "FIU": (25.7561, -80.3739),
+    "Bayfront Park": (25.7753, -80.1858),
+    "Marlins Park": (25.7781, -80.2200),
+    "Little Havana": (25.7656, -80.2194),
+    "Hialeah": (25.8600, -80.2781),
+    "Kendall Regional Hospital": (25.7337, -80.3834),
+    "Miami Seaquarium": (25.7342, -80.1647),
+    "Key Biscayne": (25.6920, -80.1644),
+    "Tropical Park": (25.7320, -80.3240),
+    "Coral Way": (25.7502, -80.2385),
+    "Fairchild Tropical Botanic Garden": (25.6769, -80.2731),
+    "Crandon Park": (25.7136, -80.1564),
+    "Haulover Park": (25.9028, -80.1214),
+    "Matheson Hammock Park": (25.6800, -80.2670),
+    "Perez Art Museum": (25.7858, -80.1864),
+    "Homestead-Miami Speedway": (25.4517, -80.4086),
+    "Deering Estate": (25.6153, -80.3064),
+    "Jungle Island": (25.7850, -80.1744),
+    "Doral": (25.8119, -80.3553),
+    "Biscayne Blvd": (25.8400, -80.1840),
+    "SW 8th Street": (25.7653, -80.2566),
+    "SW 8th St": (25.7653, -80.2566),
+    "NW 36th Street": (25.8110, -80.2700),
+    "W Flagler St": (25.7730, -80.2500),
+    "NW 7th Ave": (25.8200, -80.2090),
+    "SW 87th Ave": (25.7200, -80.3370),
+    "NE 2nd Ave": (25.8200, -80.1900),
+}
+
+# name -> LocationExtractor configuration
+STRATEGIES = {
+    'geocoder': {'gazetteer': False, 'grid': False, 'geocoder': True, 'warm_cache': False},
+    'geocoder+warm_cache': {'gazetteer': False, 'grid': False, 'geocoder': True, 'warm_cache': True},
+    'gazetteer+geocoder': {'gazetteer': True, 'grid': False, 'geocoder': True, 'warm_cache': False},
+    'gazetteer+grid+geocoder': {'gazetteer': True, 'grid': True, 'geocoder': True, 'warm_cache': False},
+    'offline': {'gazetteer': True, 'grid': True, 'geocoder': False, 'warm_cache': False},
+}
+
+RADII_KM = (0.5, 1, 2, 5)
+
+class CorpusNominatim(FakeNominatim):
+    """Nominatim stand-in that answers any query containing a known name (the longest wins)."""
+
+    def search(self, query: str) -> list:
+        normalized = normalize_address(query)
+        known = [name for name in self.places if name in normalized]
+        if not known:
+            return []
+        name = max(known, key=len)
+        latitude, longitude = self.places[name][:2]
+        return [{'lat': str(latitude), 'lon': str(longitude), 'display_name': name}]
+
+class StageTimer:
+    """Times calls to methods of objects in the pipeline, by stage name."""
+
+    def __init__(self):
+        self.durations = {}
+
+    def wrap(self, obj, method_name: str, stage: str) -> None:
+        """Replace obj.method_name on this instance with a timed version."""
+        method = getattr(obj, method_name)
+        durations = self.durations.setdefault(stage, [])
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                durations.append(time.perf_counter() - start)
+
+        setattr(obj, method_name, timed)
+
+    def summary(self) -> dict:
+        stages = {}
+        for stage, durations in self.durations.items():
+            ordered = sorted(durations)
+            stages[stage] = {
+                'calls': len(ordered),
+                'total_ms': round(sum(ordered) * 1000, 3),
+                'mean_ms': round(sum(ordered) / len(ordered) * 1000, 4) if ordered else 0.0,
+                'p95_ms': round(percentile(ordered, 95) * 1000, 4),
+            }
+        return stages
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def km_between(lat1, lon1, lat2, lon2) -> float:
+    """Great-circle distance in kilometers."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dl = math.radians(lon2 - lon1)
+    h = math.sin(dphi / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * 6371 * math.asin(math.sqrt(h))
+
+def score(results: list) -> dict:
+    """
+    Accuracy of (expected, info) pairs.
+
+    Returns:
+        dict: share of placeable texts located at all and within each
+              radius, error percentiles, and false positives on texts that
+              name no place
+    """
+    placeable = [(expected, info) for expected, info in results if expected is not None]
+    errors = sorted(km_between(info.latitude, info.longitude, *expected)
+                    for expected, info in placeable if info.latitude is not None)
+    false_positives = sum(1 for expected, info in results
+                          if expected is None and info.latitude is not None)
+    total = len(placeable) or 1
+    return {
+        'placeable': len(placeable),
+        'located': round(len(errors) / total, 4),
+        'within_km': {str(radius): round(sum(e <= radius for e in errors) / total, 4) for radius in RADII_KM},
+        'median_error_km': round(percentile(errors, 50), 3),
+        'p90_error_km': round(percentile(errors, 90), 3),
+        'false_positives': false_positives,
+    }
+
+def run_strategy(options: dict, server_url: str, corpus=CORPUS, spacy: bool = False,
+                 budget: float = 5.0, rate: float = 50.0, timeout: float = 10.0) -> dict:
+    """Run the corpus through an extractor configured by `options` and collect metrics."""
+    cache = GeocodeCache(":memory:")
+    backend = NominatimBackend(server_url, timeout=timeout) if options['geocoder'] else None
+    service = GeocodingService(backend, cache=cache, rate=rate, max_queue=len(corpus) * 2 + 2,
+                               timeout=timeout)
+    gazetteer = Gazetteer.from_file() if options['gazetteer'] else False
+    extractor = LocationExtractor(geocode_cache=cache, gazetteer=gazetteer, geocoding_service=service,
+                                  spacy=spacy, grid=options['grid'])
+    extractor.geocode_budget = budget
+    if spacy:
+        extractor.load_model()
+    try:
+        if options['warm_cache']:
+            for text, _ in corpus:
+                extractor.extract_location(text)
+        calls_before = dict(service.stats)
+        cache_before = cache.stats()
+
+        timer = StageTimer()
+        timer.wrap(extractor, '_extract_with_spacy', 'spacy')
+        timer.wrap(extractor, '_extract_with_patterns', 'patterns')
+        timer.wrap(extractor, '_grid_location', 'grid')
+        timer.wrap(extractor, '_geocode_address', 'geocode')
+        timer.wrap(cache, 'get', 'cache')
+        if gazetteer:
+            timer.wrap(gazetteer, 'resolve', 'gazetteer')
+
+        latencies, results = [], []
+        methods = Counter()
+        for text, expected in corpus:
+            start = time.perf_counter()
+            info = extractor.extract_location(text)
+            latencies.append(time.perf_counter() - start)
+            results.append((expected, info))
+            if info.latitude is not None:
+                methods[info.extraction_method] += 1
+    finally:
+        service.close()
+
+    cache_after = cache.stats()
+    lookups = (cache_after['memory_hits'] + cache_after['disk_hits'] + cache_after['misses']) - \
+              (cache_before['memory_hits'] + cache_before['disk_hits'] + cache_before['misses'])
+    hits = (cache_after['memory_hits'] + cache_after['disk_hits']) - \
+           (cache_before['memory_hits'] + cache_before['disk_hits'])
+    ordered = sorted(latencies)
+    return {
+        'texts': len(latencies),
+        'seconds': round(sum(latencies), 4),
+        'latency_ms': {
+            'mean': round(sum(ordered) / len(ordered) * 1000, 4) if ordered else 0.0,
+            'p50': round(percentile(ordered, 50) * 1000, 4),
+            'p95': round(percentile(ordered, 95) * 1000, 4),
+            'p99': round(percentile(ordered, 99) * 1000, 4),
+            'max': round(ordered[-1] * 1000, 4) if ordered else 0.0,
+        },
+        'stages': timer.summary(),
+        'accuracy': score(results),
+        'network_calls': service.stats['network_calls'] - calls_before['network_calls'],
+        'geocode_errors': (service.stats['errors'] - calls_before['errors']) +
+                          (service.stats['timeouts'] - calls_before['timeouts']),
+        'cache_hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+        'methods': dict(methods.most_common()),
+    }
+
+def run_benchmark(strategies: list = None, latency: float = 0.0, error_rate: float = 0.0,
+                  seed: int = 42, spacy: bool = False, budget: float = 5.0, rate: float = 50.0,
+                  corpus=CORPUS) -> dict:
+    """Benchmark the selected strategies (all by default) against one stand-in server."""
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'spacy': spacy,
+            'latency_s': latency,
+            'error_rate': error_rate,
+            'seed': seed,
+            'budget_s': budget,
+            'rate': rate,
+        },
+        'corpus': {
+            'texts': len(corpus),
+            'placeable': sum(1 for _, expected in corpus if expected is not None),
+        },
+        'results': {},
+    }
+    with CorpusNominatim(STANDIN_PLACES, latency=latency, error_rate=error_rate, seed=seed) as server:
+        for name in strategies or STRATEGIES:
+            report['results'][name] = run_strategy(STRATEGIES[name], server.url, corpus, spacy,
+                                                   budget, rate)
+    return report
+
+def compare_reports(baseline: dict, current: dict, tolerance: float = 0.10) -> list:
+    """
+    Compare two runs strategy by strategy.
+
+    Returns:
+        list: Regression messages where accuracy within 1 km dropped, false
+              positives rose, or p95 latency grew by more than `tolerance`
+    """
+    regressions = []
+    for name, now in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before:
+            continue
+        if now['accuracy']['within_km']['1'] < before['accuracy']['within_km']['1']:
+            regressions.append(f"{name}: within 1 km {before['accuracy']['within_km']['1']:.1%} -> "
+                               f"{now['accuracy']['within_km']['1']:.1%}")
+        if now['accuracy']['false_positives'] > before['accuracy']['false_positives']:
+            regressions.append(f"{name}: false positives {before['accuracy']['false_positives']} -> "
+                               f"{now['accuracy']['false_positives']}")
+        if now['latency_ms']['p95'] > before['latency_ms']['p95'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['latency_ms']['p95']} -> "
+                               f"{now['latency_ms']['p95']} ms")
+    return regressions
+
+def print_report(report: dict) -> None:
+    meta = report['meta']
+    print(f"Corpus: {report['corpus']['texts']} texts ({report['corpus']['placeable']} placeable), "
+          f"stand-in latency {meta['latency_s']}s, error rate {meta['error_rate']:.0%}, "
+          f"spaCy {'on' if meta['spacy'] else 'off'}")
+    print("=" * 96)
+    radii = " ".join(f"{'≤' + str(r) + 'km':>7}" for r in RADII_KM)
+    print(f"{'strategy':<26}{'located':>8} {radii}{'FP':>4}{'p50 ms':>9}{'p95 ms':>9}{'calls':>7}")
+    for name, r in report['results'].items():
+        accuracy = r['accuracy']
+        within = " ".join(f"{accuracy['within_km'][str(radius)]:>7.0%}" for radius in RADII_KM)
+        print(f"{name:<26}{accuracy['located']:>8.0%} {within}{accuracy['false_positives']:>4}"
+              f"{r['latency_ms']['p50']:>9.2f}{r['latency_ms']['p95']:>9.2f}{r['network_calls']:>7}")
+
+    for name, r in report['results'].items():
+        print(f"\n{name}")
+        for stage, s in r['stages'].items():
+            print(f"   {stage:<10} {s['calls']:>4} calls  mean {s['mean_ms']:>9.3f} ms  "
+                  f"p95 {s['p95_ms']:>9.3f} ms  total {s['total_ms']:>9.1f} ms")
+        print(f"   Cache hit rate {r['cache_hit_rate']:.0%}, geocoder errors {r['geocode_errors']}, "
+              f"median error {r['accuracy']['median_error_km']} km")
+        print(f"   Answered by: {', '.join(f'{m} ({n})' for m, n in r['methods'].items()) or 'nothing'}")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure location extraction accuracy and latency")
+    parser.add_argument("--strategy", action="append", choices=list(STRATEGIES),
+                        help="run only this strategy (repeatable)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds the stand-in Nominatim waits per request")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of stand-in requests that fail with 503")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--spacy", action="store_true", help="wait for and use the spaCy model")
+    parser.add_argument("--budget", type=float, default=5.0,
+                        help="seconds each text may wait for geocoding (GEOCODE_BUDGET)")
+    parser.add_argument("--rate", type=float, default=50.0,
+                        help="stand-in requests per second (the public server allows 1)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed p95 latency change before flagging (default 0.10)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.strategy, args.latency, args.error_rate, args.seed,
+                           args.spacy, args.budget, args.rate)
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare_reports(baseline, report, args.tolerance)
+        print(f"\nCompared with {args.compare}:")
+        for message in regressions:
+            print(f"   ✗ {message}")
+        if not regressions:
+            print("   ✓ No regressions")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the pattern-based location extraction in UnityAid.
+Times location_patterns.find_location_candidates on long (10 KB by default)
+descriptions, both realistic reports and adversarial inputs built to make
+backtracking regexes go quadratic, and checks that it returns exactly what
+the original per-call regular expressions return.
+
+Usage:
+    python benchmark_location_patterns.py
+    python benchmark_location_patterns.py --size 100000 --skip-regex
+"""
+import argparse
+import random
+import re
+import sys
+import time
+
+from location_patterns import BUSINESS_KEYWORDS, find_location_candidates
+
+# The patterns LocationExtractor._extract_with_patterns used to run through re.findall
+REGEX_PATTERNS = [
+    r'at\s+([^,\n]+(?:cvs|walgreens|walmart|target|mcdonalds|starbucks|hospital|clinic|school|university|mall|plaza|center)[^,\n]*)',
+    r'at\s+([^,\n]+(?:street|st|avenue|ave|road|rd|boulevard|blvd|drive|dr|lane|ln|way|place|pl)[^,\n]*)',
+    r'(\d+\s+[^,\n]+(?:street|st|avenue|ave|road|rd|boulevard|blvd|drive|dr|lane|ln))',
+    r'(?:at|near)\s+([^,\n]+(?:and|\&|intersection)[^,\n]+)',
+    r'(?:at|near)\s+([^,\n]*(?:hospital|clinic|school|university|airport|station|park|mall|center|plaza|building)[^,\n]*)',
+    r'(?:in|at)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?:\s*,\s*[A-Z]{2})?)',
+]
+
+def regex_candidates(text: str):
+    """Reference implementation: the original regex extraction, candidate for candidate."""
+    text_lower = text.lower()
+    locations = []
+    confidence = 0.0
+    for pattern in REGEX_PATTERNS:
+        for match in re.findall(pattern, text, re.IGNORECASE):
+            if len(match.strip()) > 3:
+                locations.append(match.strip())
+                confidence = max(confidence, 0.5)
+    for keyword in BUSINESS_KEYWORDS:
+        if keyword in text_lower:
+            for match in re.findall(f'([^.!?]*{keyword}[^.!?]*)', text, re.IGNORECASE):
+                if len(match.strip()) > len(keyword) + 5:
+                    locations.append(match.strip())
+                    confidence = max(confidence, 0.4)
+            break
+    return locations, confidence
+
+SENTENCES = [
+    "Someone stopped breathing at Doral CVS at 107th Street.",
+    "Car accident at the intersection of Biscayne Blvd and 125th Street!",
+    "Flooding at 1234 SW 8th Street Miami FL, water rising fast.",
+    "Person trapped at Aventura Mall near Nordstrom.",
+    "Power lines down near Coral Gables Hospital, road blocked.",
+    "Family of four needs water in Little Havana, Miami, FL.",
+    "We are sheltering at the school on 27th Avenue and need blankets?",
+    "Update from the neighbors: the storm took part of the roof and they are safe for now.",
+]
+
+# (prefix, repeated unit) that make the equivalent regexes backtrack over the whole clause
+ADVERSARIAL_INPUTS = {
+    "anchors without suffix": ("", "at the "),
+    "digits without suffix": ("", "1 2 "),
+    "intersection at clause end": ("", "near a and "),
+    "sentence after business": ("Publix. ", "still no word from the shelter "),
+}
+
+def realistic_description(size: int, rng: random.Random) -> str:
+    parts, length = [], 0
+    while length < size:
+        sentence = rng.choice(SENTENCES)
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(parts)[:size]
+
+def adversarial_description(prefix: str, unit: str, size: int) -> str:
+    return (prefix + unit * (size // len(unit) + 1))[:size]
+
+def time_calls(func, texts) -> dict:
+    """Milliseconds per call: mean, median and max over the texts."""
+    timings = []
+    for text in texts:
+        started = time.perf_counter()
+        func(text)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        'mean_ms': sum(timings) / len(timings),
+        'median_ms': timings[len(timings) // 2],
+        'max_ms': timings[-1],
+    }
+
+def run_benchmark(size: int = 10240, descriptions: int = 20, seed: int = 42,
+                  include_regex: bool = True) -> list:
+    """
+    Time both implementations on realistic and adversarial descriptions.
+
+    Returns:
+        list: One row per input kind with 'engine' and (if run) 'regex'
+              timings and whether their candidates were identical
+    """
+    rng = random.Random(seed)
+    inputs = {"realistic reports": [realistic_description(size, rng) for _ in range(descriptions)]}
+    for name, (prefix, unit) in ADVERSARIAL_INPUTS.items():
+        inputs[name] = [adversarial_description(prefix, unit, size)]
+
+    rows = []
+    for name, texts in inputs.items():
+        row = {'input': name, 'texts': len(texts), 'engine': time_calls(find_location_candidates, texts)}
+        if include_regex:
+            row['regex'] = time_calls(regex_candidates, texts)
+            row['identical'] = all(find_location_candidates(t) == regex_candidates(t) for t in texts)
+        rows.append(row)
+    return rows
+
+def print_report(rows: list, size: int) -> None:
+    print(f"Pattern extraction on {size:,}-character descriptions (ms per description)")
+    print(f"{'input':28s} {'engine mean':>12s} {'engine max':>11s} {'regex mean':>11s} {'speedup':>8s}  same")
+    for row in rows:
+        engine = row['engine']
+        regex = row.get('regex')
+        regex_mean = f"{regex['mean_ms']:11.2f}" if regex else f"{'-':>11s}"
+        speedup = f"{regex['mean_ms'] / engine['mean_ms']:7.0f}x" if regex else f"{'-':>8s}"
+        same = ("yes" if row['identical'] else "NO") if regex else "-"
+        print(f"{row['input']:28s} {engine['mean_ms']:12.2f} {engine['max_ms']:11.2f} {regex_mean} {speedup}  {same}")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pattern-based location extraction")
+    parser.add_argument("--size", type=int, default=10240, help="characters per description")
+    parser.add_argument("--descriptions", type=int, default=20, help="realistic descriptions to time")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-regex", action="store_true",
+                        help="do not run the original regexes (slow on adversarial input)")
+    args = parser.parse_args(argv)
+
+    rows = run_benchmark(args.size, args.descriptions, args.seed, not args.skip_regex)
+    print_report(rows, args.size)
+    return 0 if all(row.get('identical', True) for row in rows) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the UnityAid PrioritizerAgent.
+Generates a seeded synthetic corpus of disaster tickets and measures throughput,
+latency percentiles, memory and accuracy for the triage hot path. Each run is
+written as JSON so runs can be compared and regressions caught.
+
+Usage:
+    python benchmark_prioritizer.py --tickets 10000 --output baseline.json
+    python benchmark_prioritizer.py --tickets 10000 --compare baseline.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+
+# Add the PrioritizerAgent to path
+prioritizer_path = Path(__file__).parent / "PrioritizerAgent"
+sys.path.append(str(prioritizer_path))
+
+import prioritizer_integration
+from prioritizer_integration import (
+    PrioritizerConversation,
+    classify_with_conversation,
+    end_conversation,
+    enhanced_priority_classification,
+)
+
+# Synthetic ticket templates by the priority a dispatcher would assign
+TEMPLATES = {
+    5: [
+        "{Who} is unconscious and not breathing at {place}, need help now",
+        "Building collapse on {place}, {count} people trapped inside",
+        "Child missing in the flood zone near {place}, last seen {when}",
+        "{Who} has severe bleeding after the storm, {place}",
+        "Gas leak and fire spreading at {place}, people still inside",
+        "Water rising fast at {place}, {who} stuck on the roof, life-threatening",
+    ],
+    4: [
+        "Need insulin for {who}, running low since {when}",
+        "{Who} with chest pain and difficulty breathing at {place}",
+        "Family needs shelter at {place}, pregnant woman and baby",
+        "Water supply contaminated near {place}, many people sick",
+        "{Who} injured by falling debris on {place}, bleeding but conscious",
+        "Oxygen running out for {who} on dialysis, power out at {place}",
+    ],
+    3: [
+        "Shelter needed for family with children near {place}",
+        "Power out in the neighborhood around {place} for {hours} hours",
+        "Need food and water for {count} people at {place}",
+        "Road blocked by fallen trees on {place}, need cleanup",
+        "Request supplies for the community center at {place}",
+    ],
+    2: [
+        "Roof damage from storm at {place}, not urgent",
+        "Property damage assessment needed for {place}",
+        "Minor flooding in the garage at {place}, no one hurt",
+        "Fence down at {place}, can wait until next week",
+    ],
+    1: [
+        "Looking for information about evacuation routes from {place}",
+        "Question about volunteer sign-up at {place}",
+        "Where can I donate clothes near {place}",
+        "Request for general information about recovery programs",
+    ],
+}
+
+WHO = ["my neighbor", "an elderly man", "my grandmother", "a child", "a diabetic patient",
+       "the family next door", "a pregnant woman", "my brother", "a volunteer", "a resident"]
+PLACES = ["NW 7th Ave and 62nd St", "Biscayne Blvd", "Little Havana", "the Wynwood shelter",
+          "Coral Way", "Hialeah", "Miami Gardens", "SW 8th St", "Homestead", "the Overtown clinic",
+          "Kendall Dr", "Flagler St", "Coconut Grove", "Doral", "North Miami Beach"]
+WHEN = ["an hour ago", "this morning", "last night", "two days ago", "30 minutes ago"]
+COUNTS = ["two", "three", "several", "5", "a few", "many"]
+
+# Neutral context sentences used to vary ticket length
+FILLER = [
+    "The street is still flooded.",
+    "We have been waiting since the storm passed.",
+    "Phone battery is low so please text.",
+    "The building manager is not answering.",
+    "Neighbors are helping where they can.",
+    "There is debris everywhere on the road.",
+    "We can be reached at the front entrance.",
+    "The area has no cell signal most of the day.",
+    "Someone from the church came by earlier.",
+    "Please send someone who speaks Spanish.",
+]
+
+QUESTIONS = [
+    "Is anyone in immediate danger right now?",
+    "How many people are affected?",
+    "Is the situation getting worse?",
+    "Is the person conscious and breathing normally?",
+]
+
+# Answers by whether the ticket is an emergency (priority >= 4) or not
+ANSWERS = {
+    True: ["Yes, they are trapped", "Three people including a child", "Yes, water keeps rising",
+           "No, struggling to breathe", "Yes, it's getting worse fast"],
+    False: ["No, everyone is safe", "Just me", "No, it's stable", "Yes, everyone is fine",
+            "Not really, we can wait"],
+}
+
+def _fill(template: str, rng: random.Random) -> str:
+    who = rng.choice(WHO)
+    return template.format(
+        who=who, Who=who[0].upper() + who[1:], place=rng.choice(PLACES), when=rng.choice(WHEN),
+        count=rng.choice(COUNTS), hours=rng.randint(2, 48)
+    )
+
+def generate_corpus(count: int, seed: int = 42, max_sentences: int = 12):
+    """
+    Generate synthetic disaster tickets (deterministic for a given seed).
+
+    Args:
+        count: Number of tickets
+        seed: Random seed
+        max_sentences: Upper bound on extra context sentences per ticket
+
+    Yields:
+        dict: {'id', 'text', 'expected_priority', 'qa_pairs'}
+    """
+    rng = random.Random(seed)
+    levels = list(TEMPLATES)
+    weights = [10, 20, 35, 20, 15]  # surge mix: most tickets are routine
+    for i in range(count):
+        level = rng.choices(levels, weights)[0]
+        parts = [_fill(rng.choice(TEMPLATES[level]), rng)]
+        # Long-tailed length: most tickets are short, some ramble
+        extra = min(int(rng.expovariate(0.5)), max_sentences)
+        parts.extend(rng.choice(FILLER) for _ in range(extra))
+        if level >= 4 and rng.random() < 0.3:
+            parts[0] += "!!!"
+        questions = rng.sample(QUESTIONS, 2)
+        qa_pairs = [(q, rng.choice(ANSWERS[level >= 4])) for q in questions]
+        yield {'id': i, 'text': " ".join(parts), 'expected_priority': level, 'qa_pairs': qa_pairs}
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def classify_and_end_conversation(ticket: dict) -> dict:
+    """classify_with_conversation, then release its session as the app does once the ticket is created."""
+    result = classify_with_conversation(ticket['text'])
+    end_conversation(result.get('conversation_id'))
+    return result
+
+# name -> callable(ticket) -> classification result
+TARGETS = {
+    'enhanced_priority_classification': lambda t: enhanced_priority_classification(t['text']),
+    'classify_with_conversation': classify_and_end_conversation,
+    'reclassify_with_answers': lambda t: PrioritizerConversation().reclassify_with_answers(
+        t['text'], t['qa_pairs']),
+}
+
+def benchmark_target(func, count: int, seed: int, chunk_size: int = 10000,
+                     memory_sample: int = 1000, cold_cache: bool = False) -> dict:
+    """
+    Run one target over the corpus and collect its metrics.
+
+    The corpus is generated chunk by chunk outside the timed loop, so a run
+    of 1M tickets does not hold the whole corpus in memory. Memory is traced
+    separately on the first `memory_sample` tickets because tracemalloc
+    slows every allocation.
+    """
+    cache = prioritizer_integration.classification_cache
+    cache.invalidate()
+    hits, misses = cache.hits, cache.misses
+
+    latencies = array('d')
+    elapsed = 0.0
+    correct = within_one = 0
+    corpus = generate_corpus(count, seed)
+    while True:
+        chunk = list(islice(corpus, chunk_size))
+        if not chunk:
+            break
+        clock = time.perf_counter
+        chunk_start = clock()
+        for ticket in chunk:
+            if cold_cache:
+                cache.invalidate()
+            start = clock()
+            result = func(ticket)
+            latencies.append(clock() - start)
+            error = abs(result['priority'] - ticket['expected_priority'])
+            correct += error == 0
+            within_one += error <= 1
+        elapsed += clock() - chunk_start
+
+    lookups = (cache.hits - hits) + (cache.misses - misses)
+    ordered = sorted(latencies)
+    return {
+        'tickets': len(latencies),
+        'seconds': round(elapsed, 4),
+        'tickets_per_sec': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'latency_ms': {
+            'mean': round(sum(ordered) / len(ordered) * 1000, 4) if ordered else 0.0,
+            'p50': round(percentile(ordered, 50) * 1000, 4),
+            'p95': round(percentile(ordered, 95) * 1000, 4),
+            'p99': round(percentile(ordered, 99) * 1000, 4),
+            'max': round(ordered[-1] * 1000, 4) if ordered else 0.0,
+        },
+        'memory': measure_memory(func, min(count, memory_sample), seed),
+        'accuracy': {
+            'exact': round(correct / len(latencies), 4) if latencies else 0.0,
+            'within_one': round(within_one / len(latencies), 4) if latencies else 0.0,
+        },
+        'cache_hit_rate': round((cache.hits - hits) / lookups, 4) if lookups else 0.0,
+    }
+
+def measure_memory(func, count: int, seed: int) -> dict:
+    """Peak and retained Python heap while running func over count tickets."""
+    tickets = list(generate_corpus(count, seed))
+    prioritizer_integration.classification_cache.invalidate()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        for ticket in tickets:
+            func(ticket)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'sample': count,
+        'peak_kb': round((peak - baseline) / 1024, 1),
+        'retained_kb': round((current - baseline) / 1024, 1),
+    }
+
+def describe_corpus(count: int, seed: int) -> dict:
+    """Length distribution of the corpus (first 10k tickets for large runs)."""
+    lengths = sorted(len(t['text']) for t in generate_corpus(min(count, 10000), seed))
+    return {
+        'tickets': count,
+        'seed': seed,
+        'length_chars': {
+            'mean': round(sum(lengths) / len(lengths), 1) if lengths else 0.0,
+            'p50': percentile(lengths, 50),
+            'p95': percentile(lengths, 95),
+            'max': lengths[-1] if lengths else 0,
+        },
+    }
+
+def run_benchmark(count: int = 10000, seed: int = 42, targets: list = None,
+                  cold_cache: bool = False) -> dict:
+    """Benchmark the selected targets (all by default) and return the report."""
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cold_cache': cold_cache,
+        },
+        'corpus': describe_corpus(count, seed),
+        'results': {},
+    }
+    for name in targets or TARGETS:
+        report['results'][name] = benchmark_target(TARGETS[name], count, seed,
+                                                   cold_cache=cold_cache)
+    return report
+
+def compare_reports(baseline: dict, current: dict, tolerance: float = 0.10) -> list:
+    """
+    Compare two runs target by target.
+
+    Returns:
+        list: Regression messages where throughput dropped or p99 latency grew
+              by more than `tolerance` (a fraction)
+    """
+    regressions = []
+    for name, now in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before:
+            continue
+        if now['tickets_per_sec'] < before['tickets_per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {before['tickets_per_sec']} -> "
+                               f"{now['tickets_per_sec']} tickets/sec")
+        if now['latency_ms']['p99'] > before['latency_ms']['p99'] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {before['latency_ms']['p99']} -> "
+                               f"{now['latency_ms']['p99']} ms")
+        if now['accuracy']['exact'] < before['accuracy']['exact']:
+            regressions.append(f"{name}: accuracy {before['accuracy']['exact']} -> "
+                               f"{now['accuracy']['exact']}")
+    return regressions
+
+def print_report(report: dict) -> None:
+    corpus = report['corpus']
+    print(f"Corpus: {corpus['tickets']} tickets, seed {corpus['seed']}, "
+          f"mean length {corpus['length_chars']['mean']} chars")
+    print("=" * 60)
+    for name, r in report['results'].items():
+        lat = r['latency_ms']
+        print(f"\n{name}")
+        print(f"   Throughput: {r['tickets_per_sec']:,.0f} tickets/sec")
+        print(f"   Latency ms: p50 {lat['p50']}  p95 {lat['p95']}  p99 {lat['p99']}  max {lat['max']}")
+        print(f"   Memory: peak {r['memory']['peak_kb']} KB, retained {r['memory']['retained_kb']} KB "
+              f"over {r['memory']['sample']} tickets")
+        print(f"   Accuracy: {r['accuracy']['exact']:.1%} exact, {r['accuracy']['within_one']:.1%} within one")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the PrioritizerAgent hot path")
+    parser.add_argument("--tickets", type=int, default=10000, help="corpus size (1k-1M)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--target", action="append", choices=list(TARGETS),
+                        help="benchmark only this function (repeatable)")
+    parser.add_argument("--cold-cache", action="store_true",
+                        help="clear the classification cache before every call")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed throughput/p99 change before flagging (default 0.10)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.tickets, args.seed, args.target, args.cold_cache)
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare_reports(baseline, report, args.tolerance)
+        print(f"\nCompared with {args.compare}:")
+        for message in regressions:
+            print(f"   ✗ {message}")
+        if not regressions:
+            print("   ✓ No regressions")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
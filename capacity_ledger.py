@@ -0,0 +1,297 @@
+"""
+Capacity Ledger for UnityAid
+The one authority on how much of each resource is left, shared by every
+Streamlit session and agent in the process. Matching takes capacity in two
+steps: `reserve` holds units for a report, then `commit` makes the hold final
+once help is dispatched, or `release` hands it back. Holds that are neither
+committed nor released expire, so a session that goes away mid-match does
+not keep a shelter's cots forever.
+
+Each resource has its own lock, so writers on different resources never wait
+on each other, and the availability check and the decrement happen under it
+together: two matchers racing for the last cot get one reservation and one
+refusal. Every change is appended to an audit trail, in memory and
+optionally as JSON lines on disk.
+"""
+
+import heapq
+import itertools
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Audit actions tallied in CapacityLedger.stats
+COUNTED = {'reserve': 'reserved', 'commit': 'committed', 'release': 'released', 'expire': 'expired'}
+
+@dataclass
+class Reservation:
+    """Units of one resource held for a report."""
+    reservation_id: str
+    resource_id: str
+    units: int
+    holder: Optional[str]
+    expires_at: float
+    state: str = "held"  # held, committed, released or expired
+
+@dataclass
+class LedgerEntry:
+    """One change to a resource's capacity, with the amounts after it."""
+    seq: int
+    timestamp: float
+    action: str  # set, reserve, commit, release or expire
+    resource_id: str
+    units: int
+    available: int
+    held: int
+    reservation_id: Optional[str] = None
+    holder: Optional[str] = None
+
+@dataclass
+class _Account:
+    available: int
+    held: int = 0
+    version: int = 0
+    reservations: Dict[str, Reservation] = field(default_factory=dict)
+    expiries: list = field(default_factory=list)  # heap of (expires_at, reservation_id)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+class CapacityLedger:
+    """
+    Thread-safe per-resource capacity with reservations, expiry and an audit trail.
+    """
+
+    def __init__(self, hold_seconds: float = 300.0, audit_path: Optional[str] = None,
+                 audit_limit: int = 10000, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            hold_seconds: Default time a reservation is held before it expires
+            audit_path: JSON lines file the audit trail is appended to (None = memory only)
+            audit_limit: Audit entries kept in memory (the file keeps them all)
+            clock: Time source for expiry (monotonic seconds)
+        """
+        self.hold_seconds = hold_seconds
+        self.clock = clock
+        self._accounts: Dict[str, _Account] = {}
+        self._owners: Dict[str, str] = {}  # reservation id -> resource id
+        self._lock = threading.Lock()      # guards the two dicts above
+        self._audit = deque(maxlen=audit_limit)
+        self._audit_lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self._audit_file = None
+        if audit_path:
+            Path(audit_path).parent.mkdir(parents=True, exist_ok=True)
+            self._audit_file = open(audit_path, "a", encoding="utf-8")
+        self.stats = {'reserved': 0, 'committed': 0, 'released': 0, 'expired': 0, 'rejected': 0}
+
+    # ---- capacity ----------------------------------------------------------
+
+    def register(self, resource_id: str, capacity: int) -> int:
+        """
+        Start tracking a resource with the given capacity, unless it is
+        already tracked. Safe to call from every session that seeds it.
+
+        Returns:
+            The resource's available capacity
+        """
+        account = _Account(available=capacity)
+        with account.lock:  # published locked, so its "set" entry comes first
+            with self._lock:
+                existing = self._accounts.setdefault(resource_id, account)
+            if existing is account:
+                self._record("set", resource_id, account, capacity)
+        return self.available(resource_id)
+
+    def set_capacity(self, resource_id: str, capacity: int, expected: Optional[int] = None) -> bool:
+        """
+        Set the capacity available for new reservations (restocking, or a
+        correction); units already held are not affected.
+
+        Args:
+            expected: Only apply the change if the available capacity is
+                      still this (compare-and-set)
+
+        Returns:
+            bool: Whether the change was applied
+        """
+        with self._lock:
+            account = self._accounts.setdefault(resource_id, _Account(available=0))
+        with account.lock:
+            self._expire(resource_id, account)
+            if expected is not None and account.available != expected:
+                return False
+            change = capacity - account.available
+            account.available = capacity
+            self._record("set", resource_id, account, change)
+            return True
+
+    def available(self, resource_id: str) -> int:
+        """Capacity not held or committed (0 for an unknown resource)."""
+        account = self._accounts.get(resource_id)
+        if account is None:
+            return 0
+        with account.lock:
+            self._expire(resource_id, account)
+            return account.available
+
+    def snapshot(self, resource_ids: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        """
+        Resource id -> available, held and version (bumped on every change),
+        for every tracked resource or just the given ones. Overdue holds are
+        expired first.
+        """
+        with self._lock:
+            if resource_ids is None:
+                accounts = list(self._accounts.items())
+            else:
+                accounts = [(r, self._accounts[r]) for r in resource_ids if r in self._accounts]
+        snapshot = {}
+        for resource_id, account in accounts:
+            with account.lock:
+                self._expire(resource_id, account)
+                snapshot[resource_id] = {'available': account.available, 'held': account.held,
+                                         'version': account.version}
+        return snapshot
+
+    # ---- reservations ------------------------------------------------------
+
+    def reserve(self, resource_id: str, units: int = 1, holder: Optional[str] = None,
+                hold_seconds: Optional[float] = None) -> Optional[Reservation]:
+        """
+        Hold units of a resource.
+
+        Returns:
+            The reservation, or None if the resource does not have enough left
+        """
+        account = self._accounts.get(resource_id)
+        if account is None or units < 1:
+            return None
+        with account.lock:
+            self._expire(resource_id, account)
+            if account.available < units:
+                with self._audit_lock:
+                    self.stats['rejected'] += 1
+                return None
+            hold = self.hold_seconds if hold_seconds is None else hold_seconds
+            reservation = Reservation(uuid.uuid4().hex, resource_id, units, holder, self.clock() + hold)
+            account.available -= units
+            account.held += units
+            account.reservations[reservation.reservation_id] = reservation
+            heapq.heappush(account.expiries, (reservation.expires_at, reservation.reservation_id))
+            with self._lock:
+                self._owners[reservation.reservation_id] = resource_id
+            self._record("reserve", resource_id, account, -units, reservation)
+            return reservation
+
+    def reserve_first(self, resource_ids: Iterable[str], units: int = 1,
+                      holder: Optional[str] = None) -> Optional[Reservation]:
+        """Reserve the first resource in order (e.g. nearest first) that has room."""
+        for resource_id in resource_ids:
+            reservation = self.reserve(resource_id, units, holder)
+            if reservation is not None:
+                return reservation
+        return None
+
+    def commit(self, reservation_id: str) -> bool:
+        """
+        Make a held reservation final: the units are used up.
+
+        Returns:
+            bool: False if the reservation is unknown, expired or already settled
+        """
+        return self._settle(reservation_id, "commit")
+
+    def release(self, reservation_id: str) -> bool:
+        """
+        Give a held reservation's units back.
+
+        Returns:
+            bool: False if the reservation is unknown, expired or already settled
+        """
+        return self._settle(reservation_id, "release")
+
+    def expire(self) -> int:
+        """Return the units of every overdue reservation now; returns how many expired."""
+        with self._lock:
+            accounts = list(self._accounts.items())
+        expired = 0
+        for resource_id, account in accounts:
+            with account.lock:
+                expired += self._expire(resource_id, account)
+        return expired
+
+    def audit(self, resource_id: Optional[str] = None) -> List[LedgerEntry]:
+        """Audit entries still in memory, oldest first."""
+        with self._audit_lock:
+            entries = list(self._audit)
+        return [e for e in entries if resource_id is None or e.resource_id == resource_id]
+
+    def close(self) -> None:
+        with self._audit_lock:
+            if self._audit_file is not None:
+                self._audit_file.close()
+                self._audit_file = None
+
+    # ---- internals ---------------------------------------------------------
+
+    def _settle(self, reservation_id: str, action: str) -> bool:
+        resource_id = self._owners.get(reservation_id)
+        if resource_id is None:
+            return False
+        account = self._accounts[resource_id]
+        with account.lock:
+            self._expire(resource_id, account)
+            reservation = account.reservations.pop(reservation_id, None)
+            if reservation is None:
+                return False
+            account.held -= reservation.units
+            if action == "release":
+                account.available += reservation.units
+                reservation.state = "released"
+            else:
+                reservation.state = "committed"
+            with self._lock:
+                self._owners.pop(reservation_id, None)
+            self._record(action, resource_id, account,
+                         reservation.units if action == "release" else 0, reservation)
+            return True
+
+    def _expire(self, resource_id: str, account: _Account) -> int:
+        """Return overdue holds to the account; caller holds its lock."""
+        now = self.clock()
+        expired = 0
+        while account.expiries and account.expiries[0][0] <= now:
+            _, reservation_id = heapq.heappop(account.expiries)
+            reservation = account.reservations.pop(reservation_id, None)
+            if reservation is None:  # settled before it expired
+                continue
+            account.held -= reservation.units
+            account.available += reservation.units
+            reservation.state = "expired"
+            with self._lock:
+                self._owners.pop(reservation_id, None)
+            self._record("expire", resource_id, account, reservation.units, reservation)
+            expired += 1
+        return expired
+
+    def _record(self, action: str, resource_id: str, account: _Account, units: int,
+                reservation: Optional[Reservation] = None) -> None:
+        """Append an audit entry; caller holds the account's lock, so entries keep its order."""
+        account.version += 1
+        with self._audit_lock:
+            entry = LedgerEntry(
+                seq=next(self._seq), timestamp=time.time(), action=action, resource_id=resource_id,
+                units=units, available=account.available, held=account.held,
+                reservation_id=reservation.reservation_id if reservation else None,
+                holder=reservation.holder if reservation else None,
+            )
+            self._audit.append(entry)
+            if action in COUNTED:
+                self.stats[COUNTED[action]] += 1
+            if self._audit_file is not None:
+                self._audit_file.write(json.dumps(asdict(entry)) + "\n")
+                self._audit_file.flush()
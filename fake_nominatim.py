@@ -0,0 +1,132 @@
+"""
+Local Nominatim Stand-in for UnityAid
+A tiny HTTP server answering Nominatim's /search and /reverse requests from a
+fixed table of places, with configurable latency and failures, so geocoding
+can be tested and benchmarked offline without touching the public server.
+
+Usage:
+    with FakeNominatim({"Aventura Mall": (25.9565, -80.1429)}) as server:
+        backend = NominatimBackend(server.url)
+"""
+
+import json
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+from geocode_cache import normalize_address
+
+class FakeNominatim:
+    """
+    Serves /search?q=... and /reverse?lat=...&lon=... on 127.0.0.1 from a dict of places.
+
+    Places are keyed by query (matched after normalize_address) and map to
+    (latitude, longitude) or (latitude, longitude, display_name). Unknown
+    queries return an empty list, like Nominatim; reverse lookups answer with
+    the nearest place and are logged in `queries` as "reverse:lat,lon".
+    """
+
+    def __init__(self, places: Dict[str, Tuple] = None, latency: float = 0.0, port: int = 0,
+                 error_rate: float = 0.0, seed: int = None):
+        """
+        Args:
+            places: Query -> coordinates (and optional display name)
+            latency: Seconds to wait before answering each request
+            port: Port to listen on (0 picks a free one)
+            error_rate: Fraction of requests answered with 503 Service Unavailable
+            seed: Seed for choosing which requests fail
+        """
+        self.places = {normalize_address(query): place for query, place in (places or {}).items()}
+        self.latency = latency
+        self.status = 200  # set to e.g. 429 or 503 to simulate an overloaded server
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self.queries: List[str] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeNominatim":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,),
+                                            name="fake-nominatim", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeNominatim":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def search(self, query: str) -> list:
+        """The JSON body /search returns for a query."""
+        place = self.places.get(normalize_address(query))
+        if place is None:
+            return []
+        latitude, longitude = place[0], place[1]
+        name = place[2] if len(place) > 2 else query
+        return [{'lat': str(latitude), 'lon': str(longitude), 'display_name': name}]
+
+    def reverse(self, latitude: float, longitude: float) -> dict:
+        """The JSON body /reverse returns: the nearest known place."""
+        if not self.places:
+            return {'error': "Unable to geocode"}
+        query, place = min(self.places.items(),
+                           key=lambda item: (item[1][0] - latitude) ** 2 + (item[1][1] - longitude) ** 2)
+        name = place[2] if len(place) > 2 else query
+        return {'lat': str(place[0]), 'lon': str(place[1]), 'display_name': name}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urllib.parse.urlparse(self.path)
+                params = urllib.parse.parse_qs(url.query)
+                query = params.get('q', [""])[0]
+                if url.path == "/reverse":
+                    query = f"reverse:{params.get('lat', [''])[0]},{params.get('lon', [''])[0]}"
+                with fake._lock:
+                    fake.queries.append(query)
+                if fake.latency:
+                    time.sleep(fake.latency)
+
+                if url.path not in ("/search", "/reverse"):
+                    self.send_error(404)
+                    return
+                with fake._lock:
+                    failed = fake.error_rate and fake._random.random() < fake.error_rate
+                if fake.status != 200 or failed:
+                    self.send_error(fake.status if fake.status != 200 else 503)
+                    return
+                if url.path == "/reverse":
+                    answer = fake.reverse(float(params['lat'][0]), float(params['lon'][0]))
+                else:
+                    answer = fake.search(query)
+                body = json.dumps(answer).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # keep test output quiet
+
+        return Handler
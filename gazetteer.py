@@ -0,0 +1,218 @@
+"""
+Offline Gazetteer for UnityAid
+In-memory index of Miami-Dade landmarks, neighborhoods and major streets so
+place names resolve to coordinates instantly and without connectivity, which
+is often degraded during a disaster.
+"""
+
+import difflib
+import json
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                      "data", "miami_dade_gazetteer.json")
+
+# Base confidence by how precisely an entry pins down a location
+KIND_CONFIDENCE = {
+    'landmark': 0.85,
+    'street': 0.65,
+    'neighborhood': 0.6,
+    'city': 0.5,
+}
+
+# Expand common abbreviations so "Biscayne Blvd" and "Biscayne Boulevard" agree
+ABBREVIATIONS = {
+    'st': 'street', 'ave': 'avenue', 'av': 'avenue', 'blvd': 'boulevard', 'rd': 'road',
+    'dr': 'drive', 'hwy': 'highway', 'ln': 'lane', 'pl': 'place', 'pkwy': 'parkway',
+    'ct': 'court', 'ctr': 'center', 'centre': 'center', 'intl': 'international',
+    'mt': 'mount', 'univ': 'university', 'hosp': 'hospital',
+    'n': 'north', 's': 'south', 'e': 'east', 'w': 'west',
+}
+KM_PER_DEGREE = 111.195  # of latitude, on a 6371 km sphere
+
+STOPWORDS = {'the', 'a', 'an'}
+DIRECTIONS = {'north', 'south', 'east', 'west', 'ne', 'nw', 'se', 'sw'}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_END = ""  # trie key marking the end of a name
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, drop apostrophes and punctuation, expand abbreviations."""
+    tokens = _TOKEN.findall((text or "").lower().replace("'", ""))
+    return [ABBREVIATIONS.get(t, t) for t in tokens if t not in STOPWORDS]
+
+@dataclass
+class GazetteerEntry:
+    """A named place with representative coordinates."""
+    name: str
+    kind: str
+    latitude: float
+    longitude: float
+    aliases: List[str] = field(default_factory=list)
+
+@dataclass
+class GazetteerMatch:
+    """A place resolved from text."""
+    entry: GazetteerEntry
+    confidence: float
+    method: str  # gazetteer_exact, gazetteer_token or gazetteer_fuzzy
+    matched_text: str
+    span: int = 0  # number of tokens matched
+
+class Gazetteer:
+    """
+    Place-name index with three lookups, tried in order:
+
+    1. Phrase trie over name and alias tokens: finds every place mentioned in
+       free text in one pass over its tokens.
+    2. Token index: partial names ("Jackson Memorial") scored by the share of
+       the place's distinctive tokens they cover.
+    3. Fuzzy matching: unknown tokens are mapped to close vocabulary tokens
+       ("Avenura" -> "aventura") and the trie scan is repeated.
+    """
+
+    def __init__(self, entries: List[GazetteerEntry]):
+        self.entries = list(entries)
+        self._trie = {}
+        self._token_index: Dict[str, set] = {}
+        self._name_tokens = []  # (entry index, tokens) per name and alias
+        for index, entry in enumerate(self.entries):
+            for name in [entry.name] + list(entry.aliases):
+                tokens = tokenize(name)
+                if not tokens:
+                    continue
+                node = self._trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node.setdefault(_END, []).append(index)
+                self._name_tokens.append((index, tokens))
+                for token in tokens:
+                    self._token_index.setdefault(token, set()).add(len(self._name_tokens) - 1)
+
+        # Rarer tokens say more about which place is meant
+        names = len(self._name_tokens) or 1
+        self._weight = {t: 1.0 + names / len(ids) for t, ids in self._token_index.items()}
+        self._vocabulary = sorted(self._token_index)
+        self._corrections: Dict[str, Optional[str]] = {}
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_GAZETTEER_PATH) -> "Gazetteer":
+        """Load a gazetteer JSON file ({"entries": [{name, kind, lat, lon, aliases}]})."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls([
+            GazetteerEntry(
+                name=item['name'],
+                kind=item.get('kind', 'landmark'),
+                latitude=item['lat'],
+                longitude=item['lon'],
+                aliases=item.get('aliases', [])
+            )
+            for item in data['entries']
+        ])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def find_mentions(self, text: str, fuzzy: bool = False) -> List[GazetteerMatch]:
+        """Every place name (or alias) appearing in text, via the phrase trie."""
+        tokens = tokenize(text)
+        if fuzzy:
+            tokens = [self._correct(t) for t in tokens]
+
+        matches = []
+        for start in range(len(tokens)):
+            node = self._trie
+            end = start
+            while end < len(tokens) and tokens[end] in node:
+                node = node[tokens[end]]
+                end += 1
+                for index in node.get(_END, ()):
+                    entry = self.entries[index]
+                    confidence = KIND_CONFIDENCE.get(entry.kind, 0.5)
+                    matches.append(GazetteerMatch(
+                        entry=entry,
+                        confidence=round(confidence * (0.85 if fuzzy else 1.0), 3),
+                        method="gazetteer_fuzzy" if fuzzy else "gazetteer_exact",
+                        matched_text=" ".join(tokens[start:end]),
+                        span=end - start
+                    ))
+        return matches
+
+    def lookup_tokens(self, text: str, min_coverage: float = 0.6) -> List[GazetteerMatch]:
+        """Places whose distinctive tokens are mostly present in text."""
+        tokens = set(tokenize(text))
+        candidates = set()
+        for token in tokens:
+            candidates.update(self._token_index.get(token, ()))
+
+        best = {}
+        for name_id in candidates:
+            index, name_tokens = self._name_tokens[name_id]
+            total = sum(self._weight[t] for t in name_tokens)
+            present = [t for t in name_tokens if t in tokens]
+            # "NW 8th Street" is not "SW 8th Street": street numbers and directions must all match
+            if any(t not in tokens for t in name_tokens if t in DIRECTIONS or t[0].isdigit()):
+                continue
+            coverage = sum(self._weight[t] for t in present) / total
+            if coverage < min_coverage:
+                continue
+            entry = self.entries[index]
+            confidence = round(KIND_CONFIDENCE.get(entry.kind, 0.5) * coverage * 0.9, 3)
+            if index not in best or confidence > best[index].confidence:
+                best[index] = GazetteerMatch(entry, confidence, "gazetteer_token",
+                                             " ".join(present), len(present))
+        return list(best.values())
+
+    def resolve(self, text: str) -> Optional[GazetteerMatch]:
+        """
+        The most specific place mentioned in text, or None.
+
+        Exact phrase matches win over partial token matches, which win over
+        fuzzy matches. Among them, landmarks beat streets beat areas, and
+        longer names beat the shorter names they contain.
+        """
+        if not text or not text.strip():
+            return None
+        for lookup in (self.find_mentions, self.lookup_tokens,
+                       lambda t: self.find_mentions(t, fuzzy=True)):
+            matches = lookup(text)
+            if matches:
+                return max(matches, key=lambda m: (m.confidence, m.span))
+        return None
+
+    def nearest(self, latitude: float, longitude: float, kinds=None) -> Optional[Tuple[GazetteerEntry, float]]:
+        """The entry closest to a point (optionally only of the given kinds) and its distance in km."""
+        scale = math.cos(math.radians(latitude))
+        best, best_distance = None, None
+        for entry in self.entries:
+            if kinds and entry.kind not in kinds:
+                continue
+            distance = math.hypot(entry.latitude - latitude, (entry.longitude - longitude) * scale)
+            if best_distance is None or distance < best_distance:
+                best, best_distance = entry, distance
+        if best is None:
+            return None
+        return best, best_distance * KM_PER_DEGREE
+
+    def _correct(self, token: str) -> str:
+        """Closest vocabulary token for a misspelled word (memoized)."""
+        if token in self._token_index or len(token) < 5 or token.isdigit():
+            return token
+        if token not in self._corrections:
+            close = difflib.get_close_matches(token, self._vocabulary, n=1, cutoff=0.8)
+            self._corrections[token] = close[0] if close else None
+        return self._corrections[token] or token
+
+_default_gazetteer = None
+
+def load_default_gazetteer() -> Gazetteer:
+    """The bundled Miami-Dade gazetteer (or GAZETTEER_PATH), loaded once."""
+    global _default_gazetteer
+    if _default_gazetteer is None:
+        _default_gazetteer = Gazetteer.from_file(os.environ.get("GAZETTEER_PATH") or DEFAULT_GAZETTEER_PATH)
+    return _default_gazetteer
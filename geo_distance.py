@@ -0,0 +1,118 @@
+"""
+Vectorized Distances and Bulk Resource Matching for UnityAid
+Haversine distances between many reports and many resources computed as
+NumPy matrices, in row chunks so memory stays bounded however large the
+batch, and a bulk matcher built on them that assigns a whole batch of
+reports at once instead of a Python loop over every report/resource pair.
+"""
+
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# Distance matrix cells per chunk (8 bytes each: about 32 MB)
+DEFAULT_CHUNK_CELLS = 4_000_000
+
+def haversine_matrix(lats1, lons1, lats2, lons2) -> np.ndarray:
+    """Great-circle distances in km, shape (len(lats1), len(lats2))."""
+    phi1 = np.radians(np.asarray(lats1, dtype=float))[:, None]
+    phi2 = np.radians(np.asarray(lats2, dtype=float))[None, :]
+    dphi = phi2 - phi1
+    dlam = np.radians(np.asarray(lons2, dtype=float))[None, :] - np.radians(np.asarray(lons1, dtype=float))[:, None]
+    h = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlam / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+def distance_chunks(lats1, lons1, lats2, lons2,
+                    max_cells: int = DEFAULT_CHUNK_CELLS) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Yield (first_row, block) pieces of the distance matrix, each block
+    covering consecutive rows and at most `max_cells` cells.
+    """
+    lats1, lons1 = np.asarray(lats1, dtype=float), np.asarray(lons1, dtype=float)
+    columns = max(len(lats2), 1)
+    rows = max(1, max_cells // columns)
+    for start in range(0, len(lats1), rows):
+        yield start, haversine_matrix(lats1[start:start + rows], lons1[start:start + rows], lats2, lons2)
+
+def unit_vectors(lats, lons) -> np.ndarray:
+    """Points on the unit sphere, shape (n, 3)."""
+    phi = np.radians(np.asarray(lats, dtype=float))
+    lam = np.radians(np.asarray(lons, dtype=float))
+    return np.column_stack((np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi)))
+
+def nearest_indices(lats1, lons1, lats2, lons2,
+                    max_cells: int = DEFAULT_CHUNK_CELLS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For each point of the first set, the index of the nearest point of the
+    second set and its haversine distance in km.
+
+    Candidates are ranked by the dot product of unit vectors, which falls as
+    great-circle distance grows, so each chunk is one matrix multiply; only
+    the chosen pairs get the full haversine.
+
+    Returns:
+        (indices, distances): index -1 and distance inf if the second set is empty
+    """
+    count = len(lats1)
+    indices = np.full(count, -1, dtype=np.int64)
+    distances = np.full(count, np.inf)
+    if count == 0 or len(lats2) == 0:
+        return indices, distances
+    points, targets = unit_vectors(lats1, lons1), unit_vectors(lats2, lons2)
+    rows = max(1, max_cells // len(targets))
+    for start in range(0, count, rows):
+        similarity = points[start:start + rows] @ targets.T
+        indices[start:start + rows] = np.argmax(similarity, axis=1)  # first among ties, like min()
+
+    lats2, lons2 = np.asarray(lats2, dtype=float), np.asarray(lons2, dtype=float)
+    distances[:] = _haversine_pairs(np.asarray(lats1, dtype=float), np.asarray(lons1, dtype=float),
+                                    lats2[indices], lons2[indices])
+    return indices, distances
+
+def _haversine_pairs(lats1, lons1, lats2, lons2) -> np.ndarray:
+    """Element-wise great-circle distances in km."""
+    phi1, phi2 = np.radians(lats1), np.radians(lats2)
+    h = np.sin((phi2 - phi1) / 2) ** 2 + \
+        np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lons2 - lons1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+def match_resources_bulk(reports: Sequence, resources: Sequence,
+                         get: Callable = getattr,
+                         max_cells: int = DEFAULT_CHUNK_CELLS) -> List[Optional[object]]:
+    """
+    Match every report to its nearest open resource, as match_resource does
+    one at a time: a resource of the report's category (any category for
+    "other"), or failing that the nearest open resource of any kind.
+
+    Reports need lat, lon and category; resources need lat, lon, type and
+    capacity. Pass get=dict.get to match API dicts instead of objects.
+
+    Returns:
+        The matched resource (or None) for each report, in order
+    """
+    reports = list(reports)
+    open_resources = [r for r in resources if (get(r, "capacity") or 0) > 0]
+    matches: List[Optional[object]] = [None] * len(reports)
+    if not reports or not open_resources:
+        return matches
+
+    by_type = {}
+    for resource in open_resources:
+        by_type.setdefault(get(resource, "type"), []).append(resource)
+    by_category = {}
+    for i, report in enumerate(reports):
+        category = get(report, "category") or "other"
+        # No open resource of the category: any open resource will do
+        by_category.setdefault(category if category in by_type else "other", []).append(i)
+
+    for category, rows in by_category.items():
+        candidates = open_resources if category == "other" else by_type[category]
+        indices, _ = nearest_indices([get(reports[i], "lat") for i in rows],
+                                     [get(reports[i], "lon") for i in rows],
+                                     [get(r, "lat") for r in candidates],
+                                     [get(r, "lon") for r in candidates], max_cells)
+        for i, index in zip(rows, indices):
+            matches[i] = candidates[index]
+    return matches
@@ -0,0 +1,165 @@
+"""
+Persistent Geocode Cache for UnityAid
+SQLite-backed cache of geocoding results with an in-memory LRU in front.
+Landmarks such as "Jackson Memorial Hospital" are geocoded hundreds of times
+during an incident; caching them keeps repeat lookups in microseconds and
+the app within Nominatim's usage limits.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple, Dict
+
+# Returned by GeocodeCache.get when nothing (not even a negative result) is cached
+MISS = object()
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_address(address: str) -> str:
+    """Normalize an address for cache keys (case, spacing and edge punctuation)."""
+    return _WHITESPACE.sub(" ", (address or "").lower()).strip(" .,;:!?")
+
+class GeocodeCache:
+    """
+    Two-tier geocode cache: an in-memory LRU over a SQLite table.
+
+    Entries are keyed on the normalized address plus the context suffix used
+    for the query, so lookups with and without ", Miami-Dade County, ..." are
+    cached separately. Addresses the geocoder could not resolve are cached as
+    negative results with a shorter TTL.
+    """
+
+    def __init__(self, path: str = "geocode_cache.sqlite3", ttl: float = 30 * 86400,
+                 negative_ttl: float = 86400, memory_size: int = 2048):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a process-local cache)
+            ttl: Seconds a found location stays valid
+            negative_ttl: Seconds a "not found" result stays valid
+            memory_size: Entries kept in the in-memory LRU
+        """
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memory_size = memory_size
+        self._memory = OrderedDict()  # key -> (result, expires_at)
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        directory = os.path.dirname(path)
+        if directory and path != ":memory:":
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS geocodes ("
+            " key TEXT PRIMARY KEY, latitude REAL, longitude REAL, address TEXT,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(address: str, context: str = "") -> str:
+        return f"{normalize_address(address)}|{normalize_address(context)}"
+
+    def get(self, address: str, context: str = ""):
+        """
+        Look up a cached geocode.
+
+        Returns:
+            (latitude, longitude, resolved_address) for a cached location,
+            None for a cached "not found", or MISS if nothing valid is cached
+        """
+        key = self.make_key(address, context)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._count_negative(entry[0])
+
+            row = self._db.execute(
+                "SELECT latitude, longitude, address, expires_at FROM geocodes WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[3] <= now:
+                self.misses += 1
+                return MISS
+
+            result = (row[0], row[1], row[2]) if row[0] is not None else None
+            self._remember(key, result, row[3])
+            self.disk_hits += 1
+            return self._count_negative(result)
+
+    def set(self, address: str, context: str, result: Optional[Tuple[float, float, str]]) -> None:
+        """Cache a geocode result, or None to record that the address was not found."""
+        key = self.make_key(address, context)
+        expires_at = time.time() + (self.ttl if result is not None else self.negative_ttl)
+        latitude, longitude, resolved = result if result is not None else (None, None, None)
+        with self._lock:
+            self._remember(key, result, expires_at)
+            self._db.execute(
+                "INSERT OR REPLACE INTO geocodes (key, latitude, longitude, address, expires_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, latitude, longitude, resolved, expires_at)
+            )
+            self._db.commit()
+            self.writes += 1
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from disk and memory; returns the number of rows removed."""
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (_, expires_at) in self._memory.items() if expires_at <= now]:
+                del self._memory[key]
+            removed = self._db.execute("DELETE FROM geocodes WHERE expires_at <= ?", (now,)).rowcount
+            self._db.commit()
+            return removed
+
+    def clear(self) -> None:
+        """Drop every cached geocode."""
+        with self._lock:
+            self._memory.clear()
+            self._db.execute("DELETE FROM geocodes")
+            self._db.commit()
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and sizes."""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                'memory_size': len(self._memory),
+                'disk_size': self._db.execute("SELECT COUNT(*) FROM geocodes").fetchone()[0],
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'hit_rate': hits / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _remember(self, key: str, result, expires_at: float) -> None:
+        """Put an entry in the memory LRU (caller holds the lock)."""
+        self._memory[key] = (result, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _count_negative(self, result):
+        if result is None:
+            self.negative_hits += 1
+        return result
@@ -0,0 +1,217 @@
+"""
+Geocoder Provider Chain for UnityAid
+Remote geocoders tried in order, each with its own timeout and a circuit
+breaker. After repeated failures a provider is skipped until a cool-down has
+passed, so when Nominatim is down every ticket does not wait out its timeout:
+lookups fail fast, and the offline stages (cache, gazetteer, grid resolver)
+answer what they can.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from geocoding_service import GeocoderBackend, GeocoderUnavailable, NominatimBackend
+
+class CircuitOpenError(GeocoderUnavailable):
+    """Raised when a provider's circuit breaker is open."""
+
+class CircuitBreaker:
+    """
+    Closed: calls pass. After `failure_threshold` consecutive failures the
+    breaker opens and calls are refused; `reset_timeout` seconds later one
+    trial call is let through (half-open), which closes the breaker on
+    success or reopens it on failure.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go through now (claims the trial call when half-open)."""
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def available(self) -> bool:
+        """Whether a call would be allowed, without claiming anything."""
+        with self._lock:
+            state = self._state()
+            return state == "closed" or (state == "half_open" and not self._trial_running)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def release(self) -> None:
+        """Give back a trial call that was abandoned without an outcome."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+            self._trial_running = False
+
+class RemoteProvider:
+    """A network geocoder backend guarded by a timeout and a circuit breaker."""
+
+    def __init__(self, name: str, backend, timeout: float = 4.0, breaker: Optional[CircuitBreaker] = None):
+        """
+        Args:
+            name: Label for logs and stats
+            backend: Object with an async `geocode(query)` (and optionally `reverse`)
+            timeout: Seconds before one call to this provider counts as failed
+            breaker: Circuit breaker (default: opens after 3 failures for 60 s)
+        """
+        self.name = name
+        self.backend = backend
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.calls = 0
+        self.failures = 0
+
+    @property
+    def supports_reverse(self) -> bool:
+        return hasattr(self.backend, "reverse")
+
+    async def geocode(self, query: str) -> Optional[Tuple[float, float, str]]:
+        return await self._call(lambda: self.backend.geocode(query))
+
+    async def reverse(self, latitude: float, longitude: float) -> Optional[Tuple[float, float, str]]:
+        return await self._call(lambda: self.backend.reverse(latitude, longitude))
+
+    async def _call(self, request):
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+        self.calls += 1
+        try:
+            result = await asyncio.wait_for(request(), self.timeout)
+        except asyncio.TimeoutError:
+            self._failed()
+            raise TimeoutError(f"{self.name} timed out after {self.timeout}s")
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception:
+            self._failed()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _failed(self) -> None:
+        self.failures += 1
+        was_open = self.breaker.state != "closed"
+        self.breaker.record_failure()
+        if not was_open and self.breaker.state == "open":
+            print(f"Geocoder {self.name} failed {self.breaker.failures} times; "
+                  f"skipping it for {self.breaker.reset_timeout:.0f}s")
+
+class ProviderChain:
+    """
+    Geocoding backend that asks remote providers in order.
+
+    The first provider to find the address answers; one that finds nothing
+    passes the query on. Providers that fail or whose breaker is open are
+    skipped. If no provider could be asked successfully, the last error is
+    raised, so the failure is not cached as "not found".
+    """
+
+    def __init__(self, providers: Sequence[RemoteProvider]):
+        self.providers: List[RemoteProvider] = list(providers)
+
+    @property
+    def supports_reverse(self) -> bool:
+        return any(provider.supports_reverse for provider in self.providers)
+
+    def available(self) -> bool:
+        """Whether any provider would accept a call now."""
+        return any(provider.breaker.available() for provider in self.providers)
+
+    async def geocode(self, query: str) -> Optional[Tuple[float, float, str]]:
+        return await self._first_answer(self.providers, lambda p: p.geocode(query))
+
+    async def reverse(self, latitude: float, longitude: float) -> Optional[Tuple[float, float, str]]:
+        providers = [p for p in self.providers if p.supports_reverse]
+        return await self._first_answer(providers, lambda p: p.reverse(latitude, longitude))
+
+    async def _first_answer(self, providers, request):
+        error, answered = None, False
+        for provider in providers:
+            try:
+                result = await request(provider)
+            except Exception as e:
+                error = e
+                continue
+            answered = True
+            if result is not None:
+                return result
+        if not answered:
+            raise error or GeocoderUnavailable("no geocoding provider configured")
+        return None
+
+    def status(self) -> List[dict]:
+        """Per-provider breaker state and counters."""
+        return [{
+            'name': provider.name,
+            'state': provider.breaker.state,
+            'calls': provider.calls,
+            'failures': provider.failures,
+        } for provider in self.providers]
+
+def providers_from_env(geocoder=None) -> List[RemoteProvider]:
+    """
+    Remote providers configured by GEOCODE_PROVIDERS: a comma-separated list
+    of "nominatim" (the geopy client passed in as `geocoder`) and URLs of
+    other Nominatim-compatible servers, e.g. a self-hosted instance. Without
+    the setting, the geopy client is the only provider.
+    """
+    timeout = float(os.environ.get("GEOCODE_PROVIDER_TIMEOUT", 4.0))
+    failures = int(os.environ.get("GEOCODE_BREAKER_FAILURES", 3))
+    reset = float(os.environ.get("GEOCODE_BREAKER_RESET", 60.0))
+
+    providers = []
+    for name in (os.environ.get("GEOCODE_PROVIDERS") or "nominatim").split(","):
+        name = name.strip()
+        if name == "nominatim":
+            if geocoder is None:
+                continue
+            backend = GeocoderBackend(geocoder)
+        elif name.startswith(("http://", "https://")):
+            backend = NominatimBackend(name, timeout=timeout)
+        else:
+            if name:
+                print(f"Warning: unknown geocoding provider {name!r} ignored")
+            continue
+        providers.append(RemoteProvider(name, backend, timeout, CircuitBreaker(failures, reset)))
+    return providers
@@ -0,0 +1,352 @@
+"""
+Asynchronous Geocoding Service for UnityAid
+Runs geocoding requests on a background asyncio loop behind a token-bucket
+rate limiter and a bounded queue, so the Streamlit script never blocks on
+Nominatim longer than its latency budget and the app stays within
+Nominatim's usage policy (one request per second). Concurrent requests for
+the same address share a single network call.
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import threading
+import time
+import urllib.parse
+import urllib.request
+from typing import Dict, Optional, Sequence, Tuple
+
+from geocode_cache import MISS, GeocodeCache
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org"
+USER_AGENT = "UnityAid-DisasterResponse/1.0"
+
+# Cache context for reverse lookups, keeping them apart from forward ones
+REVERSE_CONTEXT = "reverse"
+
+class GeocodeQueueFull(RuntimeError):
+    """Raised (through the future) when too many lookups are already waiting."""
+
+class GeocoderUnavailable(RuntimeError):
+    """Raised (through the future) when the backend cannot take lookups right now."""
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, in bursts of up to `burst`."""
+
+    def __init__(self, rate: float = 1.0, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+class NominatimBackend:
+    """Queries a Nominatim /search endpoint over HTTP (the public server or a local one)."""
+
+    def __init__(self, url: str = NOMINATIM_URL, user_agent: str = USER_AGENT, timeout: float = 10.0):
+        self.url = url.rstrip("/")
+        self.user_agent = user_agent
+        self.timeout = timeout
+
+    async def geocode(self, query: str) -> Optional[Tuple[float, float, str]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._search, query)
+
+    def _search(self, query: str) -> Optional[Tuple[float, float, str]]:
+        params = urllib.parse.urlencode({'q': query, 'format': 'json', 'limit': 1})
+        request = urllib.request.Request(f"{self.url}/search?{params}",
+                                         headers={'User-Agent': self.user_agent})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            places = json.loads(response.read().decode("utf-8"))
+        if not places:
+            return None
+        return float(places[0]['lat']), float(places[0]['lon']), places[0].get('display_name', query)
+
+    async def reverse(self, latitude: float, longitude: float) -> Optional[Tuple[float, float, str]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._reverse, latitude, longitude)
+
+    def _reverse(self, latitude: float, longitude: float) -> Optional[Tuple[float, float, str]]:
+        params = urllib.parse.urlencode({'lat': latitude, 'lon': longitude, 'format': 'json'})
+        request = urllib.request.Request(f"{self.url}/reverse?{params}",
+                                         headers={'User-Agent': self.user_agent})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            place = json.loads(response.read().decode("utf-8"))
+        if not place or 'error' in place:
+            return None
+        return float(place['lat']), float(place['lon']), place['display_name']
+
+class GeocoderBackend:
+    """Adapts a synchronous geopy-style geocoder (`geocode(query)`) to the service."""
+
+    def __init__(self, geocoder):
+        self.geocoder = geocoder
+
+    async def geocode(self, query: str) -> Optional[Tuple[float, float, str]]:
+        loop = asyncio.get_running_loop()
+        location = await loop.run_in_executor(None, self.geocoder.geocode, query)
+        return (location.latitude, location.longitude, location.address) if location else None
+
+    async def reverse(self, latitude: float, longitude: float) -> Optional[Tuple[float, float, str]]:
+        loop = asyncio.get_running_loop()
+        location = await loop.run_in_executor(None, self.geocoder.reverse, (latitude, longitude))
+        return (location.latitude, location.longitude, location.address) if location else None
+
+class GeocodingService:
+    """
+    Rate-limited, coalescing geocoder running on its own event loop.
+
+    `submit` is thread-safe and returns a concurrent.futures.Future resolving
+    to (latitude, longitude, address) or None. Cached answers resolve
+    immediately; a lookup already in flight for the same normalized address
+    and context is shared; anything else waits in a bounded queue for one of
+    `concurrency` workers, which take a token from the bucket before each
+    network call. Results (including "not found") go to the cache; errors and
+    timeouts are raised through the future and not cached.
+    """
+
+    def __init__(self, backend=None, cache: Optional[GeocodeCache] = None, rate: float = 1.0,
+                 burst: int = 1, max_queue: int = 64, concurrency: int = 2, timeout: float = 10.0):
+        """
+        Args:
+            backend: Object with an async `geocode(query)` (and optionally
+                     `reverse(latitude, longitude)`, and `available()` to
+                     refuse lookups while it is down); None answers only
+                     from the cache
+            cache: Geocode cache consulted before, and filled after, each lookup
+            rate: Network requests per second
+            burst: Requests allowed back to back before the rate applies
+            max_queue: Lookups allowed to wait for a worker before new ones are rejected
+            concurrency: Network requests allowed in flight at once
+            timeout: Seconds before a network request is abandoned
+        """
+        self.backend = backend
+        self.cache = cache
+        self.max_queue = max_queue
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate, burst)
+        self.stats = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'network_calls': 0,
+                      'rejected': 0, 'unavailable': 0, 'errors': 0, 'timeouts': 0}
+        self._in_flight: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._loop = None
+        self._queue = None
+        self._workers = []
+
+    def submit(self, address: str, context: str = "") -> concurrent.futures.Future:
+        """
+        Geocode `address, context` (or just address without a context).
+
+        Returns:
+            Future: Resolves to (latitude, longitude, resolved_address) or None
+        """
+        query = f"{address}, {context}" if context else address
+        return self._submit(address, context, lambda: self.backend.geocode(query))
+
+    def submit_reverse(self, latitude: float, longitude: float, cell: Optional[str] = None) -> concurrent.futures.Future:
+        """
+        Reverse geocode a point, sharing the rate limit and cache with forward lookups.
+
+        Args:
+            cell: Cache key for the point (e.g. a geohash); defaults to the
+                  coordinates rounded to about a metre
+
+        Returns:
+            Future: Resolves to (latitude, longitude, address) of the nearest
+            place the backend knows, or None
+        """
+        cell = cell or f"{latitude:.5f},{longitude:.5f}"
+        if not getattr(self.backend, "supports_reverse", hasattr(self.backend, "reverse")):
+            return self._submit(cell, REVERSE_CONTEXT, None)
+        return self._submit(cell, REVERSE_CONTEXT, lambda: self.backend.reverse(latitude, longitude))
+
+    def _submit(self, address: str, context: str, lookup) -> concurrent.futures.Future:
+        """Answer from the cache, join a lookup in flight, or queue `lookup()` (None: cache only)."""
+        with self._lock:
+            self.stats['requests'] += 1
+        if self.cache is not None:
+            cached = self.cache.get(address, context)
+            if cached is not MISS:
+                with self._lock:
+                    self.stats['cache_hits'] += 1
+                return _resolved(cached)
+        if self.backend is None or lookup is None:
+            return _resolved(None)
+        # A backend that is known to be down fails at once instead of queueing
+        available = getattr(self.backend, "available", None)
+        if available is not None and not available():
+            with self._lock:
+                self.stats['unavailable'] += 1
+            future = concurrent.futures.Future()
+            future.set_exception(GeocoderUnavailable("no geocoder is accepting lookups"))
+            return future
+
+        key = GeocodeCache.make_key(address, context)
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.stats['coalesced'] += 1
+                return future
+            future = concurrent.futures.Future()
+            self._in_flight[key] = future
+        loop = self._ensure_loop()
+        loop.call_soon_threadsafe(self._enqueue, key, address, context, future, lookup)
+        return future
+
+    def resolve(self, address: str, contexts: Sequence[str] = ("",), budget: float = 5.0,
+                fallback_after: Optional[float] = None) -> Tuple[Optional[Tuple[float, float, str]], Optional[str]]:
+        """
+        Geocode an address with each context in order of preference, all
+        within one latency budget.
+
+        The next context is queried as soon as the previous ones came back
+        empty, or alongside them if they have not answered after
+        `fallback_after` seconds (default: half the budget). Lookups still
+        running when the budget runs out keep going and fill the cache.
+
+        Returns:
+            (result, context) for the most preferred context that found the
+            address, or (None, None)
+        """
+        deadline = time.monotonic() + budget
+        step = budget / 2 if fallback_after is None else fallback_after
+        futures = [self.submit(address, contexts[0])]
+        next_submit = time.monotonic() + step
+        while True:
+            for context, future in zip(contexts, futures):
+                if not future.done():
+                    break
+                result = _result(future)
+                if result is not None:
+                    return result, context
+            else:
+                if len(futures) == len(contexts):
+                    return None, None
+                # Everything asked so far came back empty: try the next context now
+                next_submit = time.monotonic()
+
+            now = time.monotonic()
+            if now >= deadline:
+                # Out of time: settle for a less preferred answer if one arrived
+                for context, future in zip(contexts, futures):
+                    if future.done() and _result(future) is not None:
+                        return _result(future), context
+                return None, None
+            if len(futures) < len(contexts) and now >= next_submit:
+                futures.append(self.submit(address, contexts[len(futures)]))
+                next_submit = now + step
+                continue
+
+            wake = deadline if len(futures) == len(contexts) else min(deadline, next_submit)
+            concurrent.futures.wait([f for f in futures if not f.done()], timeout=wake - now,
+                                    return_when=concurrent.futures.FIRST_COMPLETED)
+
+    def _enqueue(self, key: str, address: str, context: str, future, lookup) -> None:
+        """Add a lookup to the queue (runs on the service loop)."""
+        try:
+            self._queue.put_nowait((key, address, context, future, lookup))
+        except asyncio.QueueFull:
+            with self._lock:
+                self.stats['rejected'] += 1
+                self._in_flight.pop(key, None)
+            future.set_exception(GeocodeQueueFull(f"{self.max_queue} geocoding lookups already waiting"))
+
+    async def _worker(self) -> None:
+        while True:
+            key, address, context, future, lookup = await self._queue.get()
+            try:
+                await self.bucket.acquire()
+                with self._lock:
+                    self.stats['network_calls'] += 1
+                result = await asyncio.wait_for(lookup(), self.timeout)
+                if self.cache is not None:
+                    self.cache.set(address, context, result)
+                self._finish(key, future, result=result)
+            except asyncio.TimeoutError as e:
+                with self._lock:
+                    self.stats['timeouts'] += 1
+                message = str(e) or f"Geocoding timed out after {self.timeout}s"
+                self._finish(key, future, error=TimeoutError(message))
+            except GeocoderUnavailable as e:
+                with self._lock:
+                    self.stats['unavailable'] += 1
+                self._finish(key, future, error=e)
+            except Exception as e:
+                print(f"Geocoding error for {address!r}: {e!r}")
+                with self._lock:
+                    self.stats['errors'] += 1
+                self._finish(key, future, error=e)
+            finally:
+                self._queue.task_done()
+
+    def _finish(self, key: str, future, result=None, error=None) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+        if future.cancelled():  # the service was closed meanwhile
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    self._queue = asyncio.Queue(maxsize=self.max_queue)
+                    self._workers = [loop.create_task(self._worker()) for _ in range(self.concurrency)]
+                    started.set()
+                    loop.run_forever()
+                    loop.close()
+
+                threading.Thread(target=run, name="geocoding-service", daemon=True).start()
+                started.wait()
+                self._loop = loop
+            return self._loop
+
+    def queue_size(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def close(self) -> None:
+        """Stop the background event loop; lookups still waiting are cancelled."""
+        with self._lock:
+            for future in self._in_flight.values():
+                future.cancel()
+            self._in_flight.clear()
+            if self._loop is not None:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+                self._loop = None
+
+    async def _shutdown(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        asyncio.get_running_loop().stop()
+
+def _resolved(result) -> concurrent.futures.Future:
+    future = concurrent.futures.Future()
+    future.set_result(result)
+    return future
+
+def _result(future):
+    """A finished lookup's result, with failures counted as not found."""
+    if future.cancelled() or future.exception() is not None:
+        return None
+    return future.result()
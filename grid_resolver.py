@@ -0,0 +1,200 @@
+"""
+Miami-Dade Grid Address Resolver for UnityAid
+Most of Miami-Dade is laid out on a numbered grid centred on Flagler Street
+and Miami Avenue in downtown Miami: streets run east-west and are numbered
+away from Flagler, avenues run north-south and are numbered away from Miami
+Avenue, and house numbers count 100 per block. "1234 SW 8th Street" or
+"NW 36th Street and 27th Avenue" therefore map to coordinates with a little
+arithmetic, instantly and without network access.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Flagler Street & Miami Avenue
+ORIGIN_LATITUDE = 25.7743
+ORIGIN_LONGITUDE = -80.1937
+
+# Degrees per block, fitted to surveyed intersections (blocks run slightly
+# longer south of Flagler than north of it)
+DEGREES_PER_STREET_NORTH = 0.000934
+DEGREES_PER_STREET_SOUTH = 0.000960
+DEGREES_PER_AVENUE = 0.001662
+
+# The grid's extent: NW 215th Street (county line) to SW 424th Street, and
+# from the bay to SW 237th Avenue
+STREET_RANGE = (-424, 215)
+AVENUE_RANGE = (-237, 30)
+
+# Streets, Terraces, Drives and Lanes run east-west; Avenues, Courts, Places
+# and Roads run north-south. Terraces, Courts and Places fall between the
+# numbered streets or avenues (SW 87th Court is between 87th and 88th Avenue).
+STREET_TYPES = {'street': 0.0, 'st': 0.0, 'terrace': 0.5, 'terr': 0.5, 'ter': 0.5,
+                'drive': 0.5, 'dr': 0.5, 'lane': 0.5, 'ln': 0.5}
+AVENUE_TYPES = {'avenue': 0.0, 'ave': 0.0, 'av': 0.0, 'court': 0.33, 'ct': 0.33,
+                'place': 0.66, 'pl': 0.66, 'road': 0.0, 'rd': 0.0}
+
+GRID_CONFIDENCE = 0.75
+
+_QUADRANT = r"(?:north|south)[\s-]?(?:east|west)|[ns]\.?\s?[ew]\.?"
+_DIRECTION = r"north|south|east|west|[nsew]\.?"
+
+def _types(types) -> str:
+    return "|".join(sorted(types, key=len, reverse=True))
+
+# "1234 SW 8th Street", "SW 87th Ct", "107th Avenue"
+_NUMBERED = re.compile(rf"""
+    (?<![\w.])
+    (?:(?P<number>\d{{1,5}})\s+)?
+    (?:(?P<quadrant>{_QUADRANT})\s+)?
+    (?P<ordinal>\d{{1,3}})(?:st|nd|rd|th)?\s+
+    (?P<type>{_types({**STREET_TYPES, **AVENUE_TYPES})})\.?
+    (?!\w)
+""", re.IGNORECASE | re.VERBOSE)
+
+# The two baselines: "2000 W Flagler St", "N Miami Ave"
+_BASELINE = re.compile(rf"""
+    (?<![\w.])
+    (?:(?P<number>\d{{1,5}})\s+)?
+    (?:(?P<direction>{_DIRECTION})\s+)?
+    (?P<name>flagler\s+(?:street|st)|miami\s+(?:avenue|ave))\.?
+    (?!\w)
+""", re.IGNORECASE | re.VERBOSE)
+
+_CONNECTOR = re.compile(r"\s*(?:and|&|/|@|at|y)\s*", re.IGNORECASE)
+
+@dataclass
+class GridMention:
+    """A street or avenue named in text, in grid units (blocks from the origin)."""
+    axis: str                          # 'street' (runs east-west) or 'avenue' (north-south)
+    position: float                    # blocks from the baseline, unsigned
+    north_south: Optional[int] = None  # +1 north / -1 south of Flagler, if known
+    east_west: Optional[int] = None    # +1 east / -1 west of Miami Avenue, if known
+    number: Optional[int] = None       # house number
+    text: str = ""
+    start: int = 0
+    end: int = 0
+
+@dataclass
+class GridLocation:
+    """Coordinates computed from a grid address or intersection."""
+    latitude: float
+    longitude: float
+    kind: str  # 'address' or 'intersection'
+    text: str
+    confidence: float = GRID_CONFIDENCE
+
+    @property
+    def method(self) -> str:
+        return f"grid_{self.kind}"
+
+def _signs(quadrant: str):
+    """(north_south, east_west) for a quadrant or direction such as "SW", "N." or "west"."""
+    letters = re.sub(r"[^a-z]", "", quadrant.lower())
+    for word in ('north', 'south', 'east', 'west'):
+        letters = letters.replace(word, word[0])
+    north_south = 1 if 'n' in letters else -1 if 's' in letters else None
+    east_west = 1 if 'e' in letters else -1 if 'w' in letters else None
+    return north_south, east_west
+
+def find_grid_mentions(text: str) -> List[GridMention]:
+    """Every numbered street or avenue (and Flagler Street or Miami Avenue) in text, in order."""
+    mentions = []
+    for match in _NUMBERED.finditer(text or ""):
+        street_type = match.group('type').lower()
+        north_south, east_west = _signs(match.group('quadrant') or "")
+        if match.group('quadrant') and (north_south is None or east_west is None):
+            continue
+        axis = 'street' if street_type in STREET_TYPES else 'avenue'
+        offset = STREET_TYPES.get(street_type, AVENUE_TYPES.get(street_type, 0.0))
+        mentions.append(GridMention(
+            axis=axis,
+            position=int(match.group('ordinal')) + offset,
+            north_south=north_south,
+            east_west=east_west,
+            number=int(match.group('number')) if match.group('number') else None,
+            text=match.group().strip(),
+            start=match.start(),
+            end=match.end()
+        ))
+
+    for match in _BASELINE.finditer(text or ""):
+        north_south, east_west = _signs(match.group('direction') or "")
+        flagler = match.group('name').lower().startswith('flagler')
+        mentions.append(GridMention(
+            axis='street' if flagler else 'avenue',
+            position=0.0,
+            # A baseline's direction says which half of it the address is on
+            north_south=north_south if not flagler else None,
+            east_west=east_west if flagler else None,
+            number=int(match.group('number')) if match.group('number') else None,
+            text=match.group().strip(),
+            start=match.start(),
+            end=match.end()
+        ))
+    mentions.sort(key=lambda m: m.start)
+    return mentions
+
+def grid_to_coordinates(blocks_north: float, blocks_east: float) -> Optional[tuple]:
+    """(latitude, longitude) of a grid position, or None if it is off the grid."""
+    if not (STREET_RANGE[0] <= blocks_north <= STREET_RANGE[1]
+            and AVENUE_RANGE[0] <= blocks_east <= AVENUE_RANGE[1]):
+        return None
+    per_street = DEGREES_PER_STREET_NORTH if blocks_north >= 0 else DEGREES_PER_STREET_SOUTH
+    return (round(ORIGIN_LATITUDE + blocks_north * per_street, 6),
+            round(ORIGIN_LONGITUDE + blocks_east * DEGREES_PER_AVENUE, 6))
+
+def address_location(mention: GridMention) -> Optional[GridLocation]:
+    """Locate "<number> <quadrant> <ordinal> <type>": the house number gives the cross position."""
+    if mention.number is None:
+        return None
+    cross = mention.number / 100.0
+    if mention.axis == 'street':
+        # Flagler Street is position 0 either side; elsewhere both signs are needed
+        if mention.east_west is None or (mention.north_south is None and mention.position):
+            return None
+        coordinates = grid_to_coordinates((mention.north_south or 0) * mention.position,
+                                          mention.east_west * cross)
+    else:
+        if mention.north_south is None or (mention.east_west is None and mention.position):
+            return None
+        coordinates = grid_to_coordinates(mention.north_south * cross,
+                                          (mention.east_west or 0) * mention.position)
+    if coordinates is None:
+        return None
+    return GridLocation(coordinates[0], coordinates[1], 'address', mention.text)
+
+def intersection_location(first: GridMention, second: GridMention) -> Optional[GridLocation]:
+    """Locate the crossing of a street and an avenue; a missing side is taken from the other road."""
+    if first.axis == second.axis:
+        return None
+    street, avenue = (first, second) if first.axis == 'street' else (second, first)
+    north_south = street.north_south if street.north_south is not None else avenue.north_south
+    east_west = avenue.east_west if avenue.east_west is not None else street.east_west
+    if (north_south is None and street.position) or (east_west is None and avenue.position):
+        return None
+    coordinates = grid_to_coordinates((north_south or 0) * street.position,
+                                      (east_west or 0) * avenue.position)
+    if coordinates is None:
+        return None
+    return GridLocation(coordinates[0], coordinates[1], 'intersection',
+                        f"{first.text} & {second.text}")
+
+def resolve_grid_location(text: str) -> Optional[GridLocation]:
+    """
+    The first grid address in text, else the first intersection of a street
+    and an avenue joined by "and", "&", "/", "@" or "at". None if the text
+    names neither, or too vaguely ("107th Street" alone could be NW or SW).
+    """
+    mentions = find_grid_mentions(text)
+    for mention in mentions:
+        location = address_location(mention)
+        if location:
+            return location
+    for first, second in zip(mentions, mentions[1:]):
+        if _CONNECTOR.fullmatch(text, first.end, second.start):
+            location = intersection_location(first, second)
+            if location:
+                return location
+    return None
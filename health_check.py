@@ -22,30 +22,39 @@ def check_dependencies():
     missing_packages = []
     
     for package in required_packages:
+        # Locate without importing, so the check does not pay each package's import time
         try:
-            if package == 'streamlit_folium':
-                import streamlit_folium
-            elif package == 'google.generativeai':
-                import google.generativeai
-            else:
-                __import__(package)
-            st.success(f"✅ {package} - OK")
+            found = importlib.util.find_spec(package) is not None
         except ImportError:
+            found = False
+        if found:
+            st.success(f"✅ {package} - OK")
+        else:
             st.error(f"❌ {package} - MISSING")
             missing_packages.append(package)
     
     return len(missing_packages) == 0
 
 def check_spacy_model():
-    """Check if spaCy English model is available."""
-    try:
-        import spacy
-        nlp = spacy.load('en_core_web_sm')
+    """Check if spaCy English model is available (without loading it)."""
+    from location_extractor import SPACY_MODEL
+    if importlib.util.find_spec(SPACY_MODEL) is not None:
         st.success("✅ spaCy English model - OK")
+        st.caption("The app loads it on a background thread at startup")
         return True
-    except OSError:
-        st.error("❌ spaCy English model - MISSING")
-        st.info("Run: python -m spacy download en_core_web_sm")
+    st.error("❌ spaCy English model - MISSING")
+    st.info(f"Run: python -m spacy download {SPACY_MODEL}")
+    return False
+
+def check_prioritizer():
+    """Check the PrioritizerAgent loads and report its startup time."""
+    try:
+        from PrioritizerAgent.classifier_service import PrioritizerService
+        service = PrioritizerService.load()
+        st.success(f"✅ PrioritizerAgent - OK (loaded in {service.startup_seconds * 1000:.0f} ms)")
+        return True
+    except Exception as e:
+        st.error(f"❌ PrioritizerAgent failed to load: {e}")
         return False
 
 def check_api_keys():
@@ -73,11 +82,14 @@ def main():
     st.header("🔤 spaCy Model Check") 
     spacy_ok = check_spacy_model()
     
+    st.header("🧠 PrioritizerAgent Check")
+    prioritizer_ok = check_prioritizer()
+    
     st.header("🔑 API Configuration Check")
     api_ok = check_api_keys()
     
     st.header("📊 Overall Status")
-    if deps_ok and spacy_ok:
+    if deps_ok and spacy_ok and prioritizer_ok:
         st.success("🎉 All systems ready! UnityAid is deployment-ready.")
         if not api_ok:
             st.info("ℹ️ Google API not configured - some features will use fallbacks")
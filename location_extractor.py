@@ -5,8 +5,16 @@ Extracts geographic coordinates from natural language descriptions using NLP and
 
 import re
 import os
+import threading
+import time
 from typing import Optional, Tuple, List, Dict
 from dataclasses import dataclass
+from gazetteer import Gazetteer, GazetteerMatch, load_default_gazetteer
+from geocode_cache import GeocodeCache
+from geocoder_chain import ProviderChain, providers_from_env
+from geocoding_service import GeocodingService
+from grid_resolver import GridLocation, resolve_grid_location
+from location_patterns import find_location_candidates
 
 @dataclass
 class LocationInfo:
@@ -22,43 +30,189 @@ class LocationInfo:
         if self.raw_entities is None:
             self.raw_entities = []
 
+SPACY_MODEL = "en_core_web_sm"
+
+# Only doc.ents is used, so everything NER does not depend on is left out
+NON_NER_COMPONENTS = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+# Appended to queries for better geocoding (assuming Miami area for UnityAid)
+GEOCODE_CONTEXT = "Miami-Dade County, Florida, USA"
+
+# Gazetteer entries that are points: a match on one skips the network geocoder.
+# Streets, neighborhoods and cities are one point for a whole area, so they
+# are used only if the grid resolver and the geocoder find nothing better
+GAZETTEER_POINT_KINDS = ("landmark",)
+
 class LocationExtractor:
-    """Extracts location information from natural language text."""
+    """
+    Extracts location information from natural language text.
     
-    def __init__(self):
-        self.geocoder = None
+    Nothing heavy happens at construction: the geocoder is created on first
+    use and the spaCy model loads on a background thread. Until the model is
+    ready, extraction uses the regex patterns instead of waiting for it.
+    """
+    
+    def __init__(self, warm_up: bool = False, geocode_cache: Optional[GeocodeCache] = None,
+                 gazetteer: Optional[Gazetteer] = None,
+                 geocoding_service: Optional[GeocodingService] = None,
+                 spacy: bool = True, grid: bool = True):
+        """
+        Args:
+            warm_up: Start loading the spaCy model in the background right away
+            geocode_cache: Cache for geocoding results (default: opened from
+                           GEOCODE_CACHE_PATH on first use)
+            gazetteer: Offline place index (default: the bundled Miami-Dade
+                       one; False disables offline place lookup)
+            geocoding_service: Rate-limited geocoding pipeline (default: one
+                               around `geocoder`, created on first use)
+            spacy: Use the spaCy model when it is available (False: patterns only)
+            grid: Resolve Miami-Dade grid addresses arithmetically
+        """
+        self._geocoder = None
+        self._geocoder_initialized = False
+        self._geocode_cache = geocode_cache
+        self._gazetteer = gazetteer
+        self._geocoding_service = geocoding_service
+        self.geocode_budget = float(os.environ.get("GEOCODE_BUDGET", 5.0))
+        self.deadline = float(os.environ.get("LOCATION_DEADLINE", 6.0))
         self.nlp_model = None
-        self._initialize_services()
+        self.model_status = "not_loaded"  # not_loaded, loading, ready, unavailable
+        self.model_load_seconds = None
+        self._model_lock = threading.Lock()
+        self._model_done = threading.Event()
+        self.use_grid = grid
+        if not spacy:
+            self.model_status = "unavailable"
+            self._model_done.set()
+        if warm_up:
+            self.warm_up()
     
-    def _initialize_services(self):
-        """Initialize geocoding and NLP services."""
-        try:
-            # Initialize geocoding service
-            from geopy.geocoders import Nominatim
-            self.geocoder = Nominatim(
-                user_agent="UnityAid-DisasterResponse/1.0",
-                timeout=10
+    @property
+    def geocoder(self):
+        """Nominatim client, created on first use (None if geopy is missing)."""
+        if not self._geocoder_initialized:
+            self._geocoder_initialized = True
+            try:
+                from geopy.geocoders import Nominatim
+                self._geocoder = Nominatim(
+                    user_agent="UnityAid-DisasterResponse/1.0",
+                    timeout=10
+                )
+            except ImportError:
+                print("Warning: geopy not available. Geocoding disabled.")
+        return self._geocoder
+    
+    @geocoder.setter
+    def geocoder(self, geocoder):
+        self._geocoder = geocoder
+        self._geocoder_initialized = True
+        if self._geocoding_service is not None:
+            self._geocoding_service.close()
+            self._geocoding_service = None  # rebuilt around the new geocoder
+    
+    @property
+    def geocode_cache(self) -> GeocodeCache:
+        """Persistent geocode cache, opened on first use."""
+        if self._geocode_cache is None:
+            path = os.environ.get("GEOCODE_CACHE_PATH", "cache/geocodes.sqlite3") or ":memory:"
+            settings = dict(
+                ttl=float(os.environ.get("GEOCODE_CACHE_TTL", 30 * 86400)),
+                negative_ttl=float(os.environ.get("GEOCODE_NEGATIVE_TTL", 86400)),
+                memory_size=int(os.environ.get("GEOCODE_CACHE_MEMORY", 2048))
             )
-        except ImportError:
-            print("Warning: geopy not available. Geocoding disabled.")
+            try:
+                self._geocode_cache = GeocodeCache(path, **settings)
+            except Exception as e:
+                # e.g. a read-only filesystem on a hosted deployment
+                print(f"Warning: geocode cache at {path} unavailable ({e}). Caching in memory only.")
+                self._geocode_cache = GeocodeCache(":memory:", **settings)
+        return self._geocode_cache
+    
+    @property
+    def geocoding_service(self) -> GeocodingService:
+        """
+        Rate-limited, coalescing geocoding pipeline, created on first use.
         
+        Its backend is the chain of remote providers (GEOCODE_PROVIDERS,
+        default: the Nominatim client), each behind a circuit breaker.
+        """
+        if self._geocoding_service is None:
+            providers = providers_from_env(self.geocoder)
+            self._geocoding_service = GeocodingService(
+                ProviderChain(providers) if providers else None,
+                cache=self.geocode_cache,
+                rate=float(os.environ.get("GEOCODE_RATE_LIMIT", 1.0)),
+                max_queue=int(os.environ.get("GEOCODE_QUEUE_SIZE", 64)),
+                timeout=float(os.environ.get("GEOCODE_TIMEOUT", 10.0))
+            )
+        return self._geocoding_service
+    
+    @property
+    def gazetteer(self) -> Optional[Gazetteer]:
+        """Offline place index, loaded on first use (None if the data file is missing)."""
+        if self._gazetteer is None:
+            try:
+                self._gazetteer = load_default_gazetteer()
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Warning: gazetteer unavailable ({e}). Offline place lookup disabled.")
+                self._gazetteer = False
+        return self._gazetteer or None
+    
+    def warm_up(self) -> None:
+        """Start loading the spaCy model on a background thread (no-op once started)."""
+        with self._model_lock:
+            if self.model_status != "not_loaded":
+                return
+            self.model_status = "loading"
+        threading.Thread(target=self._load_model, name="spacy-warmup", daemon=True).start()
+    
+    def load_model(self, timeout: Optional[float] = None) -> bool:
+        """Load the spaCy model and wait for it; returns True if it is usable."""
+        self.warm_up()
+        self._model_done.wait(timeout)
+        return self.nlp_model is not None
+    
+    def _load_model(self) -> None:
+        started = time.perf_counter()
+        nlp = None
         try:
             # Try to load spaCy model for advanced NLP
             import spacy
             try:
-                self.nlp_model = spacy.load("en_core_web_sm")
+                nlp = spacy.load(SPACY_MODEL, exclude=NON_NER_COMPONENTS)
+                # en_core_web_sm's NER has its own embedding layer; drop the
+                # shared tok2vec unless NER listens to it
+                if "tok2vec" in nlp.pipe_names and \
+                        "ner" not in getattr(nlp.get_pipe("tok2vec"), "listening_components", ["ner"]):
+                    nlp.remove_pipe("tok2vec")
             except OSError:
-                print("Warning: spaCy model 'en_core_web_sm' not found. Using basic extraction.")
-                self.nlp_model = None
+                print(f"Warning: spaCy model '{SPACY_MODEL}' not found. Using basic extraction.")
         except ImportError:
             print("Warning: spaCy not available. Using basic extraction.")
+        
+        self.model_load_seconds = time.perf_counter() - started
+        self.nlp_model = nlp
+        self.model_status = "ready" if nlp is not None else "unavailable"
+        if nlp is not None:
+            print(f"spaCy model '{SPACY_MODEL}' ({', '.join(nlp.pipe_names)}) loaded in {self.model_load_seconds:.2f}s")
+        self._model_done.set()
     
-    def extract_location(self, text: str) -> LocationInfo:
+    def model_info(self) -> Dict:
+        """Model load status and how long the load took."""
+        return {
+            'model': SPACY_MODEL,
+            'status': self.model_status,
+            'load_seconds': self.model_load_seconds,
+        }
+    
+    def extract_location(self, text: str, deadline: Optional[float] = None) -> LocationInfo:
         """
         Extract location information from text using multiple methods.
         
         Args:
             text: Natural language text containing location information
+            deadline: Seconds the whole extraction may take (default:
+                      LOCATION_DEADLINE); geocoding gets whatever is left
             
         Returns:
             LocationInfo object with extracted coordinates and metadata
@@ -66,31 +220,121 @@ class LocationExtractor:
         if not text or not text.strip():
             return LocationInfo()
         
+        expires_at = time.monotonic() + (self.deadline if deadline is None else deadline)
         # Try different extraction methods in order of sophistication
-        location_info = self._extract_with_spacy(text)
+        return self._complete_location(text, self._extract_with_spacy(text), expires_at)
+    
+    def extract_locations_batch(self, texts: List[str], n_process: int = 1,
+                                batch_size: int = 64) -> List[LocationInfo]:
+        """
+        Extract locations from many texts, e.g. when bulk-importing reports.
+        
+        Texts are streamed through spaCy's nlp.pipe in batches (optionally
+        across n_process worker processes) instead of one call per text.
+        Unlike extract_location, this waits for the model to load, since a
+        bulk run would otherwise fall back to patterns for every text.
+        
+        Returns:
+            One LocationInfo per text, in input order
+        """
+        texts = [text or "" for text in texts]
+        if not texts:
+            return []
         
+        if self.load_model():
+            docs = self.nlp_model.pipe(texts, batch_size=batch_size, n_process=n_process)
+            spacy_results = (self._location_from_doc(doc) for doc in docs)
+        else:
+            spacy_results = (LocationInfo() for _ in texts)
+        
+        return [
+            self._complete_location(text, location_info, time.monotonic() + self.deadline)
+            if text.strip() else LocationInfo()
+            for text, location_info in zip(texts, spacy_results)
+        ]
+    
+    def _complete_location(self, text: str, location_info: LocationInfo,
+                           expires_at: Optional[float] = None) -> LocationInfo:
+        """
+        Fill in from patterns, the gazetteer, the grid resolver and geocoding
+        after the spaCy step. The offline stages always run; geocoding is
+        skipped or cut short once `expires_at` (time.monotonic) has passed.
+        """
         if location_info.confidence < 0.3:
             fallback_info = self._extract_with_patterns(text)
             if fallback_info.confidence > location_info.confidence:
                 location_info = fallback_info
         
+        # Offline gazetteer before any network geocoder: instant and works without connectivity
+        place = self.gazetteer.resolve(text) if self.gazetteer else None
+        if place and place.entry.kind in GAZETTEER_POINT_KINDS:
+            self._apply_gazetteer(location_info, place)
+        
+        # Grid addresses and intersections ("1234 SW 8th Street") are computed exactly
+        grid_location = self._grid_location(text)
+        if grid_location and (not location_info.latitude
+                              or grid_location.confidence > location_info.confidence):
+            self._apply_grid(location_info, grid_location)
+        
         # Attempt geocoding if we have an address but no coordinates
-        if location_info.address and not location_info.latitude and self.geocoder:
-            geocoded = self._geocode_address(location_info.address)
+        remaining = self.geocode_budget if expires_at is None else expires_at - time.monotonic()
+        if location_info.address and not location_info.latitude and remaining > 0:
+            geocoded = self._geocode_address(location_info.address, min(self.geocode_budget, remaining))
             if geocoded.latitude:
                 location_info.latitude = geocoded.latitude
                 location_info.longitude = geocoded.longitude
                 location_info.confidence = max(location_info.confidence, 0.8)
                 location_info.extraction_method += "+geocoding"
         
+        # A street or area match (e.g. just "Doral") is better than nothing
+        if place and not location_info.latitude:
+            self._apply_gazetteer(location_info, place)
+        
         return location_info
     
+    @staticmethod
+    def _apply_gazetteer(location_info: LocationInfo, place: GazetteerMatch) -> None:
+        """Take coordinates and confidence from a gazetteer match."""
+        location_info.latitude = place.entry.latitude
+        location_info.longitude = place.entry.longitude
+        location_info.address = location_info.address or place.entry.name
+        location_info.confidence = place.confidence
+        if location_info.extraction_method == "none":
+            location_info.extraction_method = place.method
+        else:
+            location_info.extraction_method += "+" + place.method
+        if place.entry.name not in location_info.raw_entities:
+            location_info.raw_entities.append(place.entry.name)
+    
+    def _grid_location(self, text: str) -> Optional[GridLocation]:
+        """Grid address or intersection in text (None when the grid resolver is off)."""
+        return resolve_grid_location(text) if self.use_grid else None
+    
+    @staticmethod
+    def _apply_grid(location_info: LocationInfo, grid_location: GridLocation) -> None:
+        """Take coordinates and confidence from a Miami-Dade grid address."""
+        location_info.latitude = grid_location.latitude
+        location_info.longitude = grid_location.longitude
+        location_info.address = location_info.address or grid_location.text
+        location_info.confidence = grid_location.confidence
+        if location_info.extraction_method == "none":
+            location_info.extraction_method = grid_location.method
+        else:
+            location_info.extraction_method += "+" + grid_location.method
+        if grid_location.text not in location_info.raw_entities:
+            location_info.raw_entities.append(grid_location.text)
+    
     def _extract_with_spacy(self, text: str) -> LocationInfo:
         """Extract locations using spaCy NLP model."""
         if not self.nlp_model:
+            # Don't block on the model; the regex patterns cover until it is ready
+            self.warm_up()
             return LocationInfo()
         
-        doc = self.nlp_model(text)
+        return self._location_from_doc(self.nlp_model(text))
+    
+    def _location_from_doc(self, doc) -> LocationInfo:
+        """Build a LocationInfo from the entities spaCy found."""
         locations = []
         
         # Extract geographic and organizational entities
@@ -114,55 +358,7 @@ class LocationExtractor:
     
     def _extract_with_patterns(self, text: str) -> LocationInfo:
         """Extract locations using regex patterns and heuristics."""
-        text_lower = text.lower()
-        locations = []
-        confidence = 0.0
-        
-        # Common location patterns
-        patterns = [
-            # Business + Street patterns
-            r'at\s+([^,\n]+(?:cvs|walgreens|walmart|target|mcdonalds|starbucks|hospital|clinic|school|university|mall|plaza|center)[^,\n]*)',
-            r'at\s+([^,\n]+(?:street|st|avenue|ave|road|rd|boulevard|blvd|drive|dr|lane|ln|way|place|pl)[^,\n]*)',
-            
-            # Address patterns
-            r'(\d+\s+[^,\n]+(?:street|st|avenue|ave|road|rd|boulevard|blvd|drive|dr|lane|ln))',
-            
-            # Intersection patterns
-            r'(?:at|near)\s+([^,\n]+(?:and|\&|intersection)[^,\n]+)',
-            
-            # Landmark patterns
-            r'(?:at|near)\s+([^,\n]*(?:hospital|clinic|school|university|airport|station|park|mall|center|plaza|building)[^,\n]*)',
-            
-            # City/Area patterns
-            r'(?:in|at)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?:\s*,\s*[A-Z]{2})?)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if len(match.strip()) > 3:  # Filter out very short matches
-                    locations.append(match.strip())
-                    confidence = max(confidence, 0.5)
-        
-        # Business name patterns
-        business_keywords = [
-            'cvs', 'walgreens', 'walmart', 'target', 'publix', 'winn-dixie',
-            'mcdonalds', 'burger king', 'starbucks', 'dunkin',
-            'hospital', 'clinic', 'urgent care', 'emergency room',
-            'school', 'university', 'college', 'library',
-            'mall', 'plaza', 'center', 'airport', 'station'
-        ]
-        
-        for keyword in business_keywords:
-            if keyword in text_lower:
-                # Try to extract context around the keyword
-                pattern = f'([^.!?]*{keyword}[^.!?]*)'
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    if len(match.strip()) > len(keyword) + 5:
-                        locations.append(match.strip())
-                        confidence = max(confidence, 0.4)
-                break
+        locations, confidence = find_location_candidates(text)
         
         if locations:
             # Clean up and select the best location
@@ -176,34 +372,27 @@ class LocationExtractor:
         
         return LocationInfo()
     
-    def _geocode_address(self, address: str) -> LocationInfo:
-        """Convert address to coordinates using geocoding service."""
-        if not self.geocoder:
-            return LocationInfo()
+    def _geocode_address(self, address: str, budget: Optional[float] = None) -> LocationInfo:
+        """
+        Convert address to coordinates through the geocoding service.
         
+        The query with the Miami-Dade context is preferred; the bare address is
+        the fallback. Both share one latency budget (default: GEOCODE_BUDGET
+        seconds).
+        """
         try:
-            # Add context for better geocoding (assuming Miami area for UnityAid)
-            context_address = f"{address}, Miami-Dade County, Florida, USA"
-            
-            location = self.geocoder.geocode(context_address)
-            if location:
-                return LocationInfo(
-                    latitude=location.latitude,
-                    longitude=location.longitude,
-                    address=location.address,
-                    confidence=0.8,
-                    extraction_method="geocoding"
-                )
-            
-            # Fallback: try without context
-            location = self.geocoder.geocode(address)
+            location, context = self.geocoding_service.resolve(
+                address, (GEOCODE_CONTEXT, ""),
+                budget=self.geocode_budget if budget is None else budget
+            )
             if location:
+                with_context = context == GEOCODE_CONTEXT
                 return LocationInfo(
-                    latitude=location.latitude,
-                    longitude=location.longitude,
-                    address=location.address,
-                    confidence=0.6,
-                    extraction_method="geocoding_fallback"
+                    latitude=location[0],
+                    longitude=location[1],
+                    address=location[2],
+                    confidence=0.8 if with_context else 0.6,
+                    extraction_method="geocoding" if with_context else "geocoding_fallback"
                 )
                 
         except Exception as e:
@@ -234,7 +423,7 @@ class LocationExtractor:
         
         return suggestions
 
-# Global instance for easy access
+# Global instance for easy access (cheap: the model loads on first use)
 location_extractor = LocationExtractor()
 
 def extract_coordinates_from_text(text: str) -> Tuple[Optional[float], Optional[float], Dict]:
@@ -256,6 +445,15 @@ def extract_coordinates_from_text(text: str) -> Tuple[Optional[float], Optional[
     
     return result.latitude, result.longitude, metadata
 
+def extract_locations_batch(texts: List[str], n_process: int = 1) -> List[LocationInfo]:
+    """
+    Convenience function to extract locations from many texts at once.
+    
+    Returns:
+        One LocationInfo per text, in input order
+    """
+    return location_extractor.extract_locations_batch(texts, n_process=n_process)
+
 def test_location_extraction():
     """Test the location extraction with sample inputs."""
     test_cases = [
@@ -272,6 +470,11 @@ def test_location_extraction():
     print("Testing Location Extraction:")
     print("=" * 60)
     
+    # Wait for the model so the samples exercise the spaCy path
+    location_extractor.load_model()
+    info = location_extractor.model_info()
+    print(f"spaCy model: {info['status']} ({info['load_seconds']:.2f}s)")
+    
     for i, text in enumerate(test_cases, 1):
         print(f"\n{i}. Input: '{text}'")
         lat, lon, metadata = extract_coordinates_from_text(text)
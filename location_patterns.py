@@ -0,0 +1,251 @@
+"""
+Pattern-based Location Candidates for UnityAid
+Finds address, intersection, landmark and business mentions in free text
+without spaCy. Everything is compiled once at import: a fixed set of
+non-backtracking scans collects the anchors ("at", "near", "in"), street
+suffixes, landmark words and separators in the text, and the candidates are
+assembled from those positions. Long descriptions (pasted reports, social
+media threads) take linear time instead of the quadratic backtracking of the
+equivalent regular expressions, with the same results.
+"""
+
+import re
+from typing import List, Tuple
+
+# Words that make "at ..." a business or landmark address
+BUSINESS_SUFFIXES = ('cvs', 'walgreens', 'walmart', 'target', 'mcdonalds', 'starbucks', 'hospital',
+                     'clinic', 'school', 'university', 'mall', 'plaza', 'center')
+STREET_SUFFIXES = ('street', 'st', 'avenue', 'ave', 'road', 'rd', 'boulevard', 'blvd', 'drive', 'dr',
+                   'lane', 'ln', 'way', 'place', 'pl')
+ADDRESS_SUFFIXES = ('street', 'st', 'avenue', 'ave', 'road', 'rd', 'boulevard', 'blvd', 'drive', 'dr',
+                    'lane', 'ln')
+INTERSECTION_WORDS = ('and', '&', 'intersection')
+LANDMARK_WORDS = ('hospital', 'clinic', 'school', 'university', 'airport', 'station', 'park', 'mall',
+                  'center', 'plaza', 'building')
+
+# Business names; the sentence around the first one mentioned is a candidate
+BUSINESS_KEYWORDS = [
+    'cvs', 'walgreens', 'walmart', 'target', 'publix', 'winn-dixie',
+    'mcdonalds', 'burger king', 'starbucks', 'dunkin',
+    'hospital', 'clinic', 'urgent care', 'emergency room',
+    'school', 'university', 'college', 'library',
+    'mall', 'plaza', 'center', 'airport', 'station'
+]
+
+# Characters that re.IGNORECASE matches to ASCII letters, folded once per text
+# without changing its length so positions in the folded text are valid in
+# the original; the scans below then run without IGNORECASE, which keeps
+# the regex engine's fast literal search
+_CASE_FOLD = str.maketrans({**{chr(c): chr(c + 32) for c in range(ord('A'), ord('Z') + 1)},
+                            '\u0130': 'i', '\u0131': 'i', '\u017f': 's', '\u212a': 'k'})
+
+def _word_starts(words) -> "re.Pattern":
+    """
+    Finds where any of the words starts, overlaps included ("rd" at the end of
+    "boulevard"): only the first letter is consumed and the rest is checked by
+    a lookahead. Group `lastindex` ends where the first listed word matching
+    at that position ends.
+    """
+    rests = {}
+    for word in words:
+        rests.setdefault(word[0], []).append(re.escape(word[1:]))
+    return re.compile("|".join("%s(?=(%s))" % (re.escape(first), "|".join(options))
+                               for first, options in rests.items()))
+
+_BUSINESS_SUFFIX_STARTS = _word_starts(BUSINESS_SUFFIXES)
+_STREET_SUFFIX_STARTS = _word_starts(STREET_SUFFIXES)
+_ADDRESS_SUFFIX_STARTS = _word_starts(ADDRESS_SUFFIXES)
+_INTERSECTION_STARTS = _word_starts(INTERSECTION_WORDS)
+_LANDMARK_STARTS = _word_starts(LANDMARK_WORDS)
+_ANCHOR = re.compile(r"(at|near|in)\s+")
+_NUMBER = re.compile(r"(\d+)\s*")
+_SEPARATOR = re.compile(r"[,\n]")
+_AREA = re.compile(r"[a-z][a-z]+(?:\s+[a-z][a-z]+)*(?:\s*,\s*[a-z]{2})?")
+_SENTENCE_END = re.compile(r"[.!?]")
+_BUSINESS_PATTERNS = {keyword: re.compile(re.escape(keyword)) for keyword in BUSINESS_KEYWORDS}
+_END = float("inf")
+
+class _Cursor:
+    """Walks a sorted list of positions for bounds that never decrease."""
+
+    __slots__ = ("positions", "index")
+
+    def __init__(self, positions: List[int]):
+        self.positions = positions
+        self.index = 0
+
+    def seek(self, bound: int) -> int:
+        """Index of the first position >= bound."""
+        positions, index = self.positions, self.index
+        while index < len(positions) and positions[index] < bound:
+            index += 1
+        self.index = index
+        return index
+
+    def first(self, bound: int):
+        index = self.seek(bound)
+        return self.positions[index] if index < len(self.positions) else _END
+
+class _Scan:
+    """Positions of everything the location patterns look for in one text."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.folded = folded = text.lower() if text.isascii() else text.translate(_CASE_FOLD)
+        # "," and "\n", with the end of the text closing the last clause
+        self.clause_ends = [m.start() for m in _SEPARATOR.finditer(folded)] + [len(text)]
+        # (start, kind, end of the whitespace after it)
+        self.anchors = [(m.start(), m.group(1), m.end()) for m in _ANCHOR.finditer(folded)]
+        # (start, end of the digits, end of the whitespace after them)
+        self.numbers = [(m.start(), m.end(1), m.end()) for m in _NUMBER.finditer(folded)]
+        self.business = [m.start() for m in _BUSINESS_SUFFIX_STARTS.finditer(folded)]
+        self.street = [m.start() for m in _STREET_SUFFIX_STARTS.finditer(folded)]
+        self.landmark = [m.start() for m in _LANDMARK_STARTS.finditer(folded)]
+        self.address, self.address_ends = self._spans(_ADDRESS_SUFFIX_STARTS)
+        self.intersection, self.intersection_ends = self._spans(_INTERSECTION_STARTS)
+
+    def _spans(self, pattern) -> Tuple[List[int], List[int]]:
+        starts, ends = [], []
+        for match in pattern.finditer(self.folded):
+            starts.append(match.start())
+            ends.append(match.end(match.lastindex))
+        return starts, ends
+
+    def can_start_at_word(self, start: int, length: int, words_start: int) -> bool:
+        """
+        Whether "<anchor>\\s+[^,\\n]+<word>" may match with the word right after
+        the whitespace: the regex gives back one whitespace character to the
+        leading [^,\\n]+, which needs at least two whitespace characters that
+        are not a line break.
+        """
+        return words_start - (start + length) >= 2 and self.text[words_start - 1] != "\n"
+
+# The three functions below reproduce re.findall for one pattern each. A
+# match takes the rest of the clause (up to "," or "\n") after its anchor, so
+# the next one starts at or after the clause end ("resume"). An anchor whose
+# clause had no suitable word rules out the later anchors in the same clause
+# too, as they have less text after them ("checked").
+
+def _anchored_clauses(scan: _Scan, kinds: Tuple[str, ...], words: List[int],
+                      word_may_lead: bool) -> List[str]:
+    """
+    Matches of "(?:kinds)\\s+([^,\\n]+(?:words)[^,\\n]*)" (or "[^,\\n]*" before
+    the word when word_may_lead): the rest of the clause after the anchor,
+    when one of the words appears in it.
+    """
+    clause_ends, found_words = _Cursor(scan.clause_ends), _Cursor(words)
+    clauses, resume, checked = [], 0, 0
+    for start, kind, words_start in scan.anchors:
+        if start < resume or words_start < checked or kind not in kinds:
+            continue
+        clause_end = clause_ends.first(words_start)
+        lead = word_may_lead or scan.can_start_at_word(start, len(kind), words_start)
+        if found_words.first(words_start if lead else words_start + 1) < clause_end:
+            clauses.append(scan.text[words_start:clause_end])
+            resume = clause_end
+        else:
+            checked = clause_end
+    return clauses
+
+def _intersections(scan: _Scan) -> List[str]:
+    """Matches of "(?:at|near)\\s+([^,\\n]+(?:and|&|intersection)[^,\\n]+)"."""
+    # Earliest end of any intersection word starting at or after each index
+    earliest_end = list(scan.intersection_ends) + [_END]
+    for index in range(len(earliest_end) - 2, -1, -1):
+        earliest_end[index] = min(earliest_end[index], earliest_end[index + 1])
+
+    clause_ends, found_words = _Cursor(scan.clause_ends), _Cursor(scan.intersection)
+    clauses, resume, checked = [], 0, 0
+    for start, kind, words_start in scan.anchors:
+        if start < resume or words_start < checked or kind == "in":
+            continue
+        clause_end = clause_ends.first(words_start)
+        lead = scan.can_start_at_word(start, len(kind), words_start)
+        # The word needs text before it and at least one character after it
+        if earliest_end[found_words.seek(words_start if lead else words_start + 1)] < clause_end:
+            clauses.append(scan.text[words_start:clause_end])
+            resume = clause_end
+        else:
+            checked = clause_end
+    return clauses
+
+def _street_addresses(scan: _Scan) -> List[str]:
+    """Matches of "(\\d+\\s+[^,\\n]+(?:street|st|...|ln))", up to the last suffix in the clause."""
+    clause_ends, suffixes = _Cursor(scan.clause_ends), _Cursor(scan.address)
+    addresses, resume, checked = [], 0, 0
+    for start, digits_end, words_start in scan.numbers:
+        if start < resume or words_start < checked or words_start == digits_end:
+            continue
+        clause_end = clause_ends.first(words_start)
+        index = suffixes.seek(clause_end) - 1  # last suffix starting before the clause end
+        suffix_start = scan.address[index] if index >= 0 else -1
+        if suffix_start > words_start or (
+                suffix_start == words_start and scan.can_start_at_word(start, digits_end - start, words_start)):
+            resume = scan.address_ends[index]
+            addresses.append(scan.text[start:resume])
+        else:
+            checked = clause_end
+    return addresses
+
+def _areas(scan: _Scan) -> List[str]:
+    """Matches of "(?:in|at)\\s+([A-Z][a-z]+(?:\\s+[A-Z][a-z]+)*(?:\\s*,\\s*[A-Z]{2})?)"."""
+    areas, resume = [], 0
+    for start, kind, words_start in scan.anchors:
+        if start < resume or kind == "near":
+            continue
+        match = _AREA.match(scan.folded, words_start)
+        if match:
+            areas.append(scan.text[words_start:match.end()])
+            resume = match.end()
+    return areas
+
+def _business_sentences(scan: _Scan, keyword: str) -> List[str]:
+    """Every sentence (text between ".", "!" and "?") mentioning the keyword."""
+    text = scan.text
+    sentences, sentence_end = [], 0
+    for match in _BUSINESS_PATTERNS[keyword].finditer(scan.folded):
+        if match.start() < sentence_end:
+            continue  # same sentence as the previous mention
+        sentence_start = max(text.rfind(mark, sentence_end, match.start()) for mark in ".!?") + 1
+        sentence_start = max(sentence_start, sentence_end)
+        end = _SENTENCE_END.search(text, match.end())
+        sentence_end = end.start() if end else len(text)
+        sentences.append(text[sentence_start:sentence_end])
+    return sentences
+
+def find_location_candidates(text: str) -> Tuple[List[str], float]:
+    """
+    Location phrases found by the address, intersection, landmark and area
+    patterns, then the sentence around the first business name mentioned.
+
+    Returns:
+        (candidates in pattern order, confidence): 0.5 if any pattern matched,
+        0.4 for business sentences only, 0.0 if nothing was found
+    """
+    scan = _Scan(text)
+    locations = []
+    confidence = 0.0
+
+    for matches in (
+        _anchored_clauses(scan, ("at",), scan.business, word_may_lead=False),
+        _anchored_clauses(scan, ("at",), scan.street, word_may_lead=False),
+        _street_addresses(scan),
+        _intersections(scan),
+        _anchored_clauses(scan, ("at", "near"), scan.landmark, word_may_lead=True),
+        _areas(scan),
+    ):
+        for match in matches:
+            if len(match.strip()) > 3:  # Filter out very short matches
+                locations.append(match.strip())
+                confidence = max(confidence, 0.5)
+
+    text_lower = text.lower()
+    for keyword in BUSINESS_KEYWORDS:
+        if keyword in text_lower:
+            for match in _business_sentences(scan, keyword):
+                if len(match.strip()) > len(keyword) + 5:
+                    locations.append(match.strip())
+                    confidence = max(confidence, 0.4)
+            break
+
+    return locations, confidence
@@ -1,22 +1,26 @@
 """Matcher agent: listens for ReportCategorized and sends ResourceMatched events to the A2A bus."""
 import httpx, json, time
+from geo_distance import match_resources_bulk
 
 API='http://127.0.0.1:8000'
 
 def choose_resource_for(report_id):
-    # ask backend for resources and reports, choose nearest with capacity
+    return choose_resources_for([report_id]).get(report_id)
+
+def choose_resources_for(report_ids):
+    # ask backend for resources and reports once, match them all in one vectorized pass:
+    # nearest open resource of the report's category by haversine, else nearest open one
     try:
         r = httpx.get(f'{API}/api/reports').json()
-        rep = next((x for x in r if x['id']==report_id), None)
+        wanted = set(report_ids)
+        reps = [x for x in r if x['id'] in wanted]
         res = httpx.get(f'{API}/api/resources').json()
-        if not rep or not res: return None
-        # naive nearest by lat/lon euclidean
-        best = min((res), key=lambda x: (x['lat']-rep['lat'])**2 + (x['lon']-rep['lon'])**2)
-        if best and best.get('capacity',0)>0:
-            return best['id']
+        if not reps or not res: return {}
+        matches = match_resources_bulk(reps, res, get=dict.get)
+        return {rep['id']: best['id'] for rep, best in zip(reps, matches) if best}
     except Exception as e:
         print('choose err',e)
-    return None
+    return {}
 
 def run():
     print('starting matcher agent')
@@ -0,0 +1,190 @@
+"""
+Spatial Resource Index for UnityAid
+Answers "nearest open resource of type X" without scanning every resource.
+Each category keeps a k-d tree of its open resources (capacity > 0) as
+points on the unit sphere: straight-line (chord) distance between unit
+vectors grows with great-circle distance, so the nearest point in the tree
+is the nearest resource by haversine. Trees are updated in place as
+resources are added, moved or run out of capacity, and rebuilt balanced
+once enough changes have piled up.
+"""
+
+import math
+from typing import Dict, Iterable, Optional, Tuple
+
+def to_unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    """Point on the unit sphere for a latitude/longitude in degrees."""
+    phi, lam = math.radians(lat), math.radians(lon)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+class _Node:
+    __slots__ = ("point", "key", "order", "axis", "left", "right", "alive")
+
+    def __init__(self, point, key, order, axis):
+        self.point = point
+        self.key = key
+        self.order = order
+        self.axis = axis
+        self.left = None
+        self.right = None
+        self.alive = True
+
+class KDTree:
+    """
+    3-D k-d tree with incremental inserts and lazy deletes.
+
+    Inserts descend to a leaf; deletes only mark the node. When deleted
+    nodes outnumber live ones, or inserts since the last rebuild outnumber
+    the points it was built with, the tree is rebuilt balanced, which keeps
+    the depth logarithmic at amortized O(log n) cost per change.
+    """
+
+    def __init__(self):
+        self._root = None
+        self._nodes: Dict[str, _Node] = {}
+        self._dead = 0
+        self._built_size = 0
+        self._inserted = 0
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def insert(self, key: str, point: Tuple[float, float, float], order: int) -> None:
+        """Add a point (replacing any previous one under key); `order` breaks distance ties."""
+        self.remove(key)
+        if self._root is None:
+            node = self._root = _Node(point, key, order, 0)
+        else:
+            parent = self._root
+            while True:
+                branch = "left" if point[parent.axis] < parent.point[parent.axis] else "right"
+                child = getattr(parent, branch)
+                if child is None:
+                    node = _Node(point, key, order, (parent.axis + 1) % 3)
+                    setattr(parent, branch, node)
+                    break
+                parent = child
+        self._nodes[key] = node
+        self._inserted += 1
+        if self._inserted > max(self._built_size, 16):
+            self._rebuild()
+
+    def remove(self, key: str) -> bool:
+        node = self._nodes.pop(key, None)
+        if node is None:
+            return False
+        node.alive = False
+        self._dead += 1
+        if self._dead > len(self._nodes):
+            self._rebuild()
+        return True
+
+    def nearest(self, point: Tuple[float, float, float]) -> Optional[Tuple[float, int, str]]:
+        """(squared chord distance, order, key) of the closest live point, or None."""
+        best = None
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if node.alive:
+                d = point[0] - node.point[0], point[1] - node.point[1], point[2] - node.point[2]
+                candidate = (d[0] * d[0] + d[1] * d[1] + d[2] * d[2], node.order, node.key)
+                if best is None or candidate < best:
+                    best = candidate
+            gap = point[node.axis] - node.point[node.axis]
+            near, far = (node.left, node.right) if gap < 0 else (node.right, node.left)
+            # The far side can only hold a closer point if the splitting plane is closer
+            if far is not None and (best is None or gap * gap <= best[0]):
+                stack.append(far)
+            stack.append(near)
+        return best
+
+    def _rebuild(self) -> None:
+        entries = [(node.point, key, node.order) for key, node in self._nodes.items()]
+        self._nodes = {}
+        self._root = self._build(entries, 0)
+        self._dead = 0
+        self._built_size = len(entries)
+        self._inserted = 0
+
+    def _build(self, entries, axis: int) -> Optional[_Node]:
+        if not entries:
+            return None
+        entries.sort(key=lambda entry: entry[0][axis])
+        middle = len(entries) // 2
+        # Equal coordinates go right, as insert sends them
+        while middle > 0 and entries[middle - 1][0][axis] == entries[middle][0][axis]:
+            middle -= 1
+        point, key, order = entries[middle]
+        node = _Node(point, key, order, axis)
+        self._nodes[key] = node
+        node.left = self._build(entries[:middle], (axis + 1) % 3)
+        node.right = self._build(entries[middle + 1:], (axis + 1) % 3)
+        return node
+
+class ResourceIndex:
+    """
+    Open resources partitioned by category, one k-d tree per category.
+
+    Resources are any objects with id, type, lat, lon and capacity. Call
+    `update` whenever one is added or its capacity or position changes; a
+    resource with no capacity left drops out of the index until it has some
+    again.
+    """
+
+    def __init__(self):
+        self._trees: Dict[str, KDTree] = {}
+        self._resources: Dict[str, object] = {}
+        self._categories: Dict[str, str] = {}  # resource id -> tree it is in
+        self._order: Dict[str, int] = {}       # first-seen order, for ties
+
+    @classmethod
+    def from_resources(cls, resources: Iterable) -> "ResourceIndex":
+        index = cls()
+        for resource in resources:
+            index.update(resource)
+        return index
+
+    def __len__(self) -> int:
+        """Number of open resources."""
+        return len(self._categories)
+
+    def update(self, resource) -> None:
+        """Add a resource or refresh its category, position and capacity."""
+        self._order.setdefault(resource.id, len(self._order))
+        self._resources[resource.id] = resource
+        self._discard(resource.id)
+        if resource.capacity > 0:
+            tree = self._trees.setdefault(resource.type, KDTree())
+            tree.insert(resource.id, to_unit_vector(resource.lat, resource.lon), self._order[resource.id])
+            self._categories[resource.id] = resource.type
+
+    add = update
+
+    def remove(self, resource_id: str) -> None:
+        """Forget a resource entirely."""
+        self._discard(resource_id)
+        self._resources.pop(resource_id, None)
+
+    def nearest(self, lat: float, lon: float, category: Optional[str] = None):
+        """
+        The nearest open resource of `category`; for "other" or None, or if no
+        resource of the category is open, the nearest open resource of any kind.
+        """
+        point = to_unit_vector(lat, lon)
+        best = None
+        if category not in (None, "other"):
+            tree = self._trees.get(category)
+            best = tree.nearest(point) if tree is not None else None
+        if best is None:
+            for tree in self._trees.values():
+                candidate = tree.nearest(point)
+                if candidate is not None and (best is None or candidate < best):
+                    best = candidate
+        return self._resources[best[2]] if best is not None else None
+
+    def _discard(self, resource_id: str) -> None:
+        category = self._categories.pop(resource_id, None)
+        if category is not None:
+            self._trees[category].remove(resource_id)
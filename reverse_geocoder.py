@@ -0,0 +1,141 @@
+"""
+Reverse Geocoding for UnityAid Map Clicks
+Turns a clicked point into a readable address without blocking the page.
+Points are quantized to geohash cells (about 150 m across at the default
+precision), so clicks near each other share one cached answer. A cell seen
+before is answered from the persistent geocode cache; a new cell is answered
+at once from the nearest gazetteer entry while the network lookup runs in the
+background and fills the cache for the next rerun.
+"""
+
+import concurrent.futures
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from gazetteer import Gazetteer
+from geocoding_service import GeocodingService
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# 7 characters: cells of about 153 m x 153 m
+DEFAULT_PRECISION = 7
+
+# Farther than this from every gazetteer entry, "near X" says nothing useful
+MAX_FALLBACK_KM = 10.0
+
+def geohash_encode(latitude: float, longitude: float, precision: int = DEFAULT_PRECISION) -> str:
+    """Geohash of a point: interleaved longitude/latitude bisections, 5 bits per character."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        if coordinate >= middle:
+            value = value * 2 + 1
+            interval[0] = middle
+        else:
+            value *= 2
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+def geohash_decode(cell: str) -> Tuple[float, float]:
+    """Centre (latitude, longitude) of a geohash cell."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            interval = lon_range if even else lat_range
+            middle = (interval[0] + interval[1]) / 2
+            if value >> shift & 1:
+                interval[0] = middle
+            else:
+                interval[1] = middle
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+@dataclass
+class ReverseGeocode:
+    """A readable description of a clicked point."""
+    address: str
+    latitude: float
+    longitude: float
+    cell: str
+    source: str            # 'geocoder' or 'gazetteer'
+    pending: bool = False  # a geocoder answer is still on its way
+
+class ReverseGeocoder:
+    """
+    Non-blocking reverse geocoder for map clicks.
+
+    Network lookups go through a GeocodingService (sharing its rate limit
+    and persistent cache with forward geocoding) and are made once per
+    geohash cell, for the cell's centre.
+    """
+
+    def __init__(self, service: Optional[GeocodingService] = None, gazetteer: Optional[Gazetteer] = None,
+                 precision: int = DEFAULT_PRECISION, max_fallback_km: float = MAX_FALLBACK_KM):
+        """
+        Args:
+            service: Geocoding service for cached and network lookups (None: gazetteer only)
+            gazetteer: Offline place index for the fallback answer
+            precision: Geohash length; longer means smaller cells and more lookups
+            max_fallback_km: Farthest gazetteer entry worth naming
+        """
+        self.service = service
+        self.gazetteer = gazetteer
+        self.precision = precision
+        self.max_fallback_km = max_fallback_km
+
+    def lookup(self, latitude: float, longitude: float, wait: float = 0.0,
+               on_resolved: Optional[Callable[[ReverseGeocode], None]] = None) -> Optional[ReverseGeocode]:
+        """
+        Describe a point, waiting at most `wait` seconds for the network.
+
+        Args:
+            on_resolved: Called with the geocoder's ReverseGeocode when an
+                         answer that was still pending arrives (on the
+                         service's worker thread), e.g. to update a record
+                         stored with the gazetteer placeholder
+
+        Returns:
+            ReverseGeocode from the cache or geocoder if one is available in
+            time, else from the nearest gazetteer entry, else None
+        """
+        cell = geohash_encode(latitude, longitude, self.precision)
+        future = None
+        if self.service is not None:
+            center_lat, center_lon = geohash_decode(cell)
+            future = self.service.submit_reverse(center_lat, center_lon, cell=cell)
+            if wait > 0 and not future.done():
+                concurrent.futures.wait([future], timeout=wait)
+            if future.done() and not future.cancelled() and future.exception() is None:
+                result = future.result()
+                if result is not None:
+                    return ReverseGeocode(result[2], result[0], result[1], cell, 'geocoder')
+                future = None  # the geocoder has nothing here; don't report it as pending
+            elif on_resolved is not None:
+                future.add_done_callback(lambda done: self._resolved(done, cell, on_resolved))
+
+        return self._nearest_place(latitude, longitude, cell, pending=future is not None and not future.done())
+
+    @staticmethod
+    def _resolved(future, cell: str, on_resolved) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        if result is not None:
+            on_resolved(ReverseGeocode(result[2], result[0], result[1], cell, 'geocoder'))
+
+    def _nearest_place(self, latitude: float, longitude: float, cell: str, pending: bool) -> Optional[ReverseGeocode]:
+        nearest = self.gazetteer.nearest(latitude, longitude) if self.gazetteer else None
+        if nearest is None or nearest[1] > self.max_fallback_km:
+            return None
+        entry, distance = nearest
+        address = entry.name if distance < 0.2 else f"{distance:.1f} km from {entry.name}"
+        return ReverseGeocode(address, entry.latitude, entry.longitude, cell, 'gazetteer', pending)
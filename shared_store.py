@@ -0,0 +1,231 @@
+"""
+Shared Data Store for UnityAid
+Tickets and resources kept once per server process instead of once per
+browser session, so every dispatcher works on the same dataset and memory
+does not grow with each connected user.
+
+Each collection is copy-on-write: a write swaps in a new dict under a lock,
+so readers take the current snapshot without locking and can iterate it
+while other sessions write. Every change bumps a version number that
+sessions compare to decide whether anything needs to be drawn again, and
+`wait_for_change` blocks until one happens. Changes computed from a
+record's current value go through `update`, so two sessions editing the same
+record cannot overwrite each other's change.
+
+Optionally the store is persisted to SQLite in WAL mode (readers never block
+the writer). Rows carry the version of their last change, so `refresh`
+picks up writes made by other processes sharing the file.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from dataclasses import asdict, is_dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, Iterator, Mapping, Optional
+
+class SharedStore:
+    """
+    Thread-safe named collections of records keyed by id.
+    """
+
+    def __init__(self, path: Optional[str] = None, codecs: Optional[Dict[str, Callable]] = None):
+        """
+        Args:
+            path: SQLite file to persist to (None = in memory only)
+            codecs: Collection name -> class rebuilt from stored fields (e.g.
+                    a dataclass); collections without one load as dicts
+        """
+        self.path = path
+        self.codecs = codecs or {}
+        self._data: Dict[str, Dict[str, object]] = {}
+        self._versions: Dict[str, int] = {}  # changes per collection
+        self.version = 0                     # changes to any collection
+        self._synced = 0                     # highest row version read from disk
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._db = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                " kind TEXT NOT NULL, id TEXT NOT NULL, data TEXT, version INTEGER NOT NULL,"
+                " PRIMARY KEY (kind, id))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS records_version ON records (version)")
+            self.refresh()
+
+    # ---- reads -------------------------------------------------------------
+
+    def items(self, kind: str) -> Mapping[str, object]:
+        """Read-only snapshot of a collection; later writes do not change it."""
+        return MappingProxyType(self._data.get(kind, {}))
+
+    def get(self, kind: str, key: str, default=None):
+        return self._data.get(kind, {}).get(key, default)
+
+    def version_of(self, kind: str) -> int:
+        """Number of changes made to a collection so far."""
+        return self._versions.get(kind, 0)
+
+    def collection(self, kind: str) -> "StoreCollection":
+        """Dict-like view of a collection that reads and writes through the store."""
+        return StoreCollection(self, kind)
+
+    def wait_for_change(self, since: int, timeout: Optional[float] = None) -> int:
+        """Block until the store version passes `since` (or the timeout); returns the version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version > since, timeout)
+            return self.version
+
+    # ---- writes ------------------------------------------------------------
+
+    def put(self, kind: str, key: str, record) -> int:
+        """Add or replace a record; returns the collection's new version."""
+        with self._lock:
+            if self._db is not None:
+                self._write(kind, key, self._encode(record))
+            self._apply(kind, key, record)
+            return self._versions[kind]
+
+    def update(self, kind: str, key: str, fn: Callable[[object], object]):
+        """
+        Replace a record with fn(current record) as one atomic step: no write
+        from another thread, or another process sharing the file, can land
+        between the read and the write. fn returning None leaves it unchanged.
+
+        Returns:
+            The new record, or None if there was no record or nothing changed
+        """
+        with self._lock:
+            if self._db is None:
+                current = self.get(kind, key)
+                record = fn(current) if current is not None else None
+            else:
+                self._db.execute("BEGIN IMMEDIATE")  # holds other processes off until the write
+                try:
+                    self._sync()
+                    current = self.get(kind, key)
+                    record = fn(current) if current is not None else None
+                    if record is not None:
+                        self._insert(kind, key, self._encode(record))
+                    self._db.execute("COMMIT")
+                except BaseException:
+                    self._db.execute("ROLLBACK")
+                    raise
+            if record is not None:
+                self._apply(kind, key, record)
+            return record
+
+    def delete(self, kind: str, key: str) -> bool:
+        """Remove a record; returns whether it existed."""
+        with self._lock:
+            if key not in self._data.get(kind, {}):
+                return False
+            if self._db is not None:
+                self._write(kind, key, None)
+            self._apply(kind, key, None)
+            return True
+
+    def refresh(self) -> int:
+        """Apply changes other processes wrote to the SQLite file; returns how many."""
+        if self._db is None:
+            return 0
+        with self._lock:
+            return self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    # ---- internals ---------------------------------------------------------
+
+    def _apply(self, kind: str, key: str, record) -> None:
+        """Swap in a new copy of the collection; caller holds the lock."""
+        data = dict(self._data.get(kind, {}))
+        if record is None:
+            data.pop(key, None)
+        else:
+            data[key] = record
+        self._data[kind] = data
+        self._versions[kind] = self._versions.get(kind, 0) + 1
+        self.version += 1
+        self._changed.notify_all()
+
+    def _write(self, kind: str, key: str, data: Optional[str]) -> None:
+        """Persist one change (None = deleted) with the next row version; caller holds the lock."""
+        self._db.execute("BEGIN IMMEDIATE")  # one writer at a time across processes
+        try:
+            self._sync()
+            self._insert(kind, key, data)
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def _insert(self, kind: str, key: str, data: Optional[str]) -> None:
+        """Write one row with the next row version; caller is inside a write transaction."""
+        self._synced += 1
+        self._db.execute("INSERT OR REPLACE INTO records (kind, id, data, version) VALUES (?, ?, ?, ?)",
+                         (kind, key, data, self._synced))
+
+    @staticmethod
+    def _encode(record) -> str:
+        return json.dumps(asdict(record) if is_dataclass(record) else record)
+
+    def _sync(self) -> int:
+        """Load rows newer than the last one seen; caller holds the lock."""
+        rows = self._db.execute("SELECT kind, id, data, version FROM records WHERE version > ?"
+                                " ORDER BY version", (self._synced,)).fetchall()
+        for kind, key, data, version in rows:
+            record = None
+            if data is not None:
+                fields = json.loads(data)
+                codec = self.codecs.get(kind)
+                record = codec(**fields) if codec else fields
+            self._apply(kind, key, record)
+            self._synced = version
+        return len(rows)
+
+class StoreCollection(MutableMapping):
+    """
+    One collection of a SharedStore as a dict. Iteration and values() use
+    the snapshot taken when they start, so writers never disturb a loop.
+    """
+
+    def __init__(self, store: SharedStore, kind: str):
+        self.store = store
+        self.kind = kind
+
+    def __getitem__(self, key: str):
+        return self.store.items(self.kind)[key]
+
+    def __setitem__(self, key: str, record) -> None:
+        self.store.put(self.kind, key, record)
+
+    def __delitem__(self, key: str) -> None:
+        if not self.store.delete(self.kind, key):
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store.items(self.kind))
+
+    def __len__(self) -> int:
+        return len(self.store.items(self.kind))
+
+    def keys(self):
+        return self.store.items(self.kind).keys()
+
+    def values(self):
+        return self.store.items(self.kind).values()
+
+    def items(self):
+        return self.store.items(self.kind).items()
@@ -0,0 +1,112 @@
+"""
+Tests for the capacity-aware assignment optimizer, against brute force on small cases.
+"""
+import itertools
+import random
+from dataclasses import dataclass
+
+import pytest
+
+from assignment_optimizer import AssignmentOptimizer
+from test_resource_index import CATEGORIES, Resource, random_point
+
+@dataclass
+class Report:
+    id: str
+    lat: float
+    lon: float
+    category: str
+    urgency: int
+
+def make_case(seed, reports=7, resources=4):
+    rng = random.Random(seed)
+    res = [Resource(f"r{i}", rng.choice(CATEGORIES[:2]), *random_point(rng), rng.randint(0, 3))
+           for i in range(resources)]
+    res[0].capacity = max(res[0].capacity, reports - sum(r.capacity for r in res[1:]))
+    reps = [Report(f"t{i}", *random_point(rng), rng.choice(CATEGORIES[:2] + ["other"]), rng.randint(1, 5))
+            for i in range(reports)]
+    return reps, res
+
+def best_cost(optimizer, reports):
+    """Cheapest assignment of every report within capacity, by trying them all."""
+    rows = [optimizer._rows[r.id] for r in reports]
+    capacity = [int(c) for c in optimizer._capacity]
+    best = float("inf")
+    for columns in itertools.product(range(len(capacity)), repeat=len(rows)):
+        if all(columns.count(c) <= capacity[c] for c in range(len(capacity))):
+            best = min(best, sum(optimizer._cost[row, c] for row, c in zip(rows, columns)))
+    return best
+
+def check_capacity(optimizer, resources):
+    counts = {}
+    for resource_id in optimizer.assignments.values():
+        if resource_id:
+            counts[resource_id] = counts.get(resource_id, 0) + 1
+    assert all(counts.get(r.id, 0) <= r.capacity for r in resources)
+
+@pytest.mark.parametrize("seed", range(8))
+def test_matches_brute_force_optimum(seed):
+    reports, resources = make_case(seed)
+    optimizer = AssignmentOptimizer(resources)
+    optimizer.assign(reports)
+    check_capacity(optimizer, resources)
+    assert optimizer.total_cost() == pytest.approx(best_cost(optimizer, reports))
+
+def test_incremental_batches_and_releases_stay_optimal():
+    reports, resources = make_case(11, reports=8, resources=4)
+    optimizer = AssignmentOptimizer(resources)
+    optimizer.assign(reports[:3])
+    optimizer.assign(reports[3:])
+    assert optimizer.total_cost() == pytest.approx(best_cost(optimizer, reports))
+
+    optimizer.release(reports[0].id)
+    remaining = reports[1:]
+    assert optimizer.total_cost() == pytest.approx(best_cost(optimizer, remaining))
+    check_capacity(optimizer, resources)
+
+def test_rerouting_beats_greedy_when_the_near_resource_is_scarce():
+    resources = [Resource("near", "shelter", 25.770, -80.190, 1), Resource("far", "shelter", 25.900, -80.190, 1)]
+    reports = [Report("low", 25.760, -80.190, "shelter", 1),    # equally close to near, farther from far
+               Report("high", 25.775, -80.190, "shelter", 5)]
+    optimizer = AssignmentOptimizer(resources)
+    assert optimizer.assign(reports[:1]) == {"low": "near"}
+    optimizer.assign(reports[1:])
+    assert optimizer.assignments == {"low": "far", "high": "near"}
+
+    optimizer.pin("high")
+    optimizer.set_capacity("near", 2)
+    assert optimizer.assignments == {"low": "near", "high": "near"}
+
+def test_pinned_overflow_does_not_hide_free_capacity_elsewhere():
+    resources = [Resource("A", "shelter", 25.770, -80.190, 2), Resource("B", "shelter", 25.900, -80.190, 1)]
+    optimizer = AssignmentOptimizer(resources)
+    optimizer.assign([Report("a1", 25.771, -80.190, "shelter", 3), Report("a2", 25.772, -80.190, "shelter", 3)])
+    optimizer.pin("a1")
+    optimizer.pin("a2")
+    optimizer.set_capacity("A", 0)  # closed, but its two reports are already on their way
+    assert optimizer.remaining() == {"A": 0, "B": 1}
+    assert optimizer.assign([Report("new", 25.899, -80.190, "shelter", 5)]) == {"new": "B"}
+
+def test_waits_for_capacity_and_falls_back_across_categories():
+    resources = [Resource("food", "food", 25.77, -80.19, 1)]
+    optimizer = AssignmentOptimizer(resources)
+    assert optimizer.assign([Report("a", 25.7, -80.3, "shelter", 2), Report("b", 25.7, -80.3, "food", 4)]) == \
+        {"a": None, "b": "food"}
+    optimizer.release("b")
+    assert optimizer.assignments == {"a": "food"}
+
+def test_budget_places_greedily_then_improves():
+    reports, resources = make_case(5, reports=8, resources=4)
+    optimizer = AssignmentOptimizer(resources)
+    optimizer.assign(reports, budget=0)
+    assert optimizer.stats['greedy'] > 0
+    check_capacity(optimizer, resources)
+    optimizer.assign([])
+    assert optimizer.total_cost() == pytest.approx(best_cost(optimizer, reports))
+
+def test_handles_dicts():
+    optimizer = AssignmentOptimizer([{'id': "w", 'type': "water", 'lat': 25.8, 'lon': -80.2, 'capacity': 2}],
+                                    get=dict.get)
+    assert optimizer.assign([{'id': "x", 'lat': 25.7, 'lon': -80.2, 'category': "water", 'priority': 3}]) == \
+        {"x": "w"}
+    assert optimizer.remaining() == {"w": 1}
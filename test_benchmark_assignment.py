@@ -0,0 +1,30 @@
+"""
+Tests for the resource assignment benchmark.
+"""
+from benchmark_assignment import compare_reports, generate_scenario, greedy_assign, run_benchmark
+
+def test_scenario_is_seeded_with_the_requested_supply():
+    reports, resources = generate_scenario(200, 12, supply=0.5, seed=3)
+    assert (reports, resources) == generate_scenario(200, 12, supply=0.5, seed=3)
+    assert abs(sum(r.capacity for r in resources) - 100) <= 12
+    assert {r.urgency for r in reports} == {1, 2, 3, 4, 5}
+
+def test_greedy_respects_capacity_without_touching_the_input():
+    reports, resources = generate_scenario(120, 6, supply=0.5, seed=1)
+    assignment = greedy_assign(reports, resources)
+    assert sum(1 for resource_id in assignment.values() if resource_id) == sum(r.capacity for r in resources)
+    for resource in resources:
+        assert list(assignment.values()).count(resource.id) == resource.capacity
+
+def test_optimizer_beats_greedy_on_weighted_distance():
+    report = run_benchmark(300, 20, supply=0.9, seed=7, batch=50, budget=1.0)
+    greedy, optimized = report['results']['greedy'], report['results']['optimized']
+    assert optimized['matched'] == greedy['matched']
+    assert optimized['weighted_km'] < greedy['weighted_km']
+    assert optimized['urgent_served'] >= greedy['urgent_served']
+    assert report['results']['optimized_batches']['weighted_km'] <= greedy['weighted_km']
+    assert compare_reports(report, report) == []
+
+    worse = {'results': {name: dict(r, weighted_km=r['weighted_km'] * 2) for name, r in report['results'].items()}}
+    assert len(compare_reports(worse, report)) == 0
+    assert len(compare_reports(report, worse)) == 3
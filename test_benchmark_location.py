@@ -0,0 +1,47 @@
+"""
+Tests for the location extraction accuracy and latency harness.
+"""
+from benchmark_location import (CORPUS, STANDIN_PLACES, CorpusNominatim, compare_reports,
+                                run_benchmark, score)
+from location_extractor import LocationInfo
+
+def test_standin_matches_known_names_in_queries():
+    server = CorpusNominatim(STANDIN_PLACES)
+    [place] = server.search("1234 SW 8th Street Miami FL, Miami-Dade County, Florida, USA")
+    assert place['display_name'] == "sw 8th street"
+    assert server.search("somewhere unknown") == []
+    server.stop()
+
+def test_score_counts_radius_hits_and_false_positives():
+    results = [
+        ((25.7904, -80.2115), LocationInfo(latitude=25.7904, longitude=-80.2115)),
+        ((25.7904, -80.2115), LocationInfo(latitude=25.80, longitude=-80.2115)),  # ~1.07 km off
+        ((25.7904, -80.2115), LocationInfo()),
+        (None, LocationInfo(latitude=25.77, longitude=-80.19)),
+    ]
+    accuracy = score(results)
+    assert accuracy['located'] == round(2 / 3, 4)
+    assert (accuracy['within_km']['1'], accuracy['within_km']['2']) == (round(1 / 3, 4), round(2 / 3, 4))
+    assert accuracy['false_positives'] == 1
+
+def test_run_benchmark_compares_strategies():
+    corpus = CORPUS[:6] + CORPUS[-2:]
+    report = run_benchmark(['geocoder', 'offline', 'gazetteer+grid+geocoder'], corpus=corpus)
+    geocoder, offline = report['results']['geocoder'], report['results']['offline']
+    assert geocoder['texts'] == offline['texts'] == len(corpus)
+    assert offline['network_calls'] == 0 and geocoder['network_calls'] > 0
+    assert {'spacy', 'patterns', 'grid', 'geocode', 'cache', 'gazetteer'} <= set(offline['stages'])
+    assert offline['accuracy']['within_km']['2'] > geocoder['accuracy']['within_km']['2']
+    assert offline['accuracy']['false_positives'] == 0
+    assert compare_reports(report, report) == []
+
+    worse = {'results': {name: dict(r, accuracy=dict(r['accuracy'], false_positives=3))
+                         for name, r in report['results'].items()}}
+    assert len(compare_reports(report, worse)) == 3
+
+def test_places_missing_from_the_gazetteer_need_the_geocoder():
+    corpus = CORPUS[-12:-4]  # Fairchild Tropical Botanic Garden ... Jungle Island
+    report = run_benchmark(['gazetteer+geocoder', 'offline'], corpus=corpus)
+    online, offline = report['results']['gazetteer+geocoder'], report['results']['offline']
+    assert online['accuracy']['within_km']['1'] > 0.5
+    assert offline['accuracy']['within_km']['2'] == 0 and offline['accuracy']['false_positives'] == 0
@@ -0,0 +1,34 @@
+"""
+Tests for the prioritizer benchmark suite.
+"""
+from benchmark_prioritizer import (
+    compare_reports, generate_corpus, percentile, prioritizer_integration, run_benchmark
+)
+
+def test_corpus_is_seeded_and_varied():
+    first = list(generate_corpus(200, seed=7))
+    assert first == list(generate_corpus(200, seed=7))
+    assert first != list(generate_corpus(200, seed=8))
+    assert {t['expected_priority'] for t in first} == {1, 2, 3, 4, 5}
+    assert len({len(t['text']) for t in first}) > 20
+
+def test_run_benchmark_reports_every_target():
+    sessions = len(prioritizer_integration.conversation_store)
+    report = run_benchmark(300, seed=1)
+    assert len(prioritizer_integration.conversation_store) == sessions  # no sessions left behind
+    assert set(report['results']) == {
+        'enhanced_priority_classification', 'classify_with_conversation', 'reclassify_with_answers'
+    }
+    for result in report['results'].values():
+        assert result['tickets'] == 300
+        assert result['tickets_per_sec'] > 0
+        assert result['latency_ms']['p50'] <= result['latency_ms']['p99'] <= result['latency_ms']['max']
+    assert compare_reports(report, report) == []
+
+    slower = {'results': {name: dict(r, tickets_per_sec=r['tickets_per_sec'] / 2)
+                          for name, r in report['results'].items()}}
+    assert len(compare_reports(report, slower)) == 3
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert (percentile(values, 50), percentile(values, 99), percentile([], 50)) == (50, 99, 0.0)
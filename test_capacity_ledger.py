@@ -0,0 +1,100 @@
+"""
+Tests for the capacity ledger: reservations, expiry, compare-and-set and concurrent writers.
+"""
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from capacity_ledger import CapacityLedger
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_reserve_commit_release():
+    ledger = CapacityLedger()
+    assert ledger.register("rc4", 2) == 2
+    assert ledger.register("rc4", 40) == 2  # a second session seeding it changes nothing
+
+    first = ledger.reserve("rc4", holder="report-1")
+    second = ledger.reserve("rc4", holder="report-2")
+    assert ledger.reserve("rc4") is None
+    assert ledger.snapshot()["rc4"]['held'] == 2
+
+    assert ledger.commit(first.reservation_id)
+    assert not ledger.commit(first.reservation_id)   # already settled
+    assert not ledger.release(first.reservation_id)
+    assert ledger.release(second.reservation_id)
+    assert (ledger.available("rc4"), ledger.snapshot()["rc4"]['held']) == (1, 0)
+    assert ledger.reserve("unknown") is None
+
+def test_holds_expire_and_cannot_be_committed_late():
+    clock = Clock()
+    ledger = CapacityLedger(hold_seconds=30, clock=clock)
+    ledger.register("rc3", 1)
+    reservation = ledger.reserve("rc3", holder="report-1")
+    clock.now = 29
+    assert ledger.available("rc3") == 0
+    clock.now = 30
+    assert ledger.available("rc3") == 1
+    assert not ledger.commit(reservation.reservation_id)
+    assert ledger.stats['expired'] == 1
+
+    ledger.reserve("rc3", hold_seconds=5)
+    clock.now = 40
+    assert ledger.expire() == 1
+
+    # A snapshot expires overdue holds too, so copies of the counts never keep them
+    ledger.register("rc4", 2)
+    ledger.reserve("rc4", hold_seconds=5)
+    assert ledger.snapshot(["rc4", "unknown"]) == {"rc4": {'available': 1, 'held': 1, 'version': 2}}
+    clock.now = 50
+    assert ledger.snapshot(["rc4"])["rc4"]['held'] == 0
+
+def test_compare_and_set():
+    ledger = CapacityLedger()
+    ledger.register("rc1", 150)
+    ledger.reserve("rc1")
+    assert not ledger.set_capacity("rc1", 200, expected=150)
+    assert ledger.set_capacity("rc1", 200, expected=149)
+    assert ledger.snapshot()["rc1"] == {'available': 200, 'held': 1, 'version': 3}
+
+def test_concurrent_writers_never_double_book(tmp_path):
+    audit_path = tmp_path / "audit.jsonl"
+    ledger = CapacityLedger(audit_path=str(audit_path))
+    for i in range(4):
+        ledger.register(f"shelter{i}", 25)
+    start = threading.Barrier(16)
+
+    def matcher(worker):
+        start.wait()
+        won = []
+        for attempt in range(20):
+            reservation = ledger.reserve_first([f"shelter{(worker + k) % 4}" for k in range(4)],
+                                               holder=f"w{worker}-{attempt}")
+            if reservation is not None:
+                won.append(reservation)
+                if attempt % 3 == 0:
+                    ledger.release(reservation.reservation_id)
+                    won.pop()
+                else:
+                    ledger.commit(reservation.reservation_id)
+        return won
+
+    with ThreadPoolExecutor(16) as pool:
+        committed = [r for won in pool.map(matcher, range(16)) for r in won]
+
+    assert len(committed) == 100  # every cot taken exactly once
+    assert all(ledger.available(f"shelter{i}") == 0 for i in range(4))
+    ledger.close()
+
+    entries = [json.loads(line) for line in audit_path.read_text().splitlines()]
+    assert [e['seq'] for e in entries] == list(range(1, len(entries) + 1))
+    assert len(entries) == len(ledger.audit())
+    for i in range(4):
+        trail = [e for e in entries if e['resource_id'] == f"shelter{i}"]
+        assert all(e['available'] >= 0 for e in trail)
+        assert sum(e['units'] for e in trail) == 0
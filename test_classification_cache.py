@@ -0,0 +1,64 @@
+"""
+Tests for the classification result cache.
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add the PrioritizerAgent to path
+prioritizer_path = Path(__file__).parent / "PrioritizerAgent"
+sys.path.append(str(prioritizer_path))
+
+import prioritizer_integration
+from classification_cache import ClassificationCache, normalize_text
+
+def test_lru_eviction_and_counters():
+    cache = ClassificationCache(maxsize=2, ttl=None)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1      # "a" is now most recently used
+    cache.set("c", 3)               # evicts "b"
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (1, 1, 1, 2)
+
+def test_ttl_expiry_and_invalidation():
+    cache = ClassificationCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.stats()['expirations'] == 1
+
+    cache.ttl = None
+    cache.set("b", 2)
+    cache.invalidate()
+    assert len(cache) == 0
+
+def test_classify_ticket_priority_is_memoized_on_normalized_text():
+    cache = prioritizer_integration.classification_cache
+    cache.invalidate()
+    first = prioritizer_integration.classify_ticket_priority("  Need WATER now\n")
+    first['needs_clarification'] = True  # callers mutate results
+    hits = cache.hits
+    second = prioritizer_integration.classify_ticket_priority("need water now")
+    assert cache.hits == hits + 1
+    assert 'needs_clarification' not in second
+    assert normalize_text("  Need  WATER\n now ") == "need  water\n now"
+
+def test_inner_whitespace_is_part_of_the_key():
+    prioritizer_integration.classification_cache.invalidate()
+    for text, single_spaced in [("Dad is not\nbreathing", "Dad is not breathing"),
+                                ("heart  attack on 5th street", "heart attack on 5th street")]:
+        # Cached or not, a result is what the classifier gives for exactly this text
+        for _ in range(2):
+            for variant in (text, single_spaced):
+                expected = prioritizer_integration.enhanced_priority_classification(variant)
+                assert prioritizer_integration.classify_ticket_priority(variant) == expected
+        assert prioritizer_integration.classify_ticket_priority(text)['priority'] == 3
+        assert prioritizer_integration.classify_ticket_priority(single_spaced)['priority'] == 5
+
+def test_reload_indicator_tables_invalidates_cache():
+    prioritizer_integration.classify_ticket_priority("Roof damage, not urgent")
+    assert len(prioritizer_integration.classification_cache) > 0
+    prioritizer_integration.reload_indicator_tables()
+    assert len(prioritizer_integration.classification_cache) == 0
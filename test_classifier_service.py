@@ -0,0 +1,25 @@
+"""
+Tests for the preloaded PrioritizerAgent service used by the Streamlit app.
+"""
+import sys
+
+from PrioritizerAgent.classifier_service import PrioritizerService
+
+def test_service_loads_without_adk_and_reports_startup():
+    service = PrioritizerService.load()
+    assert service.startup_seconds > 0
+    assert service.stats()['startup_ms'] >= 0
+    # The ADK agent module is only imported when accessed
+    assert "PrioritizerAgent.agent" not in sys.modules
+
+def test_service_routes_through_one_module():
+    path_length = len(sys.path)
+    service = PrioritizerService.load()
+    result = service.classify_with_conversation("Someone needs help")
+    assert result['needs_clarification']
+    qa = [(result['clarifying_questions'][0], "Yes, they are trapped")]
+    updated = service.answer_questions("Someone needs help", qa, result['conversation_id'])
+    assert updated['priority'] > result['priority']
+    service.end_conversation(result['conversation_id'])
+    assert service.classify("Need water") == service.classify("need  WATER")
+    assert len(sys.path) == path_length
@@ -0,0 +1,53 @@
+"""
+Tests for the prioritizer conversation session store.
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add the PrioritizerAgent to path
+prioritizer_path = Path(__file__).parent / "PrioritizerAgent"
+sys.path.append(str(prioritizer_path))
+
+from prioritizer_integration import (
+    PrioritizerConversation, answer_questions_and_reclassify,
+    classify_with_conversation, conversation_store, end_conversation
+)
+from session_store import ConversationStore
+
+def test_follow_up_reuses_stored_conversation():
+    description = "Someone needs help"
+    result = classify_with_conversation(description)
+    assert result['needs_clarification']
+    conversation_id = result['conversation_id']
+    session = conversation_store.get(conversation_id)
+    assert session.questions == result['clarifying_questions']
+
+    qa_pairs = [(result['clarifying_questions'][0], "Yes, trapped under debris")]
+    updated = answer_questions_and_reclassify(description, qa_pairs, conversation_id)
+    assert updated['conversation_id'] == conversation_id
+    assert session.conversation.conversation_history == qa_pairs
+
+    expected = PrioritizerConversation().reclassify_with_answers(description, qa_pairs)
+    assert {k: v for k, v in updated.items() if k not in ('conversation_id', 'initial_priority')} == expected
+
+    end_conversation(conversation_id)
+    assert conversation_store.get(conversation_id) is None
+
+def test_unknown_conversation_falls_back_to_fresh_state():
+    updated = answer_questions_and_reclassify("Need help", [("How many people are affected?", "two")], "missing")
+    assert updated['qa_boost'] == 1
+    assert 'conversation_id' not in updated
+
+def test_store_evicts_by_size_and_ttl():
+    store = ConversationStore(max_sessions=2, ttl=0.05)
+    first = store.create("a", {}, [], None)
+    store.create("b", {}, [], None)
+    store.create("c", {}, [], None)
+    assert store.get(first.conversation_id) is None
+    assert store.stats()['evicted'] == 1
+
+    time.sleep(0.06)
+    stats = store.stats()
+    assert stats['size'] == 0
+    assert stats['expired'] == 2
@@ -0,0 +1,85 @@
+"""
+Tests for the offline Miami-Dade gazetteer.
+"""
+import math
+from types import SimpleNamespace
+
+from geocode_cache import GeocodeCache
+from gazetteer import load_default_gazetteer
+from location_extractor import LocationExtractor
+
+# The samples from location_extractor.test_location_extraction
+SAMPLES = {
+    "Someone stopped breathing at Doral CVS at 107th Street": (25.82, -80.36),
+    "Car accident at the intersection of Biscayne Blvd and 125th Street": (25.8906, -80.1616),
+    "Fire at Miami International Airport Terminal 3": (25.80, -80.29),
+    "Medical emergency at Jackson Memorial Hospital emergency room": (25.79, -80.21),
+    "Flooding at 1234 SW 8th Street Miami FL": (25.77, -80.22),
+    "Person trapped at Aventura Mall near Nordstrom": (25.96, -80.14),
+    "Gas leak reported at University of Miami campus": (25.72, -80.28),
+    "Building collapse at downtown Miami near Bayside": (25.78, -80.19),
+}
+
+# The gazetteer has one point for all of Biscayne Boulevard, ~10 km away
+NEEDS_GEOCODER = {"Car accident at the intersection of Biscayne Blvd and 125th Street"}
+
+class OfflineGeocoder:
+    def geocode(self, query):
+        raise AssertionError("the network geocoder should not be needed")
+
+class RecordingGeocoder:
+    """Answers every query with one point and remembers the queries."""
+
+    def __init__(self, latitude, longitude):
+        self.point = (latitude, longitude)
+        self.queries = []
+
+    def geocode(self, query):
+        self.queries.append(query)
+        return SimpleNamespace(latitude=self.point[0], longitude=self.point[1], address=query)
+
+def km_between(lat1, lon1, lat2, lon2):
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1) * math.cos(math.radians(lat1))
+    return 6371 * math.hypot(dlat, dlon)
+
+def test_sample_cases_resolve_offline():
+    extractor = LocationExtractor(geocode_cache=GeocodeCache(":memory:"))
+    extractor.geocoder = None
+    for text, (lat, lon) in SAMPLES.items():
+        if text in NEEDS_GEOCODER:
+            continue
+        info = extractor.extract_location(text)
+        assert info.latitude is not None, text
+        assert km_between(info.latitude, info.longitude, lat, lon) < 2, text
+
+def test_street_matches_still_reach_the_geocoder():
+    text = "Car accident at the intersection of Biscayne Blvd and 125th Street"
+    extractor = LocationExtractor(geocode_cache=GeocodeCache(":memory:"))
+    extractor.geocoder = RecordingGeocoder(*SAMPLES[text])
+    info = extractor.extract_location(text)
+    assert km_between(info.latitude, info.longitude, *SAMPLES[text]) < 1
+    assert "geocoding" in info.extraction_method
+
+    # A house number on a street off the numbered grid
+    extractor.geocoder.point = (25.7955, -80.1285)
+    info = extractor.extract_location("Fire at 2000 Collins Avenue, Miami Beach")
+    assert extractor.geocoder.queries[-1].startswith("2000 Collins Avenue")
+    assert (info.latitude, info.longitude) == (25.7955, -80.1285)
+
+def test_confident_matches_skip_the_geocoder():
+    extractor = LocationExtractor(geocode_cache=GeocodeCache(":memory:"))
+    extractor.geocoder = OfflineGeocoder()
+    info = extractor.extract_location("Fire at Miami International Airport Terminal 3")
+    assert info.confidence == 0.85
+
+def test_lookup_strategies():
+    gazetteer = load_default_gazetteer()
+    landmark = gazetteer.resolve("Building collapse at downtown Miami near the Bayside")
+    assert (landmark.entry.name, landmark.method) == ("Bayside Marketplace", "gazetteer_exact")
+    assert gazetteer.resolve("water rising in north miami beach").entry.name == "North Miami Beach"
+    assert gazetteer.resolve("near the seaquarium").method == "gazetteer_token"
+    fuzzy = gazetteer.resolve("Trapped near Avenura Mall")
+    assert (fuzzy.entry.name, fuzzy.method) == ("Aventura Mall", "gazetteer_fuzzy")
+    assert gazetteer.resolve("Flooding on NW 8th Street") is None
+    assert gazetteer.resolve("Need water for my family") is None
@@ -0,0 +1,55 @@
+"""
+Tests for vectorized distances and bulk resource matching.
+"""
+import random
+from dataclasses import dataclass
+
+import numpy as np
+
+from geo_distance import distance_chunks, haversine_matrix, match_resources_bulk
+from test_resource_index import CATEGORIES, Resource, haversine, linear_match, random_point
+
+@dataclass
+class Report:
+    lat: float
+    lon: float
+    category: str
+
+def make_resources(rng, count):
+    resources = {}
+    for i in range(count):
+        lat, lon = random_point(rng)
+        resources[f"r{i}"] = Resource(f"r{i}", rng.choice(CATEGORIES[:4]), lat, lon, rng.choice([0, 5, 40]))
+    return resources
+
+def test_matrix_matches_scalar_haversine():
+    rng = random.Random(1)
+    a = [random_point(rng) for _ in range(7)]
+    b = [random_point(rng) for _ in range(5)]
+    matrix = haversine_matrix([p[0] for p in a], [p[1] for p in a], [p[0] for p in b], [p[1] for p in b])
+    expected = [[haversine(*p, *q) for q in b] for p in a]
+    assert matrix.shape == (7, 5)
+    assert np.allclose(matrix, expected, rtol=1e-12)
+
+def test_chunks_cover_every_row_within_the_cell_limit():
+    lats = np.linspace(25.3, 25.9, 103)
+    chunks = list(distance_chunks(lats, lats, lats[:10], lats[:10], max_cells=200))
+    assert [start for start, _ in chunks] == list(range(0, 103, 20))
+    assert all(block.size <= 200 for _, block in chunks)
+    assert sum(len(block) for _, block in chunks) == 103
+
+def test_bulk_matches_one_at_a_time():
+    rng = random.Random(5)
+    resources = make_resources(rng, 300)
+    reports = [Report(*random_point(rng), rng.choice(CATEGORIES)) for _ in range(500)]
+    expected = [linear_match(resources, rep.lat, rep.lon, rep.category) for rep in reports]
+    assert match_resources_bulk(reports, resources.values()) == expected
+    assert match_resources_bulk(reports, resources.values(), max_cells=1000) == expected
+
+def test_bulk_falls_back_and_handles_dicts():
+    resources = [{'id': "food", 'type': "food", 'lat': 25.77, 'lon': -80.19, 'capacity': 3},
+                 {'id': "shelter", 'type': "shelter", 'lat': 25.70, 'lon': -80.30, 'capacity': 0}]
+    reports = [{'lat': 25.70, 'lon': -80.30, 'category': "shelter"}, {'lat': 25.7, 'lon': -80.3}]
+    assert [r['id'] for r in match_resources_bulk(reports, resources, get=dict.get)] == ["food", "food"]
+    assert match_resources_bulk(reports, resources[1:], get=dict.get) == [None, None]
+    assert match_resources_bulk([], resources, get=dict.get) == []
@@ -0,0 +1,61 @@
+"""
+Tests for the persistent geocode cache.
+"""
+import time
+
+from geocode_cache import MISS, GeocodeCache
+from location_extractor import GEOCODE_CONTEXT, LocationExtractor
+
+class FakeLocation:
+    def __init__(self, latitude, longitude, address):
+        self.latitude, self.longitude, self.address = latitude, longitude, address
+
+class FakeGeocoder:
+    """Knows one landmark, only when queried with the Miami-Dade context."""
+
+    def __init__(self):
+        self.queries = []
+
+    def geocode(self, query):
+        self.queries.append(query)
+        if query.lower().startswith("jackson memorial hospital,"):
+            return FakeLocation(25.7904, -80.2115, "Jackson Memorial Hospital, Miami")
+        return None
+
+def test_results_persist_across_instances(tmp_path):
+    path = str(tmp_path / "geocodes.sqlite3")
+    cache = GeocodeCache(path)
+    assert cache.get("Aventura Mall", "Miami") is MISS
+    cache.set("Aventura Mall", "Miami", (25.9565, -80.1429, "Aventura Mall"))
+    cache.set("Nowhere Rd", "Miami", None)
+    cache.close()
+
+    reopened = GeocodeCache(path)
+    assert reopened.get("  aventura mall. ", "miami") == (25.9565, -80.1429, "Aventura Mall")
+    assert reopened.get("Aventura Mall", "") is MISS  # context is part of the key
+    assert reopened.get("Nowhere Rd", "Miami") is None
+    stats = reopened.stats()
+    assert (stats['disk_hits'], stats['negative_hits'], stats['misses']) == (2, 1, 1)
+
+def test_entries_expire(tmp_path):
+    cache = GeocodeCache(str(tmp_path / "g.sqlite3"), ttl=0.01, negative_ttl=0.01)
+    cache.set("Doral", "", (25.81, -80.35, "Doral"))
+    time.sleep(0.02)
+    assert cache.get("Doral") is MISS
+    assert cache.purge_expired() == 1
+
+def test_extractor_geocodes_each_address_once():
+    geocoder = FakeGeocoder()
+    extractor = LocationExtractor(geocode_cache=GeocodeCache(":memory:"))
+    extractor.geocoder = geocoder
+    for _ in range(3):
+        info = extractor._geocode_address("Jackson Memorial Hospital")
+        assert (info.latitude, info.extraction_method) == (25.7904, "geocoding")
+        assert extractor._geocode_address("Unknown Place").latitude is None
+    # One query for the landmark, two (with and without context) for the miss
+    assert geocoder.queries == [
+        f"Jackson Memorial Hospital, {GEOCODE_CONTEXT}",
+        f"Unknown Place, {GEOCODE_CONTEXT}",
+        "Unknown Place",
+    ]
+    assert extractor.geocode_cache.stats()['memory_hits'] == 6
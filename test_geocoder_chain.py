@@ -0,0 +1,95 @@
+"""
+Tests for the geocoder provider chain and its circuit breakers.
+"""
+import time
+
+import pytest
+
+from fake_nominatim import FakeNominatim
+from geocode_cache import MISS, GeocodeCache
+from geocoder_chain import CircuitBreaker, ProviderChain, RemoteProvider, providers_from_env
+from geocoding_service import GeocoderUnavailable, GeocodingService, NominatimBackend
+from location_extractor import LocationExtractor
+
+PLACES = {"Bayside Marketplace": (25.7784, -80.1867, "Bayside Marketplace, Miami")}
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_service(*servers, timeout=1.0, failures=3, reset=60.0):
+    chain = ProviderChain([
+        RemoteProvider(f"server{i}", NominatimBackend(server.url, timeout=5), timeout,
+                       CircuitBreaker(failures, reset))
+        for i, server in enumerate(servers)
+    ])
+    return GeocodingService(chain, cache=GeocodeCache(":memory:"), rate=100.0), chain
+
+def test_breaker_opens_and_recovers_through_a_trial_call():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert (breaker.state, breaker.allow()) == ("open", False)
+
+    clock.now = 30
+    assert breaker.allow()          # the trial call
+    assert not breaker.allow()      # only one at a time
+    breaker.record_failure()
+    assert breaker.state == "open"  # reopened for another 30 s
+
+    clock.now = 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert (breaker.state, breaker.failures) == ("closed", 0)
+
+def test_chain_fails_over_to_the_next_provider():
+    with FakeNominatim(PLACES) as down, FakeNominatim(PLACES) as up:
+        down.status = 503
+        service, chain = make_service(down, up)
+        assert service.submit("Bayside Marketplace").result(timeout=5)[0] == 25.7784
+        assert [p['failures'] for p in chain.status()] == [1, 0]
+        service.close()
+
+def test_open_circuits_fail_fast_without_caching():
+    with FakeNominatim(PLACES, latency=1.0) as slow:
+        service, chain = make_service(slow, timeout=0.1, failures=2)
+        for address in ("Address 1", "Address 2"):
+            with pytest.raises(TimeoutError):
+                service.submit(address).result(timeout=5)
+        assert chain.status()[0]['state'] == "open"
+
+        started = time.monotonic()
+        with pytest.raises(GeocoderUnavailable):
+            service.submit("Bayside Marketplace").result(timeout=5)
+        assert time.monotonic() - started < 0.05
+        assert service.cache.get("Bayside Marketplace") is MISS  # not cached as "not found"
+        assert service.stats['unavailable'] == 1
+        service.close()
+
+def test_extraction_does_not_wait_on_a_dead_geocoder():
+    with FakeNominatim(PLACES, latency=2.0) as slow:
+        service, chain = make_service(slow, timeout=0.2, failures=1)
+        extractor = LocationExtractor(geocode_cache=service.cache, gazetteer=False,
+                                      geocoding_service=service, spacy=False)
+        started = time.monotonic()
+        assert extractor.extract_location("Help at Bayside Marketplace", deadline=1.0).latitude is None
+        assert time.monotonic() - started < 1.1
+        time.sleep(0.2)  # the timeout opens the breaker
+
+        started = time.monotonic()
+        assert extractor.extract_location("Help at Bayside Marketplace").latitude is None
+        assert time.monotonic() - started < 0.05
+        service.close()
+
+def test_providers_from_env(monkeypatch):
+    monkeypatch.setenv("GEOCODE_PROVIDERS", "nominatim, http://localhost:8080, photon")
+    monkeypatch.setenv("GEOCODE_BREAKER_FAILURES", "5")
+    providers = providers_from_env(geocoder=object())
+    assert [p.name for p in providers] == ["nominatim", "http://localhost:8080"]
+    assert providers[1].breaker.failure_threshold == 5
+    assert [p.name for p in providers_from_env(geocoder=None)] == ["http://localhost:8080"]
@@ -0,0 +1,104 @@
+"""
+Tests for the asynchronous geocoding service, against a local fake Nominatim.
+"""
+import concurrent.futures
+import time
+
+import pytest
+
+from fake_nominatim import FakeNominatim
+from geocode_cache import GeocodeCache
+from geocoding_service import GeocodeQueueFull, GeocodingService, NominatimBackend
+from location_extractor import GEOCODE_CONTEXT, LocationExtractor
+
+PLACES = {
+    f"Jackson Memorial Hospital, {GEOCODE_CONTEXT}": (25.7904, -80.2115, "Jackson Memorial Hospital"),
+    "Bayside Marketplace": (25.7784, -80.1867, "Bayside Marketplace, Miami"),
+}
+
+def make_service(server, **options):
+    options.setdefault("rate", 100.0)
+    return GeocodingService(NominatimBackend(server.url, timeout=5), cache=GeocodeCache(":memory:"), **options)
+
+def test_concurrent_requests_share_one_call():
+    with FakeNominatim(PLACES, latency=0.2) as server:
+        service = make_service(server)
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            futures = list(pool.map(lambda _: service.submit("Bayside Marketplace"), range(8)))
+        results = {future.result(timeout=5) for future in futures}
+        assert results == {(25.7784, -80.1867, "Bayside Marketplace, Miami")}
+        assert server.queries == ["Bayside Marketplace"]
+        assert service.stats['coalesced'] == 7
+
+        # Now cached, including the "not found" answer
+        assert service.submit(" bayside marketplace.").result() == results.pop()
+        assert service.submit("Nowhere").result(timeout=5) is None
+        assert service.submit("Nowhere").result() is None
+        assert len(server.queries) == 2
+        service.close()
+
+def test_token_bucket_spaces_out_requests():
+    with FakeNominatim(PLACES) as server:
+        service = make_service(server, rate=20.0, burst=1)
+        started = time.monotonic()
+        futures = [service.submit(f"Address {i}") for i in range(5)]
+        assert [f.result(timeout=5) for f in futures] == [None] * 5
+        assert time.monotonic() - started >= 4 / 20.0 * 0.9
+        assert len(server.queries) == 5
+        service.close()
+
+def test_full_queue_rejects_new_lookups():
+    with FakeNominatim(PLACES, latency=0.3) as server:
+        service = make_service(server, max_queue=2, concurrency=1)
+        futures = [service.submit(f"Address {i}") for i in range(6)]
+        rejected = [f for f in futures if isinstance(f.exception(timeout=5), GeocodeQueueFull)]
+        assert rejected and service.stats['rejected'] == len(rejected)
+        assert all(f.result() is None for f in futures if f not in rejected)
+        service.close()
+
+def test_resolve_prefers_context_and_falls_back():
+    with FakeNominatim(PLACES) as server:
+        service = make_service(server)
+        contexts = (GEOCODE_CONTEXT, "")
+        result, context = service.resolve("Jackson Memorial Hospital", contexts, budget=5)
+        assert (result[0], context) == (25.7904, GEOCODE_CONTEXT)
+        assert server.queries == [f"Jackson Memorial Hospital, {GEOCODE_CONTEXT}"]
+
+        result, context = service.resolve("Bayside Marketplace", contexts, budget=5)
+        assert (result[0], context) == (25.7784, "")
+        assert service.resolve("Nowhere", contexts, budget=5) == (None, None)
+        service.close()
+
+def test_resolve_stays_within_one_budget():
+    with FakeNominatim(PLACES, latency=0.6) as server:
+        service = make_service(server)
+        started = time.monotonic()
+        assert service.resolve("Bayside Marketplace", (GEOCODE_CONTEXT, ""), budget=0.4) == (None, None)
+        elapsed = time.monotonic() - started
+        assert elapsed < 0.55
+        # Both lookups went out within the budget and still fill the cache
+        assert len(server.queries) == 2
+        time.sleep(0.5)
+        assert service.cache.get("Bayside Marketplace")[0] == 25.7784
+        service.close()
+
+def test_server_errors_are_not_cached():
+    with FakeNominatim(PLACES) as server:
+        server.status = 503
+        service = make_service(server)
+        with pytest.raises(Exception):
+            service.submit("Bayside Marketplace").result(timeout=5)
+        assert service.stats['errors'] == 1
+        server.status = 200
+        assert service.submit("Bayside Marketplace").result(timeout=5)[0] == 25.7784
+        service.close()
+
+def test_extractor_geocodes_through_the_service():
+    with FakeNominatim(PLACES) as server:
+        service = make_service(server)
+        extractor = LocationExtractor(geocode_cache=service.cache, geocoding_service=service)
+        info = extractor._geocode_address("Jackson Memorial Hospital")
+        assert (info.latitude, info.extraction_method, info.confidence) == (25.7904, "geocoding", 0.8)
+        info = extractor._geocode_address("Bayside Marketplace")
+        assert (info.latitude, info.extraction_method, info.confidence) == (25.7784, "geocoding_fallback", 0.6)
+        service.close()
@@ -0,0 +1,50 @@
+"""
+Tests for the Miami-Dade grid address resolver.
+"""
+from geocode_cache import GeocodeCache
+from grid_resolver import resolve_grid_location
+from location_extractor import LocationExtractor
+from test_gazetteer import OfflineGeocoder, km_between
+
+# Surveyed coordinates of grid addresses and intersections
+KNOWN_POINTS = {
+    "Flooding at 1234 SW 8th Street": (25.7655, -80.2153),
+    "Crash at NW 36th Street and NW 27th Avenue": (25.8093, -80.2375),
+    "Power lines down at SW 8th St & 27th Ave": (25.7654, -80.2381),
+    "Shelter at 1500 NW 7th Ave": (25.7889, -80.2077),
+    "Fire at 2000 W Flagler St": (25.7730, -80.2270),
+}
+
+def test_addresses_and_intersections_land_near_surveyed_points():
+    for text, (lat, lon) in KNOWN_POINTS.items():
+        location = resolve_grid_location(text)
+        assert location is not None, text
+        assert km_between(location.latitude, location.longitude, lat, lon) < 1, text
+
+def test_ambiguous_or_off_grid_text_is_not_resolved():
+    assert resolve_grid_location("Flooding at 1234 8th Street") is None  # NW or SW?
+    assert resolve_grid_location("Someone hurt at 107th Street") is None
+    assert resolve_grid_location("Water main break at 500 W 49th St") is None  # Hialeah's grid
+    assert resolve_grid_location("Need help at 500 NW 900th Street") is None
+    assert resolve_grid_location("Need water for my family") is None
+
+def test_courts_and_terraces_fall_between_numbered_roads():
+    avenue = resolve_grid_location("9700 SW 87th Ave")
+    court = resolve_grid_location("9700 S.W. 87th Ct")
+    assert court.latitude == avenue.latitude
+    assert avenue.longitude - 0.001662 < court.longitude < avenue.longitude
+    terrace = resolve_grid_location("SW 8th Terrace and SW 27th Ave")
+    street = resolve_grid_location("SW 8th Street and SW 27th Ave")
+    assert terrace.latitude < street.latitude
+
+def test_extractor_uses_the_grid_before_the_geocoder():
+    extractor = LocationExtractor(geocode_cache=GeocodeCache(":memory:"))
+    extractor.geocoder = OfflineGeocoder()
+    info = extractor.extract_location("Car crash at NW 36th Street and NW 27th Avenue")
+    assert info.extraction_method.endswith("grid_intersection")
+    assert info.confidence == 0.75
+
+    # Refines the gazetteer's point for the whole of SW 8th Street
+    info = extractor.extract_location("Flooding at 1234 SW 8th Street Miami FL")
+    assert info.extraction_method.endswith("+grid_address")
+    assert km_between(info.latitude, info.longitude, 25.7655, -80.2153) < 1
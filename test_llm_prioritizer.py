@@ -0,0 +1,59 @@
+"""
+Tests for latency-bounded LLM prioritization with heuristic hedging.
+"""
+import sys
+from pathlib import Path
+
+# Add the PrioritizerAgent to path
+prioritizer_path = Path(__file__).parent / "PrioritizerAgent"
+sys.path.append(str(prioritizer_path))
+
+import prioritizer_integration
+from llm_prioritizer import HedgedPrioritizer, StubModel, parse_priority_response
+
+TICKET = "Roof damage from storm, not urgent"
+
+def test_fast_model_wins():
+    hedged = HedgedPrioritizer(StubModel(latency=0.0, priority=4), deadline=1.0)
+    result = hedged.prioritize_sync(TICKET)
+    assert result['source'] == "stub"
+    assert result['priority'] == 4
+    assert 'llm_pending' not in result
+    assert hedged.stats['llm_wins'] == 1
+    hedged.close()
+
+def test_model_win_ends_the_heuristic_conversation():
+    started = []
+
+    def heuristic(text):
+        result = prioritizer_integration.classify_with_conversation(text)
+        started.append(result['conversation_id'])
+        return result
+
+    hedged = HedgedPrioritizer(StubModel(latency=0.0, priority=4), heuristic=heuristic, deadline=1.0)
+    assert hedged.prioritize_sync("Need help")['source'] == "stub"
+    assert started[0] and prioritizer_integration.conversation_store.get(started[0]) is None
+    hedged.close()
+
+def test_deadline_falls_back_to_heuristic_and_delivers_late_answer():
+    hedged = HedgedPrioritizer(StubModel(latency=0.3, priority=5), deadline=0.05)
+    result = hedged.prioritize_sync(TICKET)
+    assert result['source'] == "enhanced_heuristic"
+    assert result['latency'] < 0.3
+    late = result['llm_pending'].result(timeout=5)
+    assert late['priority'] == 5
+    assert hedged.stats == {'llm_wins': 0, 'heuristic_wins': 1, 'late_answers': 1, 'llm_errors': 0}
+    hedged.close()
+
+def test_model_failure_uses_heuristic():
+    hedged = HedgedPrioritizer(StubModel(fail=True), deadline=1.0)
+    result = hedged.prioritize_sync(TICKET)
+    assert result['source'] == "enhanced_heuristic"
+    assert hedged.stats['llm_errors'] == 1
+    hedged.close()
+
+def test_parse_priority_response():
+    fenced = '```json\n{"priority": 5, "confidence": 0.9, "reasoning": "trapped"}\n```'
+    assert parse_priority_response(fenced)['priority'] == 5
+    assert parse_priority_response("Priority: 2 (low)")['priority'] == 2
+    assert parse_priority_response('{"priority": 9}')['priority'] == 5
@@ -0,0 +1,16 @@
+"""
+Tests for batched location extraction.
+"""
+from geocode_cache import GeocodeCache
+from location_extractor import LocationExtractor
+from test_gazetteer import SAMPLES
+
+def test_batch_matches_single_extraction_in_order():
+    extractor = LocationExtractor(geocode_cache=GeocodeCache(":memory:"))
+    extractor.geocoder = None
+    texts = list(SAMPLES) + ["", "Need water for my family"] + list(SAMPLES)[:2]
+    results = extractor.extract_locations_batch(texts, batch_size=4)
+    assert len(results) == len(texts)
+    assert results == [extractor.extract_location(text) for text in texts]
+    assert results[len(SAMPLES)].extraction_method == "none"
+    assert extractor.extract_locations_batch([]) == []
@@ -0,0 +1,28 @@
+"""
+Tests for deferred spaCy loading in the location extractor.
+"""
+import time
+
+from geocode_cache import GeocodeCache
+from location_extractor import LocationExtractor
+
+def test_construction_does_not_load_the_model():
+    started = time.perf_counter()
+    extractor = LocationExtractor()
+    assert time.perf_counter() - started < 0.05
+    assert extractor.model_info()['status'] == "not_loaded"
+    assert extractor.nlp_model is None
+
+def test_patterns_answer_while_model_loads():
+    extractor = LocationExtractor(geocode_cache=GeocodeCache(":memory:"))
+    extractor.geocoder = None  # keep the test offline
+    info = extractor.extract_location("Flooding at 1234 SW 8th Street Miami FL")
+    if extractor.nlp_model is None:
+        assert info.extraction_method.startswith("pattern_matching")
+        assert "8th Street" in info.address
+    # The first extraction starts the background load
+    assert extractor.model_status != "not_loaded"
+    extractor.load_model(timeout=60)
+    status = extractor.model_info()
+    assert status['status'] in ("ready", "unavailable")
+    assert status['load_seconds'] is not None
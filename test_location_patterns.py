@@ -0,0 +1,54 @@
+"""
+Tests for the linear-time location pattern engine.
+"""
+import random
+import time
+
+from benchmark_location_patterns import adversarial_description, regex_candidates
+from location_extractor import LocationExtractor
+from location_patterns import find_location_candidates
+
+# Inputs where the regexes' backtracking decides the result
+EDGE_CASES = [
+    "Someone stopped breathing at Doral CVS at 107th Street",
+    "Flooding at 1234 SW 8th Street Miami FL, send boats",
+    "at  CVS on the corner",             # word right after two spaces
+    "at CVS on the corner",              # ...but not after one
+    "at\n CVS, at \nCVS",                # line breaks inside the whitespace
+    "at boulevard",                      # "rd" inside "boulevard"
+    "12  Street, 12 Street, 7 streets",
+    "near Main and, near Main and 5th",  # intersection word at the clause end
+    "stuck in Little Havana, FL and at Brickell",
+    "The ſtarbucks İn Doral. Walgreens is closed! Is the walgreens open?",
+    "I'm at the park. I mean near the winn-dixie plaza",
+]
+
+def test_edge_cases_match_the_regexes():
+    for text in EDGE_CASES:
+        assert find_location_candidates(text) == regex_candidates(text), text
+
+def test_random_texts_match_the_regexes():
+    rng = random.Random(7)
+    words = ["at", "AT", "near", "in", "cvs", "st", "Street", "ave", "boulevard", "and", "&",
+             "park", "Plaza", "Miami", "FL", "12", "walgreens", "burger king", "ſt", "x",
+             ",", ".", "!", "\n", " ", "  "]
+    for _ in range(2000):
+        text = "".join(rng.choice(words) + rng.choice(["", " ", "  ", "\n"])
+                       for _ in range(rng.randint(0, 30)))
+        assert find_location_candidates(text) == regex_candidates(text), repr(text)
+
+def test_adversarial_text_is_linear():
+    # The regexes take minutes on these; the engine must stay well under a second
+    for prefix, unit in [("", "at the "), ("", "1 2 "), ("", "near a and "), ("Publix. ", "no word ")]:
+        text = adversarial_description(prefix, unit, 100_000)
+        started = time.perf_counter()
+        find_location_candidates(text)
+        assert time.perf_counter() - started < 2.0, unit
+
+def test_extractor_uses_the_engine():
+    extractor = LocationExtractor()
+    info = extractor._extract_with_patterns("Car accident at the intersection of Biscayne Blvd and 125th Street")
+    assert info.address == "the intersection of Biscayne Blvd and 125th Street"
+    assert info.confidence == 0.5
+    assert info.extraction_method == "pattern_matching"
+    assert extractor._extract_with_patterns("Need water for my family").extraction_method == "none"
@@ -0,0 +1,33 @@
+"""
+Tests for the batch classification API in prioritizer_integration.
+"""
+import sys
+from pathlib import Path
+
+# Add the PrioritizerAgent to path
+prioritizer_path = Path(__file__).parent / "PrioritizerAgent"
+sys.path.append(str(prioritizer_path))
+
+from prioritizer_integration import classify_ticket_priority, classify_tickets_batch
+
+DESCRIPTIONS = [
+    "Person unconscious, not breathing, need immediate help!",
+    "Need insulin for diabetic patient, running low",
+    "Roof damage from storm, not urgent",
+    "Power out in neighborhood for 6 hours",
+    "Looking for information about evacuation routes",
+] * 9
+
+def test_batch_streams_results_in_input_order():
+    stats = []
+    results = list(classify_tickets_batch(
+        (d for d in DESCRIPTIONS), workers=2, chunk_size=4, on_chunk=stats.append
+    ))
+    assert results == [classify_ticket_priority(d) for d in DESCRIPTIONS]
+    assert [s['chunk'] for s in stats] == list(range(len(stats)))
+    assert sum(s['size'] for s in stats) == len(DESCRIPTIONS)
+
+def test_batch_in_process_mode():
+    results = list(classify_tickets_batch(DESCRIPTIONS, workers=1, chunk_size=10))
+    assert results == [classify_ticket_priority(d) for d in DESCRIPTIONS]
+    assert list(classify_tickets_batch([], workers=1)) == []
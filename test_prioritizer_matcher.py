@@ -0,0 +1,53 @@
+"""
+Tests for the single-pass indicator matcher used by enhanced_priority_classification.
+The matcher must give the same hits as checking `keyword in text` for every keyword.
+"""
+import sys
+from pathlib import Path
+
+# Add the PrioritizerAgent to path
+prioritizer_path = Path(__file__).parent / "PrioritizerAgent"
+sys.path.append(str(prioritizer_path))
+
+from prioritizer_integration import (
+    INDICATOR_MATCHER, KeywordMatcher, enhanced_priority_classification
+)
+
+SAMPLE_TEXTS = [
+    "Person unconscious, not breathing, need immediate help!",
+    "Building collapse, people trapped inside!!!",
+    "Need insulin for diabetic patient, running low",
+    "Elderly person with chest pain, difficulty breathing",
+    "Roof damage from storm, not urgent, handle later",
+    "minor injury, no water, no food. urgent asap emergency",
+    "diabetic emergency at the shelter collapsing nearby",
+    "no waterwater neededdehydration",  # overlapping keywords
+    "translated documents later",       # substring semantics, not word matching
+    "",
+]
+
+def naive_hits(table_entries, text):
+    return [(category, kw) for category, kw in table_entries if kw in text]
+
+def test_matcher_matches_substring_scan():
+    for text in SAMPLE_TEXTS:
+        t = text.lower()
+        hits = INDICATOR_MATCHER.scan(t)
+        for name, entries in INDICATOR_MATCHER.tables.items():
+            assert hits[name] == naive_hits(entries, t), (name, text)
+
+def test_matcher_handles_overlapping_keywords():
+    matcher = KeywordMatcher({"words": ["abc", "bcd", "cde", "b", "abcdef"]})
+    for text in ["abcde", "xbcdex", "abcdef", "ab cd", "bbb"]:
+        found = [kw for _, kw in matcher.scan(text)["words"]]
+        assert found == [kw for kw in ["abc", "bcd", "cde", "b", "abcdef"] if kw in text], text
+
+def test_classification_uses_table_order():
+    result = enhanced_priority_classification("Fire and gas leak, someone unconscious")
+    # The first critical hit in table order decides the category
+    assert result['priority'] == 5
+    assert result['key_indicators'][0] == "unconscious"
+    assert "(life_threatening)" in result['reasoning']
+
+    result = enhanced_priority_classification("Property damage and roof damage, when possible")
+    assert result['priority'] == 2
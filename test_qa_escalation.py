@@ -0,0 +1,56 @@
+"""
+Tests for the precompiled Q&A escalation rules.
+"""
+import sys
+from pathlib import Path
+
+# Add the PrioritizerAgent to path
+prioritizer_path = Path(__file__).parent / "PrioritizerAgent"
+sys.path.append(str(prioritizer_path))
+
+from prioritizer_integration import QA_RULES, PrioritizerConversation
+
+def test_critical_answer_records_fired_pattern():
+    evaluation = QA_RULES.evaluate([
+        ("Are people in immediate physical danger?", "Yes, trapped under debris"),
+    ])
+    assert evaluation['boost'] == 2
+    assert evaluation['triggers'][0] == ("critical", "entrapment", "trapped")
+    assert evaluation['triggers'][1] == ("question", "immediate_danger", "yes")
+
+def test_regex_and_question_rules():
+    evaluation = QA_RULES.evaluate([
+        ("How many people are affected?", "Two of us"),
+        ("Is the location safe?", "it is hazardous"),
+    ])
+    # "hazardous" hits the high safety group; "two" hits the people-count rule
+    assert evaluation['boost'] == 2
+    assert ("high", "safety", "hazardous") in evaluation['triggers']
+    assert ("question", "people_count", "two") in evaluation['triggers']
+
+def test_stable_answers_do_not_escalate():
+    result = PrioritizerConversation().reclassify_with_answers(
+        "Need some help", [("Is this situation getting worse over time?", "It's stable")]
+    )
+    assert result['qa_boost'] == 0
+    assert result['qa_triggers'] == []
+
+def test_incremental_rounds_match_full_recompute():
+    description = "Someone needs help"
+    rounds = [
+        [("Are people in immediate physical danger?", "Not sure, there are many")],
+        [("How many people are affected?", "people on the roof, yes")],  # "many people" spans answers
+        [("Is this situation getting worse over time?", "the water is rising, real danger!!!")],
+    ]
+    conversation = PrioritizerConversation()
+    conversation.start(description)
+    qa_pairs = []
+    for new_pairs in rounds:
+        qa_pairs += new_pairs
+        incremental = conversation.add_answers(new_pairs)
+        full = PrioritizerConversation().reclassify_with_answers(description, qa_pairs)
+        assert incremental == full
+
+    assert incremental['qa_triggers'][0] == ("critical", "multiple_victims", "many people")
+    # Reusing the conversation with the growing transcript only scans new answers
+    assert conversation.reclassify_with_answers(description, list(qa_pairs)) == full
@@ -0,0 +1,74 @@
+"""
+Tests for the spatial resource index, against the linear haversine scan it replaces.
+"""
+import math
+import random
+from dataclasses import dataclass
+
+from resource_index import ResourceIndex
+
+CATEGORIES = ["food", "water", "medical", "shelter", "other"]
+
+@dataclass
+class Resource:
+    id: str
+    type: str
+    lat: float
+    lon: float
+    capacity: int
+
+def haversine(lat1, lon1, lat2, lon2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    h = math.sin(math.radians(lat2 - lat1) / 2) ** 2 + \
+        math.cos(p1) * math.cos(p2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    return 2 * 6371 * math.asin(math.sqrt(h))
+
+def linear_match(resources, lat, lon, category):
+    """match_resource as it was: filter, then min() by haversine."""
+    cand = [r for r in resources.values() if r.capacity > 0 and (r.type == category or category == "other")]
+    if not cand:
+        cand = [r for r in resources.values() if r.capacity > 0]
+    if not cand:
+        return None
+    return min(cand, key=lambda r: haversine(lat, lon, r.lat, r.lon))
+
+def random_point(rng):
+    return rng.uniform(25.25, 25.98), rng.uniform(-80.88, -80.12)  # Miami-Dade
+
+def test_matches_linear_scan_through_incremental_changes():
+    rng = random.Random(3)
+    resources = {}
+    index = ResourceIndex()
+    for i in range(600):
+        lat, lon = random_point(rng)
+        resource = Resource(f"r{i}", rng.choice(CATEGORIES[:4]), lat, lon, rng.choice([0, 5, 40, 120]))
+        resources[resource.id] = resource
+        index.add(resource)
+
+    for step in range(2000):
+        if step % 3 == 0:  # capacity runs out, is restocked, or a resource moves
+            resource = rng.choice(list(resources.values()))
+            resource.capacity = rng.choice([0, 0, 10])
+            if step % 5 == 0:
+                resource.lat, resource.lon = random_point(rng)
+            index.update(resource)
+        lat, lon = random_point(rng)
+        category = rng.choice(CATEGORIES)
+        assert index.nearest(lat, lon, category) is linear_match(resources, lat, lon, category)
+
+def test_falls_back_to_any_open_resource():
+    index = ResourceIndex.from_resources([
+        Resource("food", "food", 25.77, -80.19, 10),
+        Resource("shelter", "shelter", 25.70, -80.30, 0),
+    ])
+    assert index.nearest(25.70, -80.30, "shelter").id == "food"
+    assert len(index) == 1
+    index.remove("food")
+    assert index.nearest(25.70, -80.30, "shelter") is None
+
+def test_ties_go_to_the_first_added_like_min():
+    index = ResourceIndex.from_resources([
+        Resource("a", "water", 25.80, -80.20, 5),
+        Resource("b", "water", 25.80, -80.20, 5),
+    ])
+    assert index.nearest(25.75, -80.25, "water").id == "a"
@@ -0,0 +1,63 @@
+"""
+Tests for reverse geocoding of map clicks, against a local fake Nominatim.
+"""
+import threading
+import time
+
+from fake_nominatim import FakeNominatim
+from gazetteer import load_default_gazetteer
+from geocode_cache import GeocodeCache
+from geocoding_service import GeocodingService, NominatimBackend
+from reverse_geocoder import ReverseGeocoder, geohash_decode, geohash_encode
+
+PLACES = {
+    "Bayside Marketplace": (25.7784, -80.1867, "Bayside Marketplace, 401 Biscayne Blvd, Miami"),
+}
+
+def make_geocoder(server, cache):
+    service = GeocodingService(NominatimBackend(server.url, timeout=5), cache=cache, rate=100.0)
+    return ReverseGeocoder(service, load_default_gazetteer())
+
+def test_geohash_round_trip():
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    cell = geohash_encode(25.7784, -80.1867)
+    latitude, longitude = geohash_decode(cell)
+    assert abs(latitude - 25.7784) < 0.001 and abs(longitude - -80.1867) < 0.001
+    assert geohash_encode(latitude, longitude) == cell
+
+def test_new_cell_answers_from_gazetteer_without_waiting(tmp_path):
+    cache = GeocodeCache(str(tmp_path / "geocodes.sqlite3"))
+    with FakeNominatim(PLACES, latency=0.3) as server:
+        geocoder = make_geocoder(server, cache)
+        started = time.monotonic()
+        place = geocoder.lookup(25.7785, -80.1866)
+        assert time.monotonic() - started < 0.1
+        assert (place.address, place.source, place.pending) == ("Bayside Marketplace", "gazetteer", True)
+
+        # The lookup finishes in the background and later clicks in the cell use it
+        place = geocoder.lookup(25.7785, -80.1866, wait=2)
+        assert (place.source, place.address) == ("geocoder", PLACES["Bayside Marketplace"][2])
+        geocoder.lookup(25.77851, -80.18661)
+        assert len(server.queries) == 1
+        geocoder.service.close()
+
+    # The answer survives a restart, with no server at all
+    restarted = ReverseGeocoder(GeocodingService(cache=GeocodeCache(str(tmp_path / "geocodes.sqlite3"))))
+    assert restarted.lookup(25.7785, -80.1866).source == "geocoder"
+
+def test_pending_answer_is_delivered_to_on_resolved(tmp_path):
+    cache = GeocodeCache(str(tmp_path / "geocodes.sqlite3"))
+    with FakeNominatim(PLACES, latency=0.2) as server:
+        geocoder = make_geocoder(server, cache)
+        arrived, done = [], threading.Event()
+        place = geocoder.lookup(25.7785, -80.1866, on_resolved=lambda p: (arrived.append(p), done.set()))
+        assert place.source == "gazetteer" and arrived == []
+        assert done.wait(5)
+        assert [(p.source, p.address) for p in arrived] == [("geocoder", PLACES["Bayside Marketplace"][2])]
+        geocoder.service.close()
+
+def test_offline_fallback_names_the_nearest_place():
+    geocoder = ReverseGeocoder(gazetteer=load_default_gazetteer())
+    place = geocoder.lookup(25.7925, -80.2115)
+    assert place.source == "gazetteer" and "Jackson Memorial Hospital" in place.address
+    assert ReverseGeocoder(gazetteer=load_default_gazetteer()).lookup(40.71, -74.0) is None
@@ -0,0 +1,104 @@
+"""
+Tests for the shared cross-session store.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pytest
+
+from shared_store import SharedStore
+
+@dataclass
+class Ticket:
+    id: str
+    title: str
+    priority: int
+
+def test_sessions_share_one_dataset():
+    store = SharedStore()
+    first, second = store.collection("tickets"), store.collection("tickets")
+    first["t1"] = Ticket("t1", "Need water", 3)
+    assert second["t1"].title == "Need water"
+    assert (len(second), store.version_of("tickets"), store.version_of("resources")) == (1, 1, 0)
+
+    del second["t1"]
+    assert "t1" not in first
+    with pytest.raises(KeyError):
+        del first["t1"]
+    assert store.version == 2
+
+def test_iteration_is_unaffected_by_concurrent_writes():
+    store = SharedStore()
+    tickets = store.collection("tickets")
+    for i in range(5):
+        tickets[f"t{i}"] = Ticket(f"t{i}", "x", 1)
+    seen = []
+    for key in tickets:
+        tickets[f"new-{key}"] = Ticket(key, "y", 1)  # would break a plain dict mid-loop
+        seen.append(key)
+    assert len(seen) == 5 and len(tickets) == 10
+
+def test_wait_for_change_wakes_on_write():
+    store = SharedStore()
+    timer = threading.Timer(0.05, store.put, ("resources", "rc1", {'capacity': 10}))
+    timer.start()
+    assert store.wait_for_change(store.version, timeout=2) == 1
+    assert store.wait_for_change(store.version, timeout=0.01) == 1  # nothing new: times out
+
+def test_sqlite_store_shares_changes_between_processes(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    server = SharedStore(path, codecs={'tickets': Ticket})
+    agent = SharedStore(path, codecs={'tickets': Ticket})  # a second process on the same file
+    server.put("tickets", "t1", Ticket("t1", "Shelter needed", 4))
+    agent.put("tickets", "t2", Ticket("t2", "Insulin", 5))
+    agent.delete("tickets", "t1")
+
+    assert server.refresh() == 2
+    assert list(server.items("tickets")) == ["t2"]
+    assert server.get("tickets", "t2") == Ticket("t2", "Insulin", 5)
+    server.put("tickets", "t3", Ticket("t3", "Water", 2))
+    server.close()
+    agent.close()
+
+    reopened = SharedStore(path, codecs={'tickets': Ticket})
+    assert sorted(reopened.items("tickets")) == ["t2", "t3"]
+    reopened.close()
+
+def test_concurrent_writers(tmp_path):
+    store = SharedStore(str(tmp_path / "store.sqlite3"))
+    tickets = store.collection("tickets")
+
+    def write(worker):
+        for i in range(50):
+            tickets[f"{worker}-{i}"] = {'id': f"{worker}-{i}", 'priority': i % 5}
+            assert len(list(tickets.values())) >= i
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(write, range(8)))
+    assert len(tickets) == 400 and store.version == 400
+    store.close()
+    assert len(SharedStore(str(tmp_path / "store.sqlite3")).items("tickets")) == 400
+
+def test_update_is_atomic_across_threads_and_processes(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    stores = [SharedStore(path), SharedStore(path)]  # two processes on the same file
+    stores[0].put("resources", "rc1", {'capacity': 0})
+
+    def restock(worker):
+        store = stores[worker % 2]
+        for _ in range(25):
+            store.update("resources", "rc1", lambda r: dict(r, capacity=r['capacity'] + 1))
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(restock, range(8)))
+    for store in stores:
+        store.refresh()
+        assert store.get("resources", "rc1") == {'capacity': 200}
+
+    version = stores[1].version
+    assert stores[1].update("resources", "missing", lambda r: r) is None
+    assert stores[1].update("resources", "rc1", lambda r: None) is None  # unchanged, nothing written
+    assert stores[1].version == version
+    for store in stores:
+        store.close()
@@ -0,0 +1,77 @@
+"""
+Tests for micro-batched LLM triage requests.
+"""
+import json
+import sys
+import threading
+from pathlib import Path
+
+# Add the PrioritizerAgent to path
+prioritizer_path = Path(__file__).parent / "PrioritizerAgent"
+sys.path.append(str(prioritizer_path))
+
+from triage_batcher import TriageBatcher, parse_batch_response
+
+def heuristic(text):
+    return {'priority': 3, 'title': "Assistance needed"}
+
+class FakeModel:
+    """Answers every ticket except those mentioning 'skip'."""
+
+    def __init__(self):
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def __call__(self, prompt):
+        with self.lock:
+            self.prompts.append(prompt)
+        tickets = json.loads(prompt.split("Tickets:\n", 1)[1])
+        return "```json\n" + json.dumps([
+            {'id': t['id'], 'priority': 5, 'title': t['text'].upper()}
+            for t in tickets if "skip" not in t['text']
+        ]) + "\n```"
+
+def test_concurrent_tickets_share_one_request():
+    model = FakeModel()
+    batcher = TriageBatcher(model, heuristic, max_batch=8, max_wait=0.2, source="fake")
+    texts = [f"ticket {i}" for i in range(8)]
+    futures = [batcher.submit(t) for t in texts]
+    results = [f.result(timeout=5) for f in futures]
+    assert len(model.prompts) == 1
+    assert [r['title'] for r in results] == [t.upper() for t in texts]
+    assert all(r['source'] == "fake" for r in results)
+
+def test_failures_fall_back_per_item():
+    model = FakeModel()
+    batcher = TriageBatcher(model, heuristic, max_batch=4, max_wait=0.2)
+    good, skipped = batcher.submit("flooded street"), batcher.submit("skip me")
+    assert good.result(timeout=5)['priority'] == 5
+    assert skipped.result(timeout=5) == {'priority': 3, 'title': "Assistance needed", 'source': "heuristic"}
+    assert batcher.stats['item_fallbacks'] == 1
+
+    def broken(prompt):
+        raise RuntimeError("429 rate limited")
+
+    batcher = TriageBatcher(broken, heuristic, max_wait=0.0)
+    assert batcher.triage("need water", timeout=5)['source'] == "heuristic"
+    assert batcher.stats['batch_failures'] == 1
+
+def test_parse_batch_response_rejects_bad_entries():
+    content = '[{"id": 0, "priority": 4, "title": "Rescue"}, {"id": 1, "priority": 9}, {"id": "x"}]'
+    assert parse_batch_response(content, 3) == [{'priority': 4, 'title': "Rescue"}, None, None]
+    assert parse_batch_response("not json", 2) == [None, None]
+
+def test_title_and_urgency_share_one_request():
+    model = FakeModel()
+    batcher = TriageBatcher(model, heuristic, max_wait=0.0, source="fake")
+    text = "elderly man trapped, no water"
+    # ai_compose_ticket asks for the title, then ai_qualify_urgency for the priority
+    title = batcher.triage(text, timeout=5)['title']
+    urgency = batcher.triage(text, timeout=5)
+    assert (title, urgency['priority'], urgency['source']) == (text.upper(), 5, "fake")
+    assert batcher.stats['requests'] == 1 and batcher.stats['reused'] == 1
+
+    # Fallback answers are not reused, so the model gets another chance
+    assert batcher.triage("skip this", timeout=5)['source'] == "heuristic"
+    batcher.triage("skip this", timeout=5)
+    assert batcher.stats['requests'] == 3